@@ -0,0 +1,69 @@
+"""
+Benchmark Memory document size and embedding load time for list vs packed embeddings.
+
+Builds BSON documents shaped like Memory (1536 + 384 dimensional embeddings) without a
+database, then measures encoded size and the time to decode them back into numpy arrays.
+
+Usage:
+    python benchmarks/embedding_storage_bench.py [--memories 100000]
+"""
+
+import argparse
+from datetime import datetime
+from time import perf_counter
+from uuid import uuid4
+
+import bson
+import numpy as np
+
+from convo_backend.models.memory import load_embedding, pack_embedding
+
+HIGH_DIM = 1536
+LOW_DIM = 384
+
+
+def make_document(storage: str, high: np.ndarray, low: np.ndarray) -> dict:
+    document = {"_id": uuid4().hex, "text": "gm gm, wagmi", "created_at": datetime.now()}
+    if storage == "list":
+        document["high_dim_embedding"] = high.tolist()
+        document["low_dim_embedding"] = low.tolist()
+    else:
+        document["high_dim_embedding_bin"] = pack_embedding(high, storage)
+        document["low_dim_embedding_bin"] = pack_embedding(low, storage)
+    return document
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--memories", type=int, default=100_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    high = rng.standard_normal(HIGH_DIM, dtype=np.float32)
+    low = rng.standard_normal(LOW_DIM, dtype=np.float32)
+
+    print(f"{args.memories} memories")
+    print(f"{'storage':<9} {'doc bytes':>10} {'total MB':>9} {'decode s':>9} {'to numpy s':>11}")
+    for storage in ("list", "float32", "float16"):
+        encoded = bson.encode(make_document(storage, high, low))
+        raw = [encoded] * args.memories
+
+        start = perf_counter()
+        documents = [bson.decode(data) for data in raw]
+        decode_time = perf_counter() - start
+
+        start = perf_counter()
+        for document in documents:
+            load_embedding(document.get("high_dim_embedding_bin"), document.get("high_dim_embedding"))
+            load_embedding(document.get("low_dim_embedding_bin"), document.get("low_dim_embedding"))
+        numpy_time = perf_counter() - start
+
+        print(
+            f"{storage:<9} {len(encoded):>10} {len(encoded) * args.memories / 2**20:>9.1f} "
+            f"{decode_time:>9.2f} {numpy_time:>11.2f}"
+        )
+        del documents, raw
+
+
+if __name__ == "__main__":
+    main()
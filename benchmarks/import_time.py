@@ -0,0 +1,121 @@
+"""
+Import-time regression check.
+
+Imports a module in a fresh interpreter with `python -X importtime`, parses the report
+and fails (exit code 1) when:
+- a module's cumulative import time exceeds its budget
+- a dependency that should only load on demand (torch, selenium, tkinter, ...) is imported
+
+Each import is repeated and the fastest run is used to smooth out disk cache noise.
+Run from the repository root, since config.py reads config.json relative to it.
+
+Usage:
+    python benchmarks/import_time.py [--module convo_backend.app] [--runs 5] [--budget convo_backend.app=1500] [--top 15]
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+
+# Cumulative import time budgets in milliseconds
+BUDGETS_MS = {
+    "convo_backend.app": 2500,
+    "convo_backend.core.core": 2000,
+    "convo_backend.services.messages_cache": 150,
+    "convo_backend.utils.metrics": 100,
+    "convo_backend.utils.startup": 150,
+}
+
+# Loaded only on the code paths that need them (VAD, roaming, GUI, memory, classifier)
+DEFERRED_MODULES = (
+    "torch",
+    "silero_vad",
+    "selenium",
+    "tkinter",
+    "sentence_transformers",
+    "transformers",
+    "mongoengine",
+    "onnxruntime",
+    "pydub",
+)
+
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+def measure(module: str) -> dict[str, tuple[float, float]]:
+    """Import `module` in a new interpreter and return {module: (self ms, cumulative ms)}."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+    timings = {}
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, _, name = match.groups()
+            timings[name] = (int(self_us) / 1000, int(cumulative_us) / 1000)
+    return timings
+
+
+def fastest(module: str, runs: int) -> dict[str, tuple[float, float]]:
+    best: dict[str, tuple[float, float]] = {}
+    for _ in range(runs):
+        for name, timing in measure(module).items():
+            if name not in best or timing[1] < best[name][1]:
+                best[name] = timing
+    return best
+
+
+def parse_budget(value: str) -> tuple[str, float]:
+    module, _, milliseconds = value.partition("=")
+    return module, float(milliseconds)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--module", default="convo_backend.app")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--budget",
+        type=parse_budget,
+        action="append",
+        default=[],
+        help="Override a budget, e.g. convo_backend.app=1500",
+    )
+    parser.add_argument("--top", type=int, default=15, help="Heaviest imports to list")
+    args = parser.parse_args()
+
+    budgets = dict(BUDGETS_MS)
+    budgets.update(args.budget)
+    timings = fastest(args.module, args.runs)
+
+    print(f"Heaviest imports for {args.module} (best of {args.runs}):")
+    print(f"{'self ms':>9} {'cumulative ms':>14}  module")
+    heaviest = sorted(timings.items(), key=lambda item: item[1][0], reverse=True)
+    for name, (self_ms, cumulative_ms) in heaviest[: args.top]:
+        print(f"{self_ms:9.1f} {cumulative_ms:14.1f}  {name}")
+
+    failures = []
+    for module, budget in budgets.items():
+        if module in timings and timings[module][1] > budget:
+            failures.append(
+                f"{module} took {timings[module][1]:.0f} ms (budget {budget:.0f} ms)"
+            )
+    for module in DEFERRED_MODULES:
+        if module in timings:
+            failures.append(f"{module} is imported eagerly by {args.module}")
+
+    if failures:
+        print("\nImport time check failed:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print("\nImport time check passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark BM25 LexicalIndex footprint and query latency on synthetic Space chatter.
+
+Usage:
+    python benchmarks/lexical_index_bench.py [--sizes 10000,100000] [--queries 200]
+"""
+
+import argparse
+from time import perf_counter
+
+import numpy as np
+
+from convo_backend.core.lexical_index import LexicalIndex
+
+VOCABULARY = [f"word{i}" for i in range(20_000)] + [
+    "$convo", "$sol", "$bonk", "solana", "wagmi", "gm", "@convo", "@aeyakovenko", "base", "nft",
+]
+
+
+def make_texts(count: int, rng: np.random.Generator) -> list[str]:
+    # Zipf-like term distribution, 8-30 words per memory
+    weights = 1 / np.arange(1, len(VOCABULARY) + 1)
+    weights /= weights.sum()
+    lengths = rng.integers(8, 30, count)
+    words = rng.choice(len(VOCABULARY), lengths.sum(), p=weights)
+    texts, offset = [], 0
+    for length in lengths:
+        texts.append(" ".join(VOCABULARY[i] for i in words[offset : offset + length]))
+        offset += length
+    return texts
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--sizes", type=lambda x: [int(s) for s in x.split(",")], default=[10_000, 100_000]
+    )
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    queries = make_texts(args.queries, rng)
+    print(f"{'memories':>10} {'build s':>8} {'MB':>7} {'p50 ms':>8} {'p99 ms':>8}")
+    for size in args.sizes:
+        texts = make_texts(size, rng)
+        index = LexicalIndex()
+        start = perf_counter()
+        index.add_many(list(range(size)), texts)
+        build_time = perf_counter() - start
+
+        timings = []
+        for query in queries:
+            start = perf_counter()
+            index.search(query, 20)
+            timings.append((perf_counter() - start) * 1000)
+        print(
+            f"{size:>10} {build_time:>8.2f} {index.memory_footprint() / 2**20:>7.1f} "
+            f"{np.percentile(timings, 50):>8.3f} {np.percentile(timings, 99):>8.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
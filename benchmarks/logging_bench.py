@@ -0,0 +1,79 @@
+"""
+Benchmark the cost per streamed token of the "Generated response token" debug log.
+
+Compares debug logging off, debug logging with the synchronous console/file handlers,
+and debug logging through the async queue listener. Reported times are what the
+calling thread (the event loop, in the app) pays per token.
+
+Usage:
+    python benchmarks/logging_bench.py [--tokens 20000]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+from time import perf_counter
+
+from convo_backend.utils.logging import setup_logging, stop_logging
+
+
+def reset_logging():
+    stop_logging()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+
+
+def run(tokens: int, debug: bool, async_logging: bool, log_file: str) -> float:
+    reset_logging()
+    setup_logging(
+        argparse.Namespace(
+            debug=debug,
+            log_level="INFO",
+            log_file=log_file,
+            async_logging=async_logging,
+            log_rate_limit=0,
+        )
+    )
+    logger = logging.getLogger("convo.chat")
+    token = " token"
+    start = perf_counter()
+    for _ in range(tokens):
+        logger.debug("Generated response token: %s", token)
+    elapsed = perf_counter() - start
+    # Drain the listener outside of the timed section
+    stop_logging()
+    return elapsed / tokens
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tokens", type=int, default=20000)
+    args = parser.parse_args()
+
+    # Keep console output from the handlers out of the results
+    real_stderr = sys.stderr
+    sys.stderr = open(os.devnull, "w")
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            log_file = os.path.join(tmp, "bench.log")
+            results = {
+                "debug off": run(args.tokens, False, False, log_file),
+                "debug on, sync handlers": run(args.tokens, True, False, log_file),
+                "debug on, async queue": run(args.tokens, True, True, log_file),
+            }
+            reset_logging()
+    finally:
+        sys.stderr.close()
+        sys.stderr = real_stderr
+
+    print(f"Cost per token over {args.tokens} tokens:")
+    for name, seconds in results.items():
+        print(f"  {name:<26} {seconds * 1e6:8.2f} us")
+
+
+if __name__ == "__main__":
+    main()
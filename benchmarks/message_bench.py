@@ -0,0 +1,99 @@
+"""
+Benchmark chat message serialization over a long history.
+
+Compares the previous representation (dicts with a stringified timestamp, stdlib json)
+with Message records encoded as orjson (legacy shape) and msgpack, for encoding and
+decoding a whole history, and reports the encoded size and resident size of each.
+
+Usage:
+    python benchmarks/message_bench.py [--messages 10000] [--repeat 5]
+"""
+
+import argparse
+import json
+import tracemalloc
+from datetime import datetime, timedelta
+from time import perf_counter
+
+from convo_backend.models.message import Message
+
+TEXTS = (
+    "What do you think about the new validator rewards?",
+    "Honestly it depends on how the emissions schedule plays out over the next few months.",
+    "gm",
+    "Can you explain that again but slower, I was muted for a second",
+)
+
+
+def build_history(count: int) -> list[Message]:
+    start = datetime(2025, 1, 1, 12)
+    return [
+        Message(TEXTS[i % len(TEXTS)], "user" if i % 2 else "bot", start + timedelta(seconds=i))
+        for i in range(count)
+    ]
+
+
+def as_dict(message: Message) -> dict:
+    return {"message": message.text, "timeStamp": str(message.timestamp), "sender": message.sender}
+
+
+def traced_size(build) -> float:
+    tracemalloc.start()
+    value = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del value
+    return size / 2**20
+
+
+def best_of(repeat: int, function) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = perf_counter()
+        function()
+        best = min(best, perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    history = build_history(args.messages)
+    dicts = [as_dict(message) for message in history]
+
+    formats = {
+        "dict + json": (
+            lambda: [json.dumps(message) for message in dicts],
+            lambda encoded: [json.loads(message) for message in encoded],
+            lambda: [as_dict(message) for message in build_history(args.messages)],
+        ),
+        "Message + orjson": (
+            lambda: [message.to_json() for message in history],
+            lambda encoded: [Message.from_json(message) for message in encoded],
+            lambda: build_history(args.messages),
+        ),
+        "Message + msgpack": (
+            lambda: [message.to_msgpack() for message in history],
+            lambda encoded: [Message.from_msgpack(message) for message in encoded],
+            lambda: build_history(args.messages),
+        ),
+    }
+
+    print(f"{args.messages} messages, best of {args.repeat}")
+    print(f"{'format':<20} {'encode ms':>10} {'decode ms':>10} {'encoded KB':>11} {'resident MB':>12}")
+    for name, (encode, decode, build) in formats.items():
+        encoded = encode()
+        encode_ms = best_of(args.repeat, encode)
+        decode_ms = best_of(args.repeat, lambda: decode(encoded))
+        encoded_kb = sum(len(message) for message in encoded) / 1024
+        print(
+            f"{name:<20} {encode_ms:10.2f} {decode_ms:10.2f} {encoded_kb:11.1f} "
+            f"{traced_size(build):12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Benchmark the Redis message cache against a local redis-server.
+
+Compares the previous approach (blocking redis.Redis client, RPUSH and EXPIRE as two
+round trips) with RedisMessageCache (redis.asyncio, pooled connections, one MULTI/EXEC
+pipeline per write, msgpack-encoded Message records) for appends and full reads, with
+several concurrent writers.
+
+Also compares the in-memory fallbacks, which need no Redis: the previous list of JSON
+strings (pop(0) trimming, json.loads on every read) and InMemoryMessageCache.
+
+Usage:
+    python benchmarks/message_cache_bench.py [--url redis://localhost:6379/15] [--operations 5000] [--concurrency 8] [--skip-redis]
+"""
+
+import argparse
+import asyncio
+import json
+from time import perf_counter
+
+import numpy as np
+import redis
+
+from convo_backend.models.message import Message
+from convo_backend.services.messages_cache import InMemoryMessageCache, RedisMessageCache
+
+KEY = "bench:chat:bench"
+NAMESPACE = "bench"
+MESSAGE = Message.from_dict(
+    {"message": "What do you think about the new validator rewards?", "sender": "user", "timeStamp": "2025-01-01 12:00:00"}
+)
+JSON_MESSAGE = MESSAGE.to_json()
+
+
+def report(name: str, timings: list[float], elapsed: float):
+    timings = np.array(timings) * 1000
+    print(
+        f"{name:<28} {len(timings) / elapsed:10.0f} {np.percentile(timings, 50):8.3f} "
+        f"{np.percentile(timings, 99):8.3f}"
+    )
+
+
+def bench_blocking(url: str, operations: int):
+    client = redis.Redis.from_url(url)
+    client.delete(KEY)
+    timings = []
+    start = perf_counter()
+    for _ in range(operations):
+        op_start = perf_counter()
+        client.rpush(KEY, JSON_MESSAGE)
+        client.expire(KEY, 120)
+        timings.append(perf_counter() - op_start)
+    report("blocking append", timings, perf_counter() - start)
+
+    timings = []
+    start = perf_counter()
+    for _ in range(operations // 10):
+        op_start = perf_counter()
+        [json.loads(message) for message in client.lrange(KEY, -100, -1)]
+        timings.append(perf_counter() - op_start)
+    report("blocking read (100 msgs)", timings, perf_counter() - start)
+    client.delete(KEY)
+    client.close()
+
+
+async def bench_fallback(operations: int):
+    legacy: list[str] = []
+    timings = []
+    start = perf_counter()
+    for _ in range(operations):
+        op_start = perf_counter()
+        legacy.append(JSON_MESSAGE.decode())
+        if len(legacy) > 100:
+            legacy.pop(0)
+        timings.append(perf_counter() - op_start)
+    report("json list append", timings, perf_counter() - start)
+
+    timings = []
+    start = perf_counter()
+    for _ in range(operations // 10):
+        op_start = perf_counter()
+        [json.loads(message) for message in legacy]
+        timings.append(perf_counter() - op_start)
+    report("json list read (100 msgs)", timings, perf_counter() - start)
+
+    cache = InMemoryMessageCache(max_length=100)
+    timings = []
+    start = perf_counter()
+    for _ in range(operations):
+        op_start = perf_counter()
+        await cache.append(NAMESPACE, MESSAGE)
+        timings.append(perf_counter() - op_start)
+    report("in-memory append", timings, perf_counter() - start)
+
+    timings = []
+    start = perf_counter()
+    for _ in range(operations // 10):
+        op_start = perf_counter()
+        await cache.get_all(NAMESPACE)
+        timings.append(perf_counter() - op_start)
+    report("in-memory read (100 msgs)", timings, perf_counter() - start)
+
+
+async def bench_async(url: str, operations: int, concurrency: int):
+    cache = RedisMessageCache(url=url, prefix="bench:chat", max_length=100, timeout=5.0)
+    if not await cache.connect():
+        raise SystemExit(f"Redis not reachable at {url}")
+    await cache.clear(NAMESPACE)
+
+    async def worker(count: int, operation) -> list[float]:
+        timings = []
+        for _ in range(count):
+            op_start = perf_counter()
+            await operation()
+            timings.append(perf_counter() - op_start)
+        return timings
+
+    async def run(name: str, count: int, operation):
+        per_worker = max(1, count // concurrency)
+        start = perf_counter()
+        results = await asyncio.gather(
+            *(worker(per_worker, operation) for _ in range(concurrency))
+        )
+        report(name, [t for timings in results for t in timings], perf_counter() - start)
+
+    async def read():
+        await cache.get_all(NAMESPACE)
+
+    await run(f"async append x{concurrency}", operations, lambda: cache.append(NAMESPACE, MESSAGE))
+    await run(f"async read x{concurrency} (100 msgs)", operations // 10, read)
+    await cache.clear(NAMESPACE)
+    await cache.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="redis://localhost:6379/15")
+    parser.add_argument("--operations", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--skip-redis", action="store_true", help="Only benchmark the in-memory fallbacks")
+    args = parser.parse_args()
+
+    print(f"{'operation':<28} {'ops/s':>10} {'p50 ms':>8} {'p99 ms':>8}")
+    asyncio.run(bench_fallback(args.operations))
+    if args.skip_redis:
+        return
+    bench_blocking(args.url, args.operations)
+    asyncio.run(bench_async(args.url, args.operations, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
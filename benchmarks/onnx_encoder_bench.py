@@ -0,0 +1,84 @@
+"""
+Benchmark the ONNX MiniLM encoder against SentenceTransformer.
+
+Reports model load time, single-sentence latency (the retrieval path), batch throughput
+(the memory writer path) and the largest cosine deviation from SentenceTransformer.
+Export the model first with `rye run export-onnx-encoder`.
+
+Usage:
+    python benchmarks/onnx_encoder_bench.py [--model-path src/convo_backend/assets/models/all-MiniLM-L6-v2.onnx] [--calls 200]
+"""
+
+import argparse
+import random
+from time import perf_counter
+
+import numpy as np
+
+from convo_backend.config import Config
+
+WORDS = (
+    "gm wagmi solana convo token space host speaker price chart validator staking "
+    "rewards airdrop community roadmap launch listen question answer market"
+).split()
+
+
+def sentences(count: int, rng: random.Random) -> list[str]:
+    # Mostly short utterances with the occasional long one, like a Space transcript
+    return [
+        " ".join(rng.choices(WORDS, k=rng.choice([1, 2, 4, 8, 16, 48])))
+        for _ in range(count)
+    ]
+
+
+def load_encoders(model_path: str) -> dict:
+    encoders = {}
+    start = perf_counter()
+    from sentence_transformers import SentenceTransformer
+
+    encoders["sentence-transformers"] = (
+        SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2", device="cpu"),
+        perf_counter() - start,
+    )
+    start = perf_counter()
+    from convo_backend.core.onnx_encoder import OnnxSentenceEncoder
+
+    encoders["onnx"] = (OnnxSentenceEncoder(model_path), perf_counter() - start)
+    return encoders
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model-path", default=Config.LOW_DIM_ONNX_MODEL_PATH)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=256)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    singles = sentences(args.calls, rng)
+    batch = sentences(args.batch, rng)
+    encoders = load_encoders(args.model_path)
+
+    reference = encoders["sentence-transformers"][0].encode(batch, normalize_embeddings=True)
+    print(f"{'encoder':<22} {'load s':>7} {'p50 ms':>8} {'p99 ms':>8} {'sent/s':>8} {'max dev':>9}")
+    for name, (encoder, load_time) in encoders.items():
+        timings = []
+        for sentence in singles:
+            start = perf_counter()
+            encoder.encode(sentence)
+            timings.append(perf_counter() - start)
+        timings = np.array(timings) * 1000
+
+        start = perf_counter()
+        embeddings = np.asarray(encoder.encode(batch), dtype=np.float32)
+        throughput = len(batch) / (perf_counter() - start)
+        embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+        deviation = float(np.max(1 - np.sum(reference * embeddings, axis=1)))
+        print(
+            f"{name:<22} {load_time:7.2f} {np.percentile(timings, 50):8.2f} "
+            f"{np.percentile(timings, 99):8.2f} {throughput:8.0f} {deviation:9.2e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
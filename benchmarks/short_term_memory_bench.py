@@ -0,0 +1,61 @@
+"""
+Benchmark short-term memory over a long simulated session.
+
+Inserts one 384-dimensional embedding per simulated turn into ShortTermMemory and
+reports search latency and traced allocations at checkpoints. Both should stay flat once
+the ring is full.
+
+Usage:
+    python benchmarks/short_term_memory_bench.py [--turns 100000] [--capacity 512] [--checkpoints 5]
+"""
+
+import argparse
+import tracemalloc
+from time import perf_counter
+
+import numpy as np
+
+from convo_backend.core.short_term_memory import ShortTermMemory
+
+DIM = 384
+QUERIES = 200
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=100_000)
+    parser.add_argument("--capacity", type=int, default=512)
+    parser.add_argument("--checkpoints", type=int, default=5)
+    parser.add_argument("-k", type=int, default=4)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    queries = rng.standard_normal((QUERIES, DIM), dtype=np.float32)
+    memory = ShortTermMemory(DIM, capacity=args.capacity, max_age=None)
+
+    tracemalloc.start()
+    step = max(1, args.turns // args.checkpoints)
+    print(f"{'turns':>10} {'entries':>8} {'traced MB':>10} {'p50 ms':>8} {'p99 ms':>8}")
+    for turn in range(0, args.turns, step):
+        count = min(step, args.turns - turn)
+        vectors = rng.standard_normal((count, DIM), dtype=np.float32)
+        # Simulated turns arrive a second apart
+        timestamps = np.arange(turn, turn + count, dtype=np.float64)
+        for offset in range(count):
+            memory.add([f"turn {turn + offset}"], vectors[offset], [timestamps[offset]])
+
+        timings = []
+        for query in queries:
+            start = perf_counter()
+            memory.search(query, args.k, now=float(turn + count))
+            timings.append(perf_counter() - start)
+        timings = np.array(timings) * 1000
+        current, _ = tracemalloc.get_traced_memory()
+        print(
+            f"{turn + count:>10} {len(memory):>8} {current / 2**20:10.2f} "
+            f"{np.percentile(timings, 50):8.3f} {np.percentile(timings, 99):8.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
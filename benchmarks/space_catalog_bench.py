@@ -0,0 +1,103 @@
+"""
+Benchmark parsing and indexing large Spaces search responses.
+
+Builds synthetic search responses with many Spaces and users, then compares the previous
+parse_x_spaces (scanning every user and topic for every Space, linear get_space_by_id)
+with the indexed parse_x_spaces plus SpaceCatalog merges and lookups.
+
+Usage:
+    python benchmarks/space_catalog_bench.py [--spaces 100 1000 3000] [--users-per-space 8] [--lookups 1000]
+"""
+
+import argparse
+import random
+from time import perf_counter
+
+from convo_backend.services.space_catalog import SpaceCatalog
+from convo_backend.services.x_api import parse_x_spaces
+
+TOPICS = 50
+
+
+def build_response(spaces: int, users_per_space: int, rng: random.Random) -> dict:
+    users = [{"id": str(i), "username": f"user{i}"} for i in range(spaces * users_per_space // 2)]
+    data = []
+    for i in range(spaces):
+        members = rng.sample(users, users_per_space)
+        data.append(
+            {
+                "id": f"space{i}",
+                "lang": "en",
+                "host_ids": [user["id"] for user in members[:2]],
+                "speaker_ids": [user["id"] for user in members[2:]],
+                "topic_ids": [str(rng.randrange(TOPICS)) for _ in range(3)],
+            }
+        )
+    topics = [{"id": str(i), "name": f"topic{i}"} for i in range(TOPICS)]
+    return {"data": data, "includes": {"users": users, "topics": topics}}
+
+
+def parse_x_spaces_nested(api_response: dict, only_english: bool = True):
+    """parse_x_spaces before indexing, for comparison."""
+    parsed_spaces = []
+    for space in api_response["data"]:
+        if only_english and space["lang"] != "en":
+            continue
+        parsed_space = {"speakers": [], "hosts": []}
+        for user in api_response["includes"]["users"]:
+            if space.get("speaker_ids") and user["id"] in space["speaker_ids"]:
+                parsed_space["speakers"].append(user)
+            if user["id"] in space["host_ids"]:
+                parsed_space["hosts"].append(user)
+        parsed_space["topics"] = []
+        for topic in api_response["includes"].get("topics", []):
+            if space.get("topic_ids") and topic["id"] in space["topic_ids"]:
+                parsed_space["topics"].append(topic)
+        parsed_space["space_id"] = space["id"]
+        parsed_spaces.append(parsed_space)
+    return parsed_spaces
+
+
+def get_space_by_id_linear(spaces: list, space_id: str):
+    for space in spaces:
+        if space["space_id"] == space_id:
+            return space
+    return None
+
+
+def timed(function) -> tuple[float, object]:
+    start = perf_counter()
+    result = function()
+    return (perf_counter() - start) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--spaces", type=int, nargs="+", default=[100, 1000, 3000])
+    parser.add_argument("--users-per-space", type=int, default=8)
+    parser.add_argument("--lookups", type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(
+        f"{'spaces':>7} {'nested parse ms':>16} {'indexed parse ms':>17} {'merge ms':>9} "
+        f"{'linear lookups ms':>18} {'catalog lookups ms':>19}"
+    )
+    for count in args.spaces:
+        response = build_response(count, args.users_per_space, rng)
+        ids = [f"space{rng.randrange(count)}" for _ in range(args.lookups)]
+
+        nested_ms, nested = timed(lambda: parse_x_spaces_nested(response))
+        indexed_ms, parsed = timed(lambda: parse_x_spaces(response))
+        catalog = SpaceCatalog()
+        merge_ms, _ = timed(lambda: catalog.merge(parsed))
+        linear_ms, _ = timed(lambda: [get_space_by_id_linear(nested, i) for i in ids])
+        lookup_ms, _ = timed(lambda: [catalog.get(i) for i in ids])
+        print(
+            f"{count:>7} {nested_ms:16.1f} {indexed_ms:17.1f} {merge_ms:9.1f} "
+            f"{linear_ms:18.1f} {lookup_ms:19.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark Space discovery against a local stub of the X Spaces search endpoint.
+
+The stub answers every search after a fixed delay, standing in for X API latency.
+Compares the previous approach (blocking requests.get, one keyword after another) with
+SpaceDiscovery, cold (every keyword searched concurrently over pooled connections) and
+warm (served from the TTL cache).
+
+Usage:
+    python benchmarks/space_discovery_bench.py [--keywords 9] [--latency 0.25] [--rounds 3]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import perf_counter
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+from convo_backend.services.space_discovery import SpaceDiscovery
+from convo_backend.services.x_api import SPACES_SEARCH_PARAMS, parse_x_spaces
+
+SPACES_PER_QUERY = 20
+
+
+class StubServer(ThreadingHTTPServer):
+    # Room for every concurrent search, the default backlog of 5 stalls new connections
+    request_queue_size = 64
+
+
+def stub_handler(latency: float):
+    class SpacesSearchHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(latency)
+            query = parse_qs(urlparse(self.path).query)["query"][0]
+            # Half of each query's Spaces are shared with every other query
+            spaces = [
+                {"id": f"shared{i}" if i % 2 else f"{query}{i}", "lang": "en", "host_ids": ["1"]}
+                for i in range(SPACES_PER_QUERY)
+            ]
+            body = json.dumps(
+                {"data": spaces, "includes": {"users": [{"id": "1", "username": "host"}]}}
+            ).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("x-rate-limit-limit", "300")
+            self.send_header("x-rate-limit-remaining", "299")
+            self.send_header("x-rate-limit-reset", str(int(time.time()) + 900))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return SpacesSearchHandler
+
+
+def bench_blocking(base_url: str, keywords: list[str]) -> tuple[float, int]:
+    start = perf_counter()
+    candidates = {}
+    for keyword in keywords:
+        response = requests.get(
+            f"{base_url}/spaces/search",
+            params={"query": keyword, **SPACES_SEARCH_PARAMS},
+            headers={"Authorization": "Bearer bench"},
+        )
+        for space in parse_x_spaces(response.json()):
+            candidates.setdefault(space["space_id"], space)
+    return perf_counter() - start, len(candidates)
+
+
+async def bench_discovery(base_url: str, keywords: list[str], rounds: int):
+    discovery = SpaceDiscovery(keywords, ttl=60, base_url=base_url)
+    for _ in range(rounds):
+        discovery.cache.clear()
+        start = perf_counter()
+        candidates = await discovery.discover()
+        print(f"{'discovery (cold)':<24} {(perf_counter() - start) * 1000:10.1f} {len(candidates):11}")
+    start = perf_counter()
+    candidates = await discovery.discover()
+    print(f"{'discovery (cached)':<24} {(perf_counter() - start) * 1000:10.1f} {len(candidates):11}")
+    await discovery.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--keywords", type=int, default=9)
+    parser.add_argument("--latency", type=float, default=0.25, help="Stub response delay in seconds")
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    os.environ.setdefault("X_API_BEARER_TOKEN", "bench")
+    server = StubServer(("127.0.0.1", 0), stub_handler(args.latency))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    keywords = [f"topic{i}" for i in range(args.keywords)]
+
+    print(f"{args.keywords} keywords, {args.latency * 1000:.0f} ms per search")
+    print(f"{'approach':<24} {'elapsed ms':>10} {'candidates':>11}")
+    for _ in range(args.rounds):
+        elapsed, count = bench_blocking(base_url, keywords)
+        print(f"{'sequential requests':<24} {elapsed * 1000:10.1f} {count:11}")
+    asyncio.run(bench_discovery(base_url, keywords, args.rounds))
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark local Space ranking.
+
+Ranks synthetic candidate sets of several sizes with SpaceRanker and reports ranking
+latency and how often the LLM would still be asked to break a tie. Each hop previously
+made one LLM call. No embedder is used, so persona similarity is left out.
+
+Usage:
+    python benchmarks/space_ranker_bench.py [--candidates 10 50 200] [--hops 500] [--tie-margin 0.01]
+"""
+
+import argparse
+import asyncio
+import random
+from time import perf_counter
+
+import numpy as np
+
+from convo_backend.services.space_catalog import SpaceCatalog
+from convo_backend.services.space_ranker import SpaceRanker
+
+KEYWORDS = ["crypto", "memecoin", "solana", "token", "nft"]
+WORDS = ["late night", "alpha", "market", "chat", "builders", "gm", "degen", "ama", *KEYWORDS]
+
+
+def build_spaces(count: int, rng: random.Random) -> list[dict]:
+    spaces = []
+    for i in range(count):
+        hosts = [
+            {"id": f"h{i}-{j}", "public_metrics": {"followers_count": int(rng.paretovariate(1.2) * 100)}}
+            for j in range(rng.randint(1, 2))
+        ]
+        spaces.append(
+            {
+                "space_id": f"space{i}",
+                "title": " ".join(rng.sample(WORDS, 3)),
+                "participant_count": int(rng.paretovariate(1.1) * 10),
+                "lang": "en",
+                "hosts": hosts,
+                "speakers": [{"id": f"s{i}-{j}"} for j in range(rng.randint(0, 8))],
+                "topics": [],
+            }
+        )
+    return spaces
+
+
+async def run(candidates: int, hops: int, tie_margin: float, rng: random.Random):
+    llm_calls = 0
+
+    async def tie_break(spaces: list[dict]) -> str:
+        nonlocal llm_calls
+        llm_calls += 1
+        return spaces[0]["space_id"]
+
+    ranker = SpaceRanker(KEYWORDS, SpaceCatalog(), tie_break=tie_break, tie_margin=tie_margin)
+    timings = []
+    for _ in range(hops):
+        spaces = build_spaces(candidates, rng)
+        start = perf_counter()
+        await ranker.choose(spaces)
+        timings.append(perf_counter() - start)
+    timings = np.array(timings) * 1000
+    print(
+        f"{candidates:>10} {np.percentile(timings, 50):8.3f} {np.percentile(timings, 99):8.3f} "
+        f"{llm_calls:>10} {hops - llm_calls:>14}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--candidates", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--hops", type=int, default=500)
+    parser.add_argument("--tie-margin", type=float, default=0.01)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(f"{args.hops} hops per size, previously {args.hops} LLM calls each")
+    print(f"{'candidates':>10} {'p50 ms':>8} {'p99 ms':>8} {'LLM calls':>10} {'calls avoided':>14}")
+    for candidates in args.candidates:
+        asyncio.run(run(candidates, args.hops, args.tie_margin, rng))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark long-term memory retrieval query latency with VectorIndex.
+
+Builds indexes of random 384-dimensional embeddings (the MiniLM size) and times
+top-k queries for the exact float32 index, the int8-quantized index and the IVF index.
+
+Usage:
+    python benchmarks/vector_index_bench.py [--sizes 10000,100000,1000000] [--queries 200]
+"""
+
+import argparse
+from time import perf_counter
+
+import numpy as np
+
+from convo_backend.core.vector_index import VectorIndex
+
+DIM = 384
+ADD_BATCH = 50_000
+
+
+def build(size: int, rng: np.random.Generator, **kwargs) -> tuple[VectorIndex, float]:
+    index = VectorIndex(DIM, **kwargs)
+    start = perf_counter()
+    for offset in range(0, size, ADD_BATCH):
+        count = min(ADD_BATCH, size - offset)
+        vectors = rng.standard_normal((count, DIM), dtype=np.float32)
+        index.add(list(range(offset, offset + count)), vectors)
+    return index, perf_counter() - start
+
+
+def time_queries(index: VectorIndex, queries: np.ndarray, k: int) -> np.ndarray:
+    timings = []
+    for query in queries:
+        start = perf_counter()
+        index.search(query, k)
+        timings.append(perf_counter() - start)
+    return np.array(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--sizes",
+        type=lambda x: [int(s) for s in x.split(",")],
+        default=[10_000, 100_000, 1_000_000],
+    )
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    queries = rng.standard_normal((args.queries, DIM), dtype=np.float32)
+    variants = {
+        "float32 exact": dict(ivf_threshold=10**12),
+        "int8 exact": dict(quantize=True, ivf_threshold=10**12),
+        "float32 IVF": dict(ivf_threshold=0, nprobe=8),
+    }
+
+    print(f"{'memories':>10}  {'variant':<14} {'build s':>8} {'MB':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    for size in args.sizes:
+        for name, kwargs in variants.items():
+            index, build_time = build(size, rng, **kwargs)
+            timings = time_queries(index, queries, args.k) * 1000
+            print(
+                f"{size:>10}  {name:<14} {build_time:8.2f} {index.nbytes / 2**20:8.1f} "
+                f"{np.percentile(timings, 50):8.3f} {np.percentile(timings, 99):8.3f}"
+            )
+            del index
+
+
+if __name__ == "__main__":
+    main()
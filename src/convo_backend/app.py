@@ -1,13 +1,15 @@
 from dotenv import load_dotenv
 import logging
+from convo_backend.utils.startup import startup_timeline
 from convo_backend.utils.logging import setup_logging, add_logging_args
+from convo_backend.utils.metrics import add_metrics_args, start_metrics_server
+from convo_backend.utils.watchdog import LoopWatchdog
 import subprocess
 import convo_backend.config
 load_dotenv(override=True, dotenv_path=convo_backend.config.Config.ENV_PATH)
 from importlib import reload
 reload(convo_backend.config) #Reload config to ensure env vars are updated if need be
 import argparse
-from convo_backend.gui.gui import ConvoGUI
 import platform
 import asyncio
 import sys
@@ -30,6 +32,16 @@ async def detect_end_program(convo: ConvoCore):
         await convo.stop()
 
 
+async def report_startup(convo: ConvoCore):
+    """
+    Log the startup timeline once the models loading in the background are ready.
+    """
+    await convo.wait_until_warm()
+    logging.getLogger("convo.startup").info(
+        f"Startup profile:\n{startup_timeline.report()}"
+    )
+
+
 def parse_args() -> argparse.Namespace:
     """
     Parse command line arguments.
@@ -64,9 +76,16 @@ def parse_args() -> argparse.Namespace:
         type=lambda x: [s.strip() for s in x.split(",")],
         help="Comma separated list of spaces to roam to",
     )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Log a per-component startup timeline once background loading finishes",
+    )
 
     # Add logging arguments
     add_logging_args(parser)
+    # Add metrics arguments
+    add_metrics_args(parser)
 
     return parser.parse_args()
 
@@ -116,23 +135,43 @@ async def main(args: argparse.Namespace):
 
     # Setup logging first
     setup_logging(args=args)
+    # Start metrics server if enabled
+    metrics_server = start_metrics_server(args)
+    # Watch the event loop for stalls
+    watchdog = None
+    if metrics_server or getattr(args, "loop_watchdog", False):
+        watchdog = LoopWatchdog(
+            threshold=getattr(args, "loop_stall_threshold_ms", 100.0) / 1000
+        )
+        watchdog.start()
     # Start Redis server
-    redis_process = start_redis_server()
+    with startup_timeline.track("redis"):
+        redis_process = start_redis_server()
 
     try:
         if args.gui:
+            # tkinter is only imported for GUI runs
+            from convo_backend.gui.gui import ConvoGUI
+
             gui = ConvoGUI()
             await gui.run()
         else:
-            convo = ConvoCore(
-                device=args.device,
-                roam=args.roam,
-                monitor=args.monitor,
-                desired_spaces=args.desired_spaces,
-            )
+            with startup_timeline.track("core"):
+                convo = ConvoCore(
+                    device=args.device,
+                    roam=args.roam,
+                    monitor=args.monitor,
+                    desired_spaces=args.desired_spaces,
+                )
             await convo.start()
+            if getattr(args, "profile_startup", False):
+                asyncio.create_task(report_startup(convo))
             await detect_end_program(convo)
     finally:
+        if watchdog:
+            await watchdog.stop()
+        if metrics_server:
+            metrics_server.stop()
         # Ensure Redis server is terminated when the application exits
         if redis_process:
             try:
@@ -165,10 +204,13 @@ if __name__ == "__main__":
             gui=True,
             debug=False,
             log_level="INFO",  # Match the defaults from add_logging_args
+            async_logging=False,
+            log_rate_limit=0,
             device="vb-cables",
             roam=False,
             monitor=False,
             desired_spaces=None,
+            profile_startup=False,
             audio_log_level="INFO",
             vad_log_level="INFO",
             pipeline_log_level="INFO",
@@ -178,6 +220,10 @@ if __name__ == "__main__":
             chat_log_level="INFO",
             cache_log_level="INFO",
             roaming_log_level="INFO",
+            memory_log_level="INFO",
+            metrics_port=None,
+            loop_watchdog=False,
+            loop_stall_threshold_ms=100.0,
         )
     else:
         args = parse_args()
@@ -49,5 +49,79 @@ class Config:
     CLASSIFIER_MODEL_PATH: ClassVar[str] = f"{BASE_PATH}/assets/models/classifier.onnx"
     CLASSIFIER_MAX_LENGTH: ClassVar[int] = 64
 
+    # Message cache settings
+    REDIS_URL: ClassVar[str] = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    REDIS_TIMEOUT: ClassVar[float] = 1.0  # seconds before a Redis call falls back to memory
+    MESSAGE_CACHE_MAX_LENGTH: ClassVar[int] = 100
+    MESSAGE_CACHE_TTL: ClassVar[int] = 120  # seconds
+
+    # Space discovery settings
+    SPACE_DISCOVERY_TTL: ClassVar[float] = 60.0  # seconds search results are reused
+    SPACE_DISCOVERY_MAX_CONNECTIONS: ClassVar[int] = 10
+    SPACE_DISCOVERY_TIMEOUT: ClassVar[float] = 10.0  # seconds
+    SPACE_DISCOVERY_BACKOFF: ClassVar[float] = 15.0  # first wait when no Space is found, doubled up to the max
+    SPACE_DISCOVERY_BACKOFF_MAX: ClassVar[float] = 300.0
+    X_SPACES_SEARCH_RATE_LIMIT: ClassVar[int] = 300  # requests per window (app auth)
+    X_SPACES_SEARCH_RATE_LIMIT_PERIOD: ClassVar[float] = 900.0  # seconds
+    SPACE_MAX_JOIN_FAILURES: ClassVar[int] = 2  # failed joins before a Space is skipped
+    SPACE_JOIN_HISTORY_TTL: ClassVar[float] = 6 * 60 * 60.0  # seconds joins and failed joins are remembered
+    # Spaces scoring within this margin of the best are tied, and the LLM picks among them
+    SPACE_RANKER_TIE_MARGIN: ClassVar[float] = 0.01
+    SPACE_RANKER_LLM_MAX_CANDIDATES: ClassVar[int] = 5  # 0 sends every tied Space
+
+    # Browser settings
+    # Reuse an encrypted Chrome profile between runs so the X login survives (key in BROWSER_PROFILE_KEY)
+    BROWSER_PERSISTENT_PROFILE: ClassVar[bool] = os.getenv("BROWSER_PERSISTENT_PROFILE", "false").lower() == "true"
+    BROWSER_PROFILE_PATH: ClassVar[str] = os.getenv(
+        "BROWSER_PROFILE_PATH", os.path.expanduser("~/.convo/browser_profile.enc")
+    )
+    # Block images and video in the browser, Space audio is unaffected
+    BROWSER_TRIM_RESOURCES: ClassVar[bool] = os.getenv("BROWSER_TRIM_RESOURCES", "true").lower() == "true"
+    BROWSER_BLOCKED_URLS: ClassVar[list[str]] = [
+        "*pbs.twimg.com/media/*",
+        "*pbs.twimg.com/profile_banners/*",
+        "*video.twimg.com/*",
+        "*.mp4*",
+        "*.webm*",
+    ]
+
+    # Mute state tracking: "observer" (MutationObserver in the page) or "poll" (WebDriver lookups)
+    MUTE_TRACKING: ClassVar[str] = os.getenv("MUTE_TRACKING", "observer")
+    MUTE_OBSERVER_POLL_INTERVAL: ClassVar[float] = 0.5  # seconds, when BiDi events are unavailable
+    MUTE_OBSERVER_HEARTBEAT: ClassVar[float] = 5.0  # seconds between checks while BiDi pushes changes
+    MUTE_BUTTON_MISSING_GRACE: ClassVar[float] = 4.0  # seconds without a mic button before leaving
+
+    # Memory settings
+    MEMORY_WRITE_QUEUE_SIZE: ClassVar[int] = 256
+    MEMORY_WRITE_BATCH_SIZE: ClassVar[int] = 32
+    MEMORY_WRITE_BATCH_WAIT: ClassVar[float] = 2.0  # seconds
+    MEMORY_WRITE_CLOSE_TIMEOUT: ClassVar[float] = 10.0  # seconds to flush queued memories on shutdown
+    LOW_DIM_EMBEDDING_MODEL: ClassVar[str] = "all-MiniLM-L6-v2"  # name in embedding cache keys
+    LOW_DIM_EMBEDDING_SIZE: ClassVar[int] = 384  # all-MiniLM-L6-v2
+    # "sentence-transformers" (PyTorch) or "onnx" (see core/onnx_encoder.py for the export)
+    LOW_DIM_ENCODER: ClassVar[str] = os.getenv("LOW_DIM_ENCODER", "sentence-transformers")
+    LOW_DIM_ONNX_MODEL_PATH: ClassVar[str] = os.getenv(
+        "LOW_DIM_ONNX_MODEL_PATH", f"{BASE_PATH}/assets/models/all-MiniLM-L6-v2.onnx"
+    )
+    MEMORY_INDEX_QUANTIZE: ClassVar[bool] = os.getenv("MEMORY_INDEX_QUANTIZE", "false").lower() == "true"
+    MEMORY_INDEX_IVF_THRESHOLD: ClassVar[int] = 200_000
+    MEMORY_INDEX_LOAD_BATCH: ClassVar[int] = 10_000
+    # How embeddings are stored in MongoDB: "list" (BSON doubles), "float32" or "float16" (packed blobs)
+    EMBEDDING_STORAGE: ClassVar[str] = os.getenv("EMBEDDING_STORAGE", "list")
+    MEMORY_SEARCH_TIME_BUDGET: ClassVar[float] = 0.05  # seconds
+    SHORT_TERM_MEMORY_CAPACITY: ClassVar[int] = 512
+    SHORT_TERM_MEMORY_MAX_AGE: ClassVar[float] = 3600.0  # seconds
+    SHORT_TERM_MEMORY_HALF_LIFE: ClassVar[float] = 900.0  # seconds
+    # How long after transcription ends retrieved memories may still be added to the prompt
+    MEMORY_RETRIEVAL_DEADLINE: ClassVar[float] = float(os.getenv("MEMORY_RETRIEVAL_DEADLINE", "0.05"))  # seconds
+    MEMORY_RETRIEVAL_TOP_K: ClassVar[int] = 3
+    # Results kept for long-term memories, when there are any, so recent chatter can't crowd them out
+    MEMORY_RETRIEVAL_LONG_TERM_SLOTS: ClassVar[int] = 1
+    # Recency weighted cosine similarity below which short-term memories aren't used
+    MEMORY_RETRIEVAL_SHORT_TERM_MIN_SCORE: ClassVar[float] = 0.3
+    EMBEDDING_CACHE_SIZE: ClassVar[int] = 4096  # vectors per process
+    # SQLite file for the persistent embedding cache tier, unset keeps the cache in memory only
+    EMBEDDING_CACHE_PATH: ClassVar[str] = os.getenv("EMBEDDING_CACHE_PATH")
+
     with open("config.json", "r") as file:
         BEHAVIORAL_CONFIG = json.load(file)
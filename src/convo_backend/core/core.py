@@ -2,21 +2,57 @@ import logging
 import sounddevice as sd
 import asyncio
 import queue
-from silero_vad import load_silero_vad
-import torch
 from convo_backend.services.transcription import transcribe_audio
 from convo_backend.services.tts import TTSStream
-from convo_backend.services.x_roaming import ConvoRoamer
 from convo_backend.utils.audio import pcm_to_float32
 import numpy as np
 from convo_backend.config import Config
 from convo_backend.utils.latency import LatencyLog
+from convo_backend.utils.metrics import REGISTRY
 from convo_backend.services.chat import ChatService
+from convo_backend.services.messages_cache import close_cache
 import platform
-from convo_backend.core.memory import Memory
+from time import monotonic
+from convo_backend.core.memory_writer import MemoryWriter
+from convo_backend.core.retrieval import MemoryRetriever
+from convo_backend.utils.startup import LazyComponent, startup_timeline
 
 latency_log = LatencyLog()
 
+OUTPUT_BUFFER_FILL = REGISTRY.gauge(
+    "convo_output_buffer_samples",
+    "Samples queued for playback when the output callback last ran",
+)
+OUTPUT_UNDERRUNS = REGISTRY.counter(
+    "convo_output_underruns",
+    "Output callbacks that ran out of queued audio part way through a block",
+)
+INPUT_QUEUE_DEPTH = REGISTRY.gauge(
+    "convo_input_queue_depth",
+    "Captured audio chunks waiting for voice activity detection",
+)
+VAD_FRAMES = REGISTRY.counter(
+    "convo_vad_frames",
+    "Audio chunks processed by voice activity detection",
+)
+VAD_FRAMES_PER_SECOND = REGISTRY.gauge(
+    "convo_vad_frames_per_second",
+    "Audio chunks processed by voice activity detection over the last second",
+)
+
+
+def _load_vad_model():
+    from silero_vad import load_silero_vad
+
+    return load_silero_vad(onnx=True)
+
+
+def _load_memory():
+    # Pulls in mongoengine and both embedding models
+    from convo_backend.core.memory import Memory
+
+    return Memory()
+
 
 class ConvoCore:
     """
@@ -44,6 +80,7 @@ class ConvoCore:
 
         self.input_queue = queue.Queue()
         self.output_queue = queue.Queue()
+        INPUT_QUEUE_DEPTH.set_function(self.input_queue.qsize)
         self.monitor_queue = queue.Queue()
         # Queue to store and access data for transcription service
         self.transcription_queue = asyncio.Queue()
@@ -53,11 +90,11 @@ class ConvoCore:
         self.output_stream = None
         self.tts_stream = TTSStream()
 
-        self.x_roamer = ConvoRoamer(desired_spaces=desired_spaces)
-
-        self.chat_service = ChatService()
-
-        self.memory = Memory()
+        # Models and clients are loaded in the background once start() has audio running
+        self.chat_service = LazyComponent("chat", ChatService)
+        self.memory = LazyComponent("memory", _load_memory)
+        self.memory_writer = MemoryWriter(self.memory)
+        self.memory_retriever = MemoryRetriever(self.memory)
 
         # Separate parameters for input and output
         self.INPUT_CHANNELS = Config.INPUT_CHANNELS
@@ -69,18 +106,36 @@ class ConvoCore:
         self.OUTPUT_CHUNK = Config.OUTPUT_CHUNK
 
         # VAD parameters remain the same
-        self.VAD_MODEL = load_silero_vad(onnx=True)
+        self.vad_component = LazyComponent("vad", _load_vad_model)
+        self.VAD_MODEL = None  # Set by _process_audio once loaded
+        self.vad_to_tensor = None  # torch.from_numpy, torch is imported with the VAD model
         self.VAD_CERTAINTY_THRESHOLD = Config.VAD_CERTAINTY_THRESHOLD
         self.user_is_speaking = False
         # Number of chunks to wait before declaring user is not speaking
         self.user_is_speaking_grace_period = Config.SPEAKING_GRACE_PERIOD
         self.user_is_speaking_grace_counter = 0
+        # Window for computing VAD frames per second
+        self.vad_window_start = monotonic()
+        self.vad_window_frames = 0
+
+        # Mouth-to-ear latency tracking, all on the monotonic clock
+        # ADC time at which the last chunk containing speech finished being captured
+        self.last_speech_captured_at = None
+        # ADC time at which the user stopped speaking for the current turn
+        self.speech_ended_at = None
+        # Set by the response pipeline until the output callback plays its first sample
+        self.first_audio_pending = False
+        self.loop = None
 
         self.current_response_task = None
         self.roaming_task = None
 
         self.roam = roam
         self.monitor = monitor
+        # Roaming is only built when it's used
+        self.x_roamer = LazyComponent(
+            "roaming", lambda: self._build_roamer(desired_spaces)
+        )
 
         self.MIN_BUFFER_SIZE = (
             self.OUTPUT_RATE // self.OUTPUT_CHUNK
@@ -141,6 +196,18 @@ class ConvoCore:
 
         self.device_logger.info("Using BlackHole 2ch devices")
 
+    @staticmethod
+    def _stream_time_to_monotonic(buffer_time: float, current_time: float) -> float:
+        """
+        Convert a PortAudio stream timestamp (ADC or DAC time) to the monotonic clock.
+
+        Host APIs that don't report timestamps give 0, in which case "now" is used.
+        """
+        now = monotonic()
+        if not buffer_time or not current_time:
+            return now
+        return now + (buffer_time - current_time)
+
     def input_callback(self, indata, frames, time, status):
         """
         Process incoming audio data from the input stream.
@@ -152,7 +219,7 @@ class ConvoCore:
             status (CallbackFlags): Status flags
         """
         if status:
-            self.audio_logger.warning(f"Input stream callback status: {status}")
+            self.audio_logger.warning("Input stream callback status: %s", status)
 
         # Convert to int16
         indata_int16 = (indata * 32767).astype(np.int16)
@@ -161,7 +228,11 @@ class ConvoCore:
         mono_chunk = (indata_int16[:, 0] + indata_int16[:, 1]).astype(np.float32)
         mono_chunk = (mono_chunk / 2).astype(np.int16)
 
-        self.input_queue.put(mono_chunk.copy())
+        # Tag the chunk with the time its first sample hit the ADC
+        captured_at = self._stream_time_to_monotonic(
+            time.inputBufferAdcTime, time.currentTime
+        )
+        self.input_queue.put((mono_chunk.copy(), captured_at))
 
         # If monitoring, put the mono chunk into the monitor queue
         if self.monitor:
@@ -178,8 +249,11 @@ class ConvoCore:
             status (CallbackFlags): Status flags
         """
         if status:
-            self.audio_logger.warning(f"Output stream callback status: {status}")
+            self.audio_logger.warning("Output stream callback status: %s", status)
+            if status.output_underflow:
+                OUTPUT_UNDERRUNS.inc()
 
+        OUTPUT_BUFFER_FILL.set(self.output_queue.qsize())
         buffer = []
 
         try:
@@ -189,23 +263,47 @@ class ConvoCore:
                 frame = self.output_queue.get_nowait()
                 # add it to buffer
                 buffer.append(frame)
+                if self.first_audio_pending and len(buffer) == 1:
+                    self._mark_first_audio(time)
 
             outdata[:] = np.array(buffer)
             buffer = []
         except queue.Empty:
             if len(buffer) > 0:
+                OUTPUT_UNDERRUNS.inc()
                 buffer.extend([[0] for _ in range(frames - len(buffer))])
                 outdata[:] = np.array(buffer)
                 buffer = []
             else:
                 outdata.fill(0)
 
+    def _mark_first_audio(self, time):
+        """
+        Record the DAC time of the first sample of a response. Runs in the output callback,
+        so reporting is handed off to the event loop.
+        """
+        self.first_audio_pending = False
+        audible_at = self._stream_time_to_monotonic(
+            time.outputBufferDacTime, time.currentTime
+        )
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self._report_mouth_to_ear, audible_at)
+
+    def _report_mouth_to_ear(self, audible_at: float):
+        """Log the time from the user's last spoken sample to the bot's first audible sample."""
+        if self.speech_ended_at is None:
+            return
+        latency_log.log_end_to_end_latency(
+            "User stopped speaking --> First bot sample audible",
+            audible_at - self.speech_ended_at,
+        )
+
     def monitor_callback(self, outdata, frames, time, status):
         """
         Handle audio coming in from X - looks inside of the monitor queue and plays it out.
         """
         if status:
-            self.audio_logger.warning(f"Monitor stream callback status: {status}")
+            self.audio_logger.warning("Monitor stream callback status: %s", status)
 
         # Replace queue size debug prints with logging
         # queue_size = self.monitor_queue.qsize() * self.OUTPUT_CHUNK
@@ -230,6 +328,14 @@ class ConvoCore:
     async def start(self):
         """Initialize and start audio streams and processing pipeline."""
         self.audio_logger.info("Initializing audio streams...")
+        self.loop = asyncio.get_running_loop()
+
+        # Load models while the audio streams and TTS connection come up
+        self.vad_component.warm()
+        self.chat_service.warm()
+        self.memory.warm()
+
+        audio_span = startup_timeline.begin("audio streams")
 
         # Start input stream (16kHz for VAD)
         self.input_stream = sd.InputStream(
@@ -265,17 +371,23 @@ class ConvoCore:
         self.OUTPUT_CHUNK = self.output_stream.blocksize
         self.INPUT_CHUNK = self.input_stream.blocksize
 
-        # Start TTS server connection
-        await self.tts_stream.connect()
-
-        # Start processing thread
+        # Start processing thread, capture is queued until the VAD model is ready
         self.running = True
         self.process_thread = asyncio.create_task(self._process_audio())
 
         self.input_stream.start()
         self.output_stream.start()
+        startup_timeline.end(audio_span)
         self.audio_logger.info("Audio streams successfully started")
 
+        # Start TTS server connection
+        with startup_timeline.track("tts connect"):
+            await self.tts_stream.connect()
+
+        # Start long-term memory writer and warm retrieval indexes
+        self.memory_writer.start()
+        self.memory_retriever.warm()
+
         if self.roam:
             await self.start_roaming()
 
@@ -295,27 +407,71 @@ class ConvoCore:
             self.monitor_from_x.close()
 
         await self.tts_stream.close()
+        await close_cache()
+
+        if self.x_roamer.loaded:
+            # Quits Chrome and saves the encrypted browser profile
+            x_roamer = await self.x_roamer.aget()
+            await x_roamer.stop()
+
+        # Flush queued memories, giving up (and logging how many) if MongoDB is too slow
+        await asyncio.to_thread(
+            self.memory_writer.close, Config.MEMORY_WRITE_CLOSE_TIMEOUT
+        )
+        self.memory_retriever.close()
 
         
         
 
+    def _build_roamer(self, desired_spaces: list[str] = None):
+        # Selenium is only imported when roaming is used
+        from convo_backend.services.x_roaming import ConvoRoamer
+
+        return ConvoRoamer(
+            desired_spaces=desired_spaces,
+            chat_service=self.chat_service,
+            # Runs in a worker thread, waiting for memory to load if it hasn't yet
+            embed=lambda texts: self.memory.low_dim_embedder.embed_many(texts),
+        )
+
+    async def wait_until_warm(self):
+        """Wait for the components start() loads in the background."""
+        await asyncio.gather(
+            self.vad_component.aget(),
+            self.chat_service.aget(),
+            self.memory.aget(),
+            return_exceptions=True,
+        )
+
     async def start_roaming(self):
         """Roam to X spaces"""
-        await self.x_roamer.start()
-        await self.x_roamer.run_roaming()
+        x_roamer = await self.x_roamer.aget()
+        await x_roamer.start()
+        await x_roamer.run_roaming()
 
     async def _process_audio(self):
         """
         Main audio processing loop that handles input audio and voice activity detection.
         """
+        try:
+            self.VAD_MODEL = await self.vad_component.aget()
+            import torch
+        except Exception as e:
+            self.vad_logger.error(
+                f"Failed to load the VAD model, audio will not be processed: {e}",
+                exc_info=True,
+            )
+            return
+
+        self.vad_to_tensor = torch.from_numpy
         self.audio_logger.info("Starting audio processing loop")
         while self.running:
             try:
                 # Get input audio
-                input_data = self.input_queue.get_nowait()
+                input_data, captured_at = self.input_queue.get_nowait()
 
                 # VAD Voice Activity Detection on audio coming in
-                await self.vad_detection(input_data)
+                await self.vad_detection(input_data, captured_at)
 
             except queue.Empty:
                 await asyncio.sleep(0.001)
@@ -366,28 +522,32 @@ class ConvoCore:
         Process user input through transcription and generate AI response with text-to-speech.
         """
         try:
-            transcription = await transcribe_audio(audio_queue=self.transcription_queue)
-            # Save transcript to memory (mongodb)
-            asyncio.create_task(
-                asyncio.to_thread(
-                    self.memory.save_to_long_term_memory,
-                    data=transcription["message"],
-                    created_at=transcription["timeStamp"]
-                )
+            # Memory lookups start on each final transcript segment
+            retrieval = self.memory_retriever.start_turn()
+            transcription = await transcribe_audio(
+                audio_queue=self.transcription_queue, on_segment=retrieval.prefetch
+            )
+            memory_context = asyncio.ensure_future(
+                retrieval.results(transcription)
+            )
+            # Queue transcript for saving to memory (mongodb)
+            self.memory_writer.submit(
+                transcription.text, created_at=transcription.timestamp
             )
             buffer = []
+            first_output = True
+            # Resolved on the loop without blocking, in case it is still loading
+            chat_service = await self.chat_service.aget()
             # start mute/unmute sensing task
-            asyncio.create_task(
-                self.chat_service.mute_unmute_sensing_task(
-                    transcription, self.x_roamer.get_toggle_mute_tool()
-                )
-            )
+            asyncio.create_task(self._sense_mute_command(chat_service, transcription))
             # debug_file = open("final_response_audio.raw", "wb")
             if (
-                not self.roam or not self.x_roamer.is_muted
+                not self.roam or not (await self.x_roamer.aget()).is_muted
             ):  # Don't start llm response and voice synthesis unless it is not muted
                 async for audio_chunk in self.tts_stream.stream_to_tts_server(
-                    self.chat_service.stream_bot_response(transcription)
+                    chat_service.stream_bot_response(
+                        transcription, memory_context=memory_context
+                    )
                 ):
                     frames: list[np.ndarray] = pcm_to_float32(
                         audio_chunk, self.OUTPUT_CHUNK
@@ -396,6 +556,10 @@ class ConvoCore:
 
                     # Start outputting once we have enough buffered
                     if len(buffer) >= self.MIN_BUFFER_SIZE:
+                        if first_output:
+                            # Let the output callback timestamp our first sample
+                            self.first_audio_pending = True
+                            first_output = False
                         for frame in buffer:
                             self.output_queue.put(frame)
                             # debug_file.write(chunk.tobytes())
@@ -403,6 +567,8 @@ class ConvoCore:
                         buffer = []
 
                 # Output any remaining chunks
+                if first_output and buffer:
+                    self.first_audio_pending = True
                 for chunk in buffer:
                     self.output_queue.put(chunk)
                     # debug_file.write(chunk.tobytes())
@@ -427,14 +593,25 @@ class ConvoCore:
                 f"Error in response pipeline: {e}", exc_info=True
             )
 
-    async def set_user_is_speaking(self, is_speaking, audio_chunk):
+    async def _sense_mute_command(self, chat_service: ChatService, transcription):
+        """Check the transcription for a mute command once the roamer, which owns the mute tool, is built."""
+        x_roamer = await self.x_roamer.aget()
+        await chat_service.mute_unmute_sensing_task(
+            transcription, x_roamer.get_toggle_mute_tool()
+        )
+
+    async def set_user_is_speaking(self, is_speaking, audio_chunk, captured_at=None):
         """
         Update user speaking state and handle audio processing accordingly.
 
         Args:
             is_speaking (bool): Whether speech is currently detected
             audio_chunk (numpy.ndarray): Audio data chunk to process
+            captured_at (float, optional): Monotonic ADC time of the chunk's first sample
         """
+        if is_speaking and captured_at is not None:
+            self.last_speech_captured_at = captured_at + len(audio_chunk) / self.INPUT_RATE
+
         if not is_speaking:  # if no speech detected
             if self.user_is_speaking:
                 # Increment grace counter when user was speaking but no speech detected
@@ -444,6 +621,7 @@ class ConvoCore:
                     > self.user_is_speaking_grace_period
                 ):
                     self.user_is_speaking = False
+                    self.speech_ended_at = self.last_speech_captured_at or monotonic()
                     await self.transcription_queue.put(
                         None
                     )  # Send end signal to transcription service
@@ -454,6 +632,8 @@ class ConvoCore:
                     self.vad_logger.info("Speech ended - user stopped speaking")
         elif not self.user_is_speaking:  # if speech detected and user was not speaking
             self.user_is_speaking = True
+            self.speech_ended_at = None
+            self.first_audio_pending = False
             self.vad_logger.info("Speech detected - user started speaking")
             # Start AI response pipeline
             asyncio.create_task(self.start_stop_ai_response_pipeline())
@@ -470,12 +650,13 @@ class ConvoCore:
                 audio_chunk
             )  # Send audio chunk to transcription service
 
-    async def vad_detection(self, audio_chunk):
+    async def vad_detection(self, audio_chunk, captured_at=None):
         """
         Perform Voice Activity Detection on an audio chunk.
 
         Args:
             audio_chunk (numpy.ndarray): Audio data to analyze for voice activity
+            captured_at (float, optional): Monotonic ADC time of the chunk's first sample
         """
         if audio_chunk is None:
             return
@@ -491,10 +672,20 @@ class ConvoCore:
 
         # Process through VAD using float data
         speech_prob = self.VAD_MODEL(
-            torch.from_numpy(chunk_float32), self.INPUT_RATE
+            self.vad_to_tensor(chunk_float32), self.INPUT_RATE
         ).item()
 
+        VAD_FRAMES.inc()
+        self.vad_window_frames += 1
+        now = monotonic()
+        if now - self.vad_window_start >= 1.0:
+            VAD_FRAMES_PER_SECOND.set(
+                self.vad_window_frames / (now - self.vad_window_start)
+            )
+            self.vad_window_start = now
+            self.vad_window_frames = 0
+
         # Pass the int16 mono data to transcription
         await self.set_user_is_speaking(
-            speech_prob > self.VAD_CERTAINTY_THRESHOLD, audio_chunk
+            speech_prob > self.VAD_CERTAINTY_THRESHOLD, audio_chunk, captured_at
         )
@@ -0,0 +1,206 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Callable, Optional
+import numpy as np
+from convo_backend.config import Config
+from convo_backend.models.message import Message
+from convo_backend.utils.metrics import REGISTRY
+
+logger = logging.getLogger("convo.memory")
+
+EMBEDDING_CACHE_LOOKUPS = REGISTRY.counter(
+    "convo_embedding_cache_lookups",
+    "Embedding cache lookups by model and result (memory, disk, miss)",
+    ("model", "result"),
+)
+EMBEDDING_API_CALLS_SAVED = REGISTRY.counter(
+    "convo_embedding_api_calls_saved",
+    "Remote embedding API calls avoided because every text was cached",
+    ("model",),
+)
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text before hashing so trivially different inputs share an entry."""
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+
+def cache_key(model: str, text: str) -> bytes:
+    return hashlib.blake2b(
+        f"{model}\0{normalize_text(text)}".encode("utf-8"), digest_size=16
+    ).digest()
+
+
+class EmbeddingCache:
+    """
+    Two-tier embedding cache keyed by model name and normalized text hash.
+
+    The first tier is an in-process LRU of float32 vectors. The optional second tier is a
+    SQLite file of raw float32 vectors that survives restarts; disk hits are promoted into
+    the LRU.
+    """
+
+    def __init__(self, capacity: int = 4096, path: Optional[str] = None):
+        """
+        Args:
+            capacity (int): Vectors kept in the in-process LRU
+            path (str, optional): SQLite file for the persistent tier. None keeps the cache in memory only.
+        """
+        self.capacity = capacity
+        self.entries: OrderedDict[bytes, np.ndarray] = OrderedDict()
+        self.lock = threading.Lock()
+        self.db: Optional[sqlite3.Connection] = None
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.db = sqlite3.connect(path, check_same_thread=False)
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute("PRAGMA synchronous=NORMAL")
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key BLOB PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+            self.db.commit()
+
+    def get_many(
+        self, model: str, texts: list[str], keys: Optional[list[bytes]] = None
+    ) -> list[Optional[np.ndarray]]:
+        """
+        Return the cached vector for each text, or None where it isn't cached.
+
+        `keys` are the texts' cache keys, when the caller has already computed them.
+        """
+        if keys is None:
+            keys = [cache_key(model, text) for text in texts]
+        results: list[Optional[np.ndarray]] = [None] * len(texts)
+        missing: dict[bytes, list[int]] = {}
+        with self.lock:
+            for i, key in enumerate(keys):
+                vector = self.entries.get(key)
+                if vector is not None:
+                    self.entries.move_to_end(key)
+                    results[i] = vector
+                else:
+                    missing.setdefault(key, []).append(i)
+            memory_hits = len(texts) - sum(len(positions) for positions in missing.values())
+
+            disk_hits = 0
+            if missing and self.db is not None:
+                placeholders = ",".join("?" * len(missing))
+                rows = self.db.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                    list(missing),
+                ).fetchall()
+                for key, blob in rows:
+                    vector = np.frombuffer(blob, dtype=np.float32)
+                    self._remember(key, vector)
+                    for i in missing.pop(key):
+                        results[i] = vector
+                        disk_hits += 1
+
+        EMBEDDING_CACHE_LOOKUPS.labels(model, "memory").inc(memory_hits)
+        EMBEDDING_CACHE_LOOKUPS.labels(model, "disk").inc(disk_hits)
+        EMBEDDING_CACHE_LOOKUPS.labels(model, "miss").inc(
+            len(texts) - memory_hits - disk_hits
+        )
+        return results
+
+    def put_many(self, model: str, texts: list[str], vectors, keys: Optional[list[bytes]] = None):
+        """Cache vectors for texts in both tiers."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if keys is None:
+            keys = [cache_key(model, text) for text in texts]
+        rows = []
+        with self.lock:
+            for key, vector in zip(keys, vectors):
+                vector = vector.copy()
+                vector.flags.writeable = False
+                self._remember(key, vector)
+                rows.append((key, vector.tobytes()))
+            if self.db is not None and rows:
+                self.db.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)", rows
+                )
+                self.db.commit()
+
+    def close(self):
+        with self.lock:
+            if self.db is not None:
+                self.db.close()
+                self.db = None
+
+    def _remember(self, key: bytes, vector: np.ndarray):
+        self.entries[key] = vector
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+
+class CachedEmbedder:
+    """
+    Wraps a batch embedding function so only uncached texts are embedded.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        embed: Callable[[list[str]], "np.ndarray | list[list[float]]"],
+        cache: EmbeddingCache,
+        remote: bool = False,
+    ):
+        """
+        Args:
+            model (str): Model name, part of the cache key
+            embed (Callable): Embeds a list of texts, e.g. SentenceTransformer.encode or OpenAIEmbeddings.embed_documents
+            cache (EmbeddingCache): Cache shared between models
+            remote (bool): Whether embed() calls a paid API, for the api calls saved metric
+        """
+        self.model = model
+        self.embed = embed
+        self.cache = cache
+        self.remote = remote
+
+    def embed_many(self, texts: list[str], keys: Optional[list[bytes]] = None) -> np.ndarray:
+        """
+        Embed texts, returning a (len(texts), dim) float32 array.
+
+        `keys` are the texts' cache keys for this model, when the caller has already
+        computed them. Otherwise each text is hashed once here.
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        if keys is None:
+            keys = [cache_key(self.model, text) for text in texts]
+        cached = self.cache.get_many(self.model, texts, keys)
+        missing = [i for i, vector in enumerate(cached) if vector is None]
+        if missing:
+            # Embed each distinct missing text once (texts differing only in whitespace share a key)
+            positions: dict[bytes, list[int]] = {}
+            for i in missing:
+                positions.setdefault(keys[i], []).append(i)
+            unique_texts = [texts[group[0]] for group in positions.values()]
+            new_vectors = np.asarray(self.embed(unique_texts), dtype=np.float32)
+            self.cache.put_many(self.model, unique_texts, new_vectors, list(positions))
+            for group, vector in zip(positions.values(), new_vectors):
+                for i in group:
+                    cached[i] = vector
+        elif self.remote:
+            EMBEDDING_API_CALLS_SAVED.labels(self.model).inc()
+        return np.stack(cached)
+
+    def embed_one(self, text: str) -> np.ndarray:
+        return self.embed_many([text])[0]
+
+    def embed_message(self, message: Message) -> np.ndarray:
+        """
+        Embed a message. The low dimensional embedder keeps the cache key its vector is
+        stored under on the message, so the text is hashed once however often it's embedded.
+        """
+        if self.model != Config.LOW_DIM_EMBEDDING_MODEL:
+            return self.embed_one(message.text)
+        return self.embed_many([message.text], [message.embedding_key])[0]
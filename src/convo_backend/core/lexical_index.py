@@ -0,0 +1,153 @@
+import re
+import sys
+import threading
+from array import array
+from collections import Counter
+from time import monotonic
+from typing import Hashable, Optional
+import numpy as np
+
+# Words plus tickers ($CONVO), handles (@convo) and hashtags (#solana)
+TOKEN_PATTERN = re.compile(r"[$@#]?\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Lowercase word tokens. Prefixed tokens are kept whole and also emitted bare, so
+    "$CONVO" matches both "$convo" exactly and "convo" loosely.
+    """
+    tokens = []
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        tokens.append(token)
+        if token[0] in "$@#" and len(token) > 1:
+            tokens.append(token[1:])
+    return tokens
+
+
+def reciprocal_rank_fusion(
+    rankings: list[list[Hashable]], k: int = 60
+) -> list[tuple[Hashable, float]]:
+    """
+    Fuse several ranked id lists with reciprocal rank fusion.
+
+    Args:
+        rankings (list[list[Hashable]]): Ids ordered best first, one list per retriever
+        k (int): Damping constant, larger values flatten the contribution of top ranks
+
+    Returns:
+        list[tuple[Hashable, float]]: (id, fused score) pairs, best first
+    """
+    scores: dict[Hashable, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank + 1)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+class LexicalIndex:
+    """
+    Compact in-memory BM25 inverted index.
+
+    Postings are stored per term as two typed arrays (document positions and term
+    frequencies) that grow in place as documents are added, and are scored with numpy
+    views at query time. Searches take an optional deadline and score the rarest query
+    terms first, so a search cut short still returns the most discriminative matches.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.ids: list[Hashable] = []
+        self.doc_lengths = array("I")
+        self.total_length = 0
+        # term -> (document positions, term frequencies)
+        self.postings: dict[str, tuple[array, array]] = {}
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, doc_id: Hashable, text: str):
+        """Index a document."""
+        terms = Counter(tokenize(text))
+        with self.lock:
+            position = len(self.ids)
+            self.ids.append(doc_id)
+            length = sum(terms.values())
+            self.doc_lengths.append(length)
+            self.total_length += length
+            for term, frequency in terms.items():
+                posting = self.postings.get(term)
+                if posting is None:
+                    posting = (array("I"), array("H"))
+                    self.postings[term] = posting
+                posting[0].append(position)
+                posting[1].append(min(frequency, 0xFFFF))
+
+    def add_many(self, doc_ids: list[Hashable], texts: list[str]):
+        for doc_id, text in zip(doc_ids, texts):
+            self.add(doc_id, text)
+
+    def search(
+        self, query: str, k: int = 5, deadline: Optional[float] = None
+    ) -> list[tuple[Hashable, float]]:
+        """
+        Rank documents against the query with BM25.
+
+        Args:
+            query (str): Query text
+            k (int): Number of results
+            deadline (float, optional): time.monotonic() value after which no more terms are scored
+
+        Returns:
+            list[tuple[Hashable, float]]: (id, BM25 score) pairs, best first
+        """
+        query_terms = set(tokenize(query))
+        with self.lock:
+            doc_count = len(self.ids)
+            if not doc_count or not query_terms or k <= 0:
+                return []
+            average_length = self.total_length / doc_count
+            doc_lengths = np.frombuffer(self.doc_lengths, dtype=np.uint32)
+            # Rarest terms first
+            terms = sorted(
+                (term for term in query_terms if term in self.postings),
+                key=lambda term: len(self.postings[term][0]),
+            )
+            scores = np.zeros(doc_count, dtype=np.float32)
+            for term in terms:
+                if deadline is not None and monotonic() > deadline:
+                    break
+                positions = np.frombuffer(self.postings[term][0], dtype=np.uint32)
+                frequencies = np.frombuffer(self.postings[term][1], dtype=np.uint16).astype(
+                    np.float32
+                )
+                document_frequency = len(positions)
+                idf = np.log(
+                    1 + (doc_count - document_frequency + 0.5) / (document_frequency + 0.5)
+                )
+                norm = self.k1 * (
+                    1 - self.b + self.b * doc_lengths[positions] / average_length
+                )
+                scores[positions] += idf * frequencies * (self.k1 + 1) / (frequencies + norm)
+            # Drop numpy views before releasing the lock so the arrays can grow again
+            del doc_lengths
+            positions = frequencies = None
+
+            matched = np.flatnonzero(scores)
+            if not len(matched):
+                return []
+            k = min(k, len(matched))
+            top = matched[np.argpartition(-scores[matched], k - 1)[:k]]
+            top = top[np.argsort(-scores[top])]
+            return [(self.ids[i], float(scores[i])) for i in top]
+
+    def memory_footprint(self) -> int:
+        """Approximate bytes used by the index structures (excluding the ids themselves)."""
+        with self.lock:
+            total = sys.getsizeof(self.ids) + sys.getsizeof(self.doc_lengths)
+            total += sys.getsizeof(self.postings)
+            for term, (positions, frequencies) in self.postings.items():
+                total += sys.getsizeof(term)
+                total += sys.getsizeof(positions) + sys.getsizeof(frequencies)
+            return total
@@ -1,15 +1,51 @@
-from langchain_core.vectorstores import InMemoryVectorStore
 import convo_backend.models.memory as memory
+from convo_backend.models.memory import load_embedding
 from mongoengine import QuerySet
 from datetime import datetime
 from langchain_openai import OpenAIEmbeddings
 import os
 from httpx import AsyncClient
-from sentence_transformers import SentenceTransformer
 import mongoengine as me
 from convo_backend.config import Config
+from convo_backend.core.vector_index import VectorIndex
+from convo_backend.core.lexical_index import LexicalIndex, reciprocal_rank_fusion
+from convo_backend.core.short_term_memory import ShortTermMemory
+from convo_backend.core.embedding_cache import CachedEmbedder, EmbeddingCache
+from convo_backend.utils.metrics import REGISTRY
 from datetime import datetime, timedelta
 import json
+import logging
+import threading
+import numpy as np
+from time import monotonic
+
+logger = logging.getLogger("convo.memory")
+
+MEMORY_SEARCH_LATENCY = REGISTRY.histogram(
+    "convo_memory_search_seconds",
+    "Long-term memory search latency by retriever",
+    ("retriever",),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25),
+)
+MEMORY_INDEX_BYTES = REGISTRY.gauge(
+    "convo_memory_index_bytes",
+    "Approximate memory used by the long-term memory indexes",
+    ("index",),
+)
+
+
+def load_low_dim_embedding_model():
+    """
+    Load the configured all-MiniLM-L6-v2 encoder. Both expose encode(), and the ONNX one
+    avoids importing PyTorch.
+    """
+    if Config.LOW_DIM_ENCODER == "onnx":
+        from convo_backend.core.onnx_encoder import OnnxSentenceEncoder
+
+        return OnnxSentenceEncoder(Config.LOW_DIM_ONNX_MODEL_PATH)
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2")
 
 
 class Memory:
@@ -40,15 +76,37 @@ class Memory:
             api_key=os.getenv("OPENAI_API_KEY"),
             model="text-embedding-ada-002",
         )
-        self.low_dim_embedding_model = SentenceTransformer(
-            "sentence-transformers/all-MiniLM-L6-v2"
+        self.low_dim_embedding_model = load_low_dim_embedding_model()
+        # Repeated utterances ("gm", "wagmi") are embedded once per model
+        self.embedding_cache = EmbeddingCache(
+            Config.EMBEDDING_CACHE_SIZE, Config.EMBEDDING_CACHE_PATH
+        )
+        self.high_dim_embedder = CachedEmbedder(
+            "text-embedding-ada-002",
+            self.high_dim_embedding_model.embed_documents,
+            self.embedding_cache,
+            remote=True,
+        )
+        self.low_dim_embedder = CachedEmbedder(
+            Config.LOW_DIM_EMBEDDING_MODEL,
+            self.low_dim_embedding_model.encode,
+            self.embedding_cache,
         )
-        self.short_term_memory = InMemoryVectorStore(
-            embedding=self.low_dim_embedding_model.encode
+        self.short_term_memory = ShortTermMemory(
+            Config.LOW_DIM_EMBEDDING_SIZE,
+            capacity=Config.SHORT_TERM_MEMORY_CAPACITY,
+            max_age=Config.SHORT_TERM_MEMORY_MAX_AGE,
+            half_life=Config.SHORT_TERM_MEMORY_HALF_LIFE,
         )
+        MEMORY_INDEX_BYTES.labels("short_term").set(self.short_term_memory.nbytes)
         self.long_term_memory = memory
+        # Vector index over low dimensional embeddings, loaded on first retrieval
+        self.long_term_index: VectorIndex = None
+        self.long_term_lexical_index: LexicalIndex = None
+        self.long_term_texts: dict = {}
+        self.long_term_index_lock = threading.Lock()
 
-    def get_short_term_memory(self) -> InMemoryVectorStore:
+    def get_short_term_memory(self) -> ShortTermMemory:
         """
         Returns the short-term memory instance.
         """
@@ -60,38 +118,197 @@ class Memory:
         """
         return self.long_term_memory.Memory.objects()
 
-    def save_to_short_term_memory(self, data: str):
+    def save_to_short_term_memory(self, data: str, low_dim=None):
         """
         Saves data to the short-term memory.
         """
-        self.short_term_memory.add_texts([data])
+        if low_dim is None:
+            low_dim = self.low_dim_embedder.embed_one(data)
+        self.short_term_memory.add([data], [low_dim])
 
     def save_to_long_term_memory(self, data: str, created_at: datetime.now = None):
         """
         Saves data to the long-term memory with embeddings.
         """
-        high_dim = self.high_dim_embedding_model.embed_query(data)
-        low_dim = self.low_dim_embedding_model.encode(data).tolist()
+        high_dim = self.high_dim_embedder.embed_one(data)
+        low_dim = self.low_dim_embedder.embed_one(data)
+        new_memory = self._new_long_term_memory(data, created_at, high_dim, low_dim)
+        new_memory.save()
+        self._index_long_term_memories([new_memory.id], [data], [low_dim])
+        self.save_to_short_term_memory(data, low_dim)
+
+    def save_many_to_long_term_memory(
+        self, data: list[str], created_at: list[datetime] = None
+    ):
+        """
+        Saves a batch of data to the long-term memory, embedding it with one call per model
+        and writing it with a single bulk insert.
+        """
+        if not data:
+            return
+        created_at = created_at or [datetime.now()] * len(data)
+        high_dims = self.high_dim_embedder.embed_many(data)
+        low_dims = self.low_dim_embedder.embed_many(data)
+        new_memories = [
+            self._new_long_term_memory(text, created, high_dim, low_dim)
+            for text, created, high_dim, low_dim in zip(
+                data, created_at, high_dims, low_dims
+            )
+        ]
+        self.long_term_memory.Memory.objects.insert(new_memories, load_bulk=False)
+        self._index_long_term_memories(
+            [new_memory.id for new_memory in new_memories], data, low_dims
+        )
+        # Reuse the low dimensional embeddings for the session's short-term memory
+        self.short_term_memory.add(
+            data, low_dims, [created.timestamp() for created in created_at]
+        )
+        self.short_term_memory.evict_expired()
+
+    def _new_long_term_memory(
+        self, data: str, created_at: datetime, high_dim, low_dim
+    ) -> memory.Memory:
+        """
+        Builds a long-term memory document, storing embeddings in the configured format.
+        """
         new_memory = self.long_term_memory.Memory(
             text=data,
             created_at=created_at if created_at else datetime.now(),
-            high_dim_embedding=high_dim,
-            low_dim_embedding=low_dim,
         )
-        new_memory.save()
+        new_memory.set_embeddings(high_dim, low_dim, storage=Config.EMBEDDING_STORAGE)
+        return new_memory
 
-    def retrieve_from_short_term_memory(self, query):
+    def retrieve_from_short_term_memory(
+        self, query, k: int = 4, embedding=None
+    ) -> list[tuple[str, float]]:
         """
         Retrieves data from the short-term memory based on a query.
+
+        Returns:
+            list[tuple[str, float]]: (text, recency weighted score) pairs, best first
+        """
+        if embedding is None:
+            embedding = self.low_dim_embedder.embed_one(query)
+        return self.short_term_memory.search(embedding, k)
+
+    def load_long_term_index(self) -> VectorIndex:
+        """
+        Returns the long-term vector index, streaming every stored low dimensional
+        embedding out of MongoDB into it on first use.
+        """
+        with self.long_term_index_lock:
+            if self.long_term_index is not None:
+                return self.long_term_index
+
+            index = VectorIndex(
+                Config.LOW_DIM_EMBEDDING_SIZE,
+                quantize=Config.MEMORY_INDEX_QUANTIZE,
+                ivf_threshold=Config.MEMORY_INDEX_IVF_THRESHOLD,
+            )
+            texts = {}
+            ids, vectors = [], []
+            cursor = (
+                self.long_term_memory.Memory.objects.only(
+                    "id", "text", "low_dim_embedding", "low_dim_embedding_bin"
+                )
+                .batch_size(Config.MEMORY_INDEX_LOAD_BATCH)
+                .as_pymongo()
+            )
+            for document in cursor:
+                embedding = load_embedding(
+                    document.get("low_dim_embedding_bin"),
+                    document.get("low_dim_embedding"),
+                )
+                if not embedding.size:
+                    continue
+                ids.append(document["_id"])
+                texts[document["_id"]] = document["text"]
+                vectors.append(embedding)
+                if len(ids) >= Config.MEMORY_INDEX_LOAD_BATCH:
+                    index.add(ids, np.asarray(vectors, dtype=np.float32))
+                    ids, vectors = [], []
+            if ids:
+                index.add(ids, np.asarray(vectors, dtype=np.float32))
+
+            lexical_index = LexicalIndex()
+            lexical_index.add_many(list(texts.keys()), list(texts.values()))
+
+            self.long_term_texts = texts
+            self.long_term_index = index
+            self.long_term_lexical_index = lexical_index
+            MEMORY_INDEX_BYTES.labels("vector").set_function(lambda: index.nbytes)
+            MEMORY_INDEX_BYTES.labels("lexical").set_function(lexical_index.memory_footprint)
+            logger.info(f"Loaded {len(index)} long-term memories into the memory indexes")
+            return index
+
+    def _index_long_term_memories(self, ids: list, texts: list[str], low_dims):
+        """Add newly saved memories to the vector index if it has been loaded."""
+        with self.long_term_index_lock:
+            if self.long_term_index is None:
+                return
+            self.long_term_texts.update(zip(ids, texts))
+            self.long_term_index.add(ids, np.asarray(low_dims, dtype=np.float32))
+            self.long_term_lexical_index.add_many(ids, texts)
+
+    def retrieve_from_long_term_memory(self, query: str, k: int = 5) -> list[tuple[str, float]]:
         """
-        embedding = self.low_dim_embedding_model.encode(query)
-        return self.short_term_memory.similarity_search_by_vector(embedding=embedding)
+        Retrieves the k long-term memories most similar to the query.
 
-    def retrieve_from_long_term_memory(self, query):
+        Returns:
+            list[tuple[str, float]]: (text, cosine similarity) pairs, most similar first
         """
-        Placeholder for future implementation of long-term memory retrieval.
+        index = self.load_long_term_index()
+        embedding = self.low_dim_embedder.embed_one(query)
+        return [
+            (self.long_term_texts[memory_id], score)
+            for memory_id, score in index.search(embedding, k)
+        ]
+
+    def search_long_term_memory(
+        self,
+        query: str,
+        k: int = 5,
+        time_budget: float = Config.MEMORY_SEARCH_TIME_BUDGET,
+        embedding=None,
+    ) -> list[tuple[str, float]]:
+        """
+        Hybrid long-term memory search: vector similarity and BM25 rankings fused with
+        reciprocal rank fusion. Lexical matching keeps exact tickers and handles
+        ($CONVO, @someone) that embeddings blur together.
+
+        Args:
+            query (str): Query text
+            k (int): Number of results
+            time_budget (float): Seconds the lexical search may use before returning what it has
+            embedding (array-like, optional): Precomputed low dimensional query embedding
+
+        Returns:
+            list[tuple[str, float]]: (text, fused score) pairs, best first
         """
-        pass
+        start_time = monotonic()
+        deadline = start_time + time_budget
+        vector_index = self.load_long_term_index()
+        candidates = k * 4
+
+        if embedding is None:
+            embedding = self.low_dim_embedder.embed_one(query)
+        vector_hits = vector_index.search(embedding, candidates)
+        vector_done = monotonic()
+        MEMORY_SEARCH_LATENCY.labels("vector").observe(vector_done - start_time)
+
+        lexical_hits = self.long_term_lexical_index.search(
+            query, candidates, deadline=deadline
+        )
+        MEMORY_SEARCH_LATENCY.labels("lexical").observe(monotonic() - vector_done)
+
+        fused = reciprocal_rank_fusion(
+            [
+                [memory_id for memory_id, _ in vector_hits],
+                [memory_id for memory_id, _ in lexical_hits],
+            ]
+        )[:k]
+        MEMORY_SEARCH_LATENCY.labels("hybrid").observe(monotonic() - start_time)
+        return [(self.long_term_texts[memory_id], score) for memory_id, score in fused]
 
     def save_chat_session(self, chat_group_id: str):
         """
@@ -0,0 +1,181 @@
+import logging
+import queue
+import threading
+from datetime import datetime
+from time import monotonic
+from typing import Optional
+from convo_backend.config import Config
+from convo_backend.utils.metrics import REGISTRY
+
+logger = logging.getLogger("convo.memory")
+
+MEMORY_QUEUE_DEPTH = REGISTRY.gauge(
+    "convo_memory_write_queue_depth",
+    "Memories waiting to be embedded and written to long-term memory",
+)
+MEMORY_BATCH_SIZE = REGISTRY.histogram(
+    "convo_memory_write_batch_size",
+    "Memories embedded and inserted per batch",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+)
+MEMORY_BATCH_LATENCY = REGISTRY.histogram(
+    "convo_memory_write_batch_seconds",
+    "Time to embed and insert one batch of memories",
+)
+MEMORY_WRITES = REGISTRY.counter(
+    "convo_memory_writes",
+    "Memories handled by the long-term memory writer, by outcome",
+    ("outcome",),
+)
+
+_STOP = object()
+
+
+class MemoryWriter:
+    """
+    Background ingestion queue for long-term memory.
+
+    Texts submitted from the pipeline are drained by a single worker thread, which
+    groups them into batches, embeds each batch with one call per embedding model and
+    writes it with a single insert_many.
+    """
+
+    def __init__(
+        self,
+        memory,
+        max_queue_size: int = Config.MEMORY_WRITE_QUEUE_SIZE,
+        max_batch_size: int = Config.MEMORY_WRITE_BATCH_SIZE,
+        max_batch_wait: float = Config.MEMORY_WRITE_BATCH_WAIT,
+    ):
+        """
+        Args:
+            memory (Memory): Memory instance used to embed and store batches
+            max_queue_size (int): Memories buffered before new ones are dropped
+            max_batch_size (int): Largest batch embedded and inserted at once
+            max_batch_wait (float): Seconds to wait for a batch to fill after its first item
+        """
+        self.memory = memory
+        self.max_batch_size = max_batch_size
+        self.max_batch_wait = max_batch_wait
+        self.queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self.worker: Optional[threading.Thread] = None
+        # Memories accepted by submit() and not yet saved or failed
+        self.unsaved = 0
+        self.unsaved_lock = threading.Lock()
+        MEMORY_QUEUE_DEPTH.set_function(self.queue.qsize)
+
+    def start(self):
+        """Start the worker thread if it isn't already running."""
+        if self.worker and self.worker.is_alive():
+            return
+        self.worker = threading.Thread(
+            target=self._run, name="convo-memory-writer", daemon=True
+        )
+        self.worker.start()
+
+    def submit(self, text: str, created_at: Optional[datetime] = None) -> bool:
+        """
+        Queue a memory for saving without blocking.
+
+        Returns:
+            bool: False if the memory was empty or dropped because the queue is full
+        """
+        if not text or not text.strip():
+            return False
+        try:
+            self.queue.put_nowait((text, created_at or datetime.now()))
+            with self.unsaved_lock:
+                self.unsaved += 1
+            return True
+        except queue.Full:
+            MEMORY_WRITES.labels("dropped").inc()
+            logger.warning("Memory write queue full, dropping memory")
+            return False
+
+    def close(self, timeout: Optional[float] = Config.MEMORY_WRITE_CLOSE_TIMEOUT) -> int:
+        """
+        Flush everything queued so far and stop the worker. Blocks until done or `timeout`.
+
+        Args:
+            timeout (float, optional): Max seconds to wait for the flush, None to wait until done
+
+        Returns:
+            int: Memories dropped because they weren't saved in time
+        """
+        if not self.worker:
+            return 0
+        deadline = None if timeout is None else monotonic() + timeout
+        try:
+            # Wait for room so the stop signal is never lost behind a full queue
+            self.queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            pass
+        self.worker.join(None if deadline is None else max(0.0, deadline - monotonic()))
+        dropped = 0
+        if self.worker.is_alive():
+            with self.unsaved_lock:
+                dropped = self.unsaved
+            MEMORY_WRITES.labels("dropped").inc(dropped)
+            logger.warning(
+                f"Memory writer did not finish flushing within {timeout}s, "
+                f"dropping {dropped} unsaved memories"
+            )
+        self.worker = None
+        return dropped
+
+    def _next_batch(self) -> tuple[list, bool]:
+        """Wait for a first item, then gather more until the batch is full or the wait expires."""
+        batch = []
+        item = self.queue.get()
+        if item is _STOP:
+            return batch, True
+        batch.append(item)
+        deadline = monotonic() + self.max_batch_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - monotonic()
+            try:
+                item = (
+                    self.queue.get(timeout=remaining)
+                    if remaining > 0
+                    else self.queue.get_nowait()
+                )
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch, stopping = self._next_batch()
+            if stopping:
+                # Drain whatever is left so shutdown flushes everything
+                while True:
+                    try:
+                        item = self.queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is not _STOP:
+                        batch.append(item)
+            for start in range(0, len(batch), self.max_batch_size):
+                self._write_batch(batch[start : start + self.max_batch_size])
+
+    def _write_batch(self, batch: list[tuple[str, datetime]]):
+        texts = [text for text, _ in batch]
+        created_ats = [created_at for _, created_at in batch]
+        start_time = monotonic()
+        try:
+            self.memory.save_many_to_long_term_memory(texts, created_ats)
+        except Exception as e:
+            MEMORY_WRITES.labels("failed").inc(len(batch))
+            logger.error(f"Failed to save {len(batch)} memories: {e}", exc_info=True)
+            return
+        finally:
+            with self.unsaved_lock:
+                self.unsaved -= len(batch)
+        MEMORY_BATCH_SIZE.observe(len(batch))
+        MEMORY_BATCH_LATENCY.observe(monotonic() - start_time)
+        MEMORY_WRITES.labels("saved").inc(len(batch))
+        logger.debug("Saved %d memories to long-term memory", len(batch))
@@ -0,0 +1,217 @@
+"""
+Sentence embeddings from an ONNX export of all-MiniLM-L6-v2, without loading PyTorch.
+
+Export (and optionally int8-quantize) the model once with:
+    python -m convo_backend.core.onnx_encoder --output src/convo_backend/assets/models/all-MiniLM-L6-v2.onnx [--quantize]
+
+The export needs torch and sentence-transformers, and checks the ONNX vectors against
+SentenceTransformer before writing the model. At runtime only onnxruntime and tokenizers
+are used.
+"""
+
+import argparse
+import logging
+import os
+import threading
+from typing import Optional
+import numpy as np
+import onnxruntime as ort
+from tokenizers import Tokenizer
+
+logger = logging.getLogger("convo.memory")
+
+DEFAULT_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+class OnnxSentenceEncoder:
+    """
+    Mean-pooled, L2-normalized sentence embeddings from an ONNX transformer.
+
+    Drop-in for the SentenceTransformer.encode calls Memory makes. Sentences are sorted by
+    token length and split into batches capped by a padded token budget, so short
+    utterances are never padded out to the length of a long one and each batch is only
+    as wide as its longest sentence.
+    """
+
+    def __init__(
+        self,
+        model_path: str,
+        tokenizer_name: str = DEFAULT_MODEL_NAME,
+        max_length: int = 256,
+        max_batch_tokens: int = 8192,
+        intra_op_threads: Optional[int] = None,
+    ):
+        """
+        Args:
+            model_path (str): Exported ONNX model
+            tokenizer_name (str): Hugging Face tokenizer matching the model
+            max_length (int): Tokens per sentence at most (the model's training length)
+            max_batch_tokens (int): Padded tokens (batch size x sequence length) per session run at most
+            intra_op_threads (int, optional): onnxruntime intra-op threads, defaults to onnxruntime's choice
+        """
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads:
+            options.intra_op_num_threads = intra_op_threads
+        self.session = ort.InferenceSession(
+            model_path, sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {node.name for node in self.session.get_inputs()}
+
+        self.tokenizer = Tokenizer.from_pretrained(tokenizer_name)
+        self.tokenizer.enable_truncation(max_length=max_length)
+        self.tokenizer.no_padding()
+        self.pad_id = self.tokenizer.token_to_id("[PAD]") or 0
+        self.max_batch_tokens = max_batch_tokens
+        # run() is thread-safe, but concurrent runs would each use every intra-op thread
+        self.lock = threading.Lock()
+
+        # First run allocates and optimizes kernels, so do it before the first real query
+        self.encode("warm up")
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return int(self.session.get_outputs()[0].shape[-1])
+
+    def encode(self, sentences: str | list[str], **kwargs) -> np.ndarray:
+        """
+        Embed sentences.
+
+        Args:
+            sentences (str | list[str]): One sentence or a list of sentences
+
+        Returns:
+            np.ndarray: float32 embedding of shape (dim,) for one sentence, otherwise (len(sentences), dim)
+        """
+        single = isinstance(sentences, str)
+        if single:
+            sentences = [sentences]
+        if not sentences:
+            return np.empty((0, self.get_sentence_embedding_dimension()), dtype=np.float32)
+
+        encodings = self.tokenizer.encode_batch(list(sentences))
+        order = sorted(range(len(encodings)), key=lambda i: len(encodings[i].ids))
+        embeddings: list[Optional[np.ndarray]] = [None] * len(encodings)
+
+        start = 0
+        while start < len(order):
+            # Longest sentence in a sorted batch is its last one
+            end = start + 1
+            while end < len(order) and (end - start + 1) * len(
+                encodings[order[end]].ids
+            ) <= self.max_batch_tokens:
+                end += 1
+            batch = order[start:end]
+            for i, embedding in zip(batch, self._run([encodings[i] for i in batch])):
+                embeddings[i] = embedding
+            start = end
+
+        result = np.stack(embeddings)
+        return result[0] if single else result
+
+    def _run(self, encodings) -> np.ndarray:
+        length = max(len(encoding.ids) for encoding in encodings)
+        input_ids = np.full((len(encodings), length), self.pad_id, dtype=np.int64)
+        attention_mask = np.zeros((len(encodings), length), dtype=np.int64)
+        for row, encoding in enumerate(encodings):
+            input_ids[row, : len(encoding.ids)] = encoding.ids
+            attention_mask[row, : len(encoding.ids)] = 1
+
+        inputs = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self.input_names:
+            inputs["token_type_ids"] = np.zeros_like(input_ids)
+        with self.lock:
+            token_embeddings = self.session.run(None, inputs)[0]
+
+        # Mean pooling over real tokens, then L2 normalization (as all-MiniLM-L6-v2 does)
+        mask = attention_mask[:, :, np.newaxis].astype(np.float32)
+        pooled = (token_embeddings * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        return (pooled / np.maximum(norms, 1e-12)).astype(np.float32)
+
+
+def export_onnx_encoder(
+    output_path: str,
+    model_name: str = DEFAULT_MODEL_NAME,
+    quantize: bool = False,
+    tolerance: float = 1e-3,
+) -> float:
+    """
+    Export a sentence-transformers model's transformer to ONNX and check it against the original.
+
+    Args:
+        output_path (str): Where to write the ONNX model
+        model_name (str): sentence-transformers model to export
+        quantize (bool): Apply dynamic int8 quantization to the exported weights
+        tolerance (float): Largest allowed 1 - cosine similarity against SentenceTransformer
+
+    Returns:
+        float: Largest 1 - cosine similarity between ONNX and SentenceTransformer embeddings
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    sentence_model = SentenceTransformer(model_name, device="cpu")
+    transformer = sentence_model[0].auto_model.eval()
+    directory = os.path.dirname(output_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    dummy = sentence_model.tokenizer(["export"], return_tensors="pt")
+    fp32_path = output_path + ".fp32.onnx" if quantize else output_path
+    with torch.no_grad():
+        torch.onnx.export(
+            transformer,
+            (dummy["input_ids"], dummy["attention_mask"]),
+            fp32_path,
+            input_names=["input_ids", "attention_mask"],
+            output_names=["last_hidden_state"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "sequence"},
+                "attention_mask": {0: "batch", 1: "sequence"},
+                "last_hidden_state": {0: "batch", 1: "sequence"},
+            },
+            opset_version=17,
+        )
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        quantize_dynamic(fp32_path, output_path, weight_type=QuantType.QInt8)
+        os.remove(fp32_path)
+
+    sentences = [
+        "gm",
+        "wagmi",
+        "What do you think about $CONVO?",
+        "The space is talking about validator rewards and how staking yields changed this month.",
+    ]
+    expected = sentence_model.encode(sentences, normalize_embeddings=True)
+    actual = OnnxSentenceEncoder(output_path, tokenizer_name=model_name).encode(sentences)
+    deviation = float(np.max(1 - np.sum(expected * actual, axis=1)))
+    logger.info(f"Exported {model_name} to {output_path} (max cosine deviation {deviation:.2e})")
+    if deviation > tolerance:
+        raise ValueError(
+            f"ONNX embeddings deviate from SentenceTransformer by {deviation:.2e} (tolerance {tolerance:.0e})"
+        )
+    return deviation
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export all-MiniLM-L6-v2 to ONNX")
+    parser.add_argument("--output", required=True)
+    parser.add_argument("--model", default=DEFAULT_MODEL_NAME)
+    parser.add_argument("--quantize", action="store_true", help="Dynamic int8 quantization")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=None,
+        help="Largest allowed 1 - cosine similarity (default 1e-3, 2e-2 when quantized)",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    tolerance = args.tolerance or (2e-2 if args.quantize else 1e-3)
+    export_onnx_encoder(args.output, args.model, args.quantize, tolerance)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from time import monotonic
+from typing import Optional
+from convo_backend.config import Config
+from convo_backend.core.lexical_index import reciprocal_rank_fusion
+from convo_backend.models.message import Message, count_tokens
+from convo_backend.utils.metrics import REGISTRY
+
+logger = logging.getLogger("convo.memory")
+
+RETRIEVAL_TURNS = REGISTRY.counter(
+    "convo_memory_retrieval_turns",
+    "Turns by memory retrieval outcome (hit, empty, late, error)",
+    ("outcome",),
+)
+RETRIEVAL_LATENCY = REGISTRY.histogram(
+    "convo_memory_retrieval_seconds",
+    "Time from the end of transcription until memory results were available",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+RETRIEVAL_PROMPT_TOKENS = REGISTRY.histogram(
+    "convo_memory_prompt_tokens",
+    "Prompt tokens added by retrieved memories per turn",
+    buckets=(0, 25, 50, 100, 200, 400, 800),
+)
+
+
+def format_memory_context(memories: list[str]) -> str:
+    """Format retrieved memories for the system prompt."""
+    return "\n".join(f"- {memory}" for memory in memories)
+
+
+@dataclass
+class RetrievedMemories:
+    memories: list[str]
+    context: Optional[str]  # Formatted for the prompt, None without memories
+    tokens: int  # Prompt tokens the context adds
+
+
+class MemoryRetriever:
+    """
+    Looks up short-term and long-term memories for the chat prompt.
+
+    The two rankings are merged with reciprocal rank fusion, as their scores aren't
+    comparable, after dropping short-term hits below `min_short_term_score`. Up to
+    `long_term_slots` of the results are kept for long-term hits.
+
+    Lookups run on a small dedicated thread pool so they never queue behind other work in
+    the default executor.
+    """
+
+    def __init__(
+        self,
+        memory,
+        deadline: float = Config.MEMORY_RETRIEVAL_DEADLINE,
+        top_k: int = Config.MEMORY_RETRIEVAL_TOP_K,
+        long_term_slots: int = Config.MEMORY_RETRIEVAL_LONG_TERM_SLOTS,
+        min_short_term_score: float = Config.MEMORY_RETRIEVAL_SHORT_TERM_MIN_SCORE,
+    ):
+        """
+        Args:
+            memory (Memory): Memory instance to search
+            deadline (float): Seconds after transcription ends that results are still used.
+                0 only uses results that are already available.
+            top_k (int): Memories added to the prompt at most
+            long_term_slots (int): Results kept for long-term memories when there are any
+            min_short_term_score (float): Recency weighted similarity short-term hits need
+        """
+        self.memory = memory
+        self.deadline = deadline
+        self.top_k = top_k
+        self.long_term_slots = long_term_slots
+        self.min_short_term_score = min_short_term_score
+        self.executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="convo-retrieval")
+
+    def warm(self):
+        """Load the long-term indexes in the background so the first turn isn't a miss."""
+        # Resolve the method on the pool thread, the memory itself may still be loading
+        self.executor.submit(lambda: self.memory.load_long_term_index())
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def lookup(self, query: str | Message) -> list[str]:
+        """
+        Search short-term and long-term memory, sharing one query embedding, and merge the
+        results. Runs on the retrieval thread pool. A Message query is embedded with
+        embed_message(), which keeps its embedding cache key on the message.
+        """
+        if isinstance(query, Message):
+            embedding = self.memory.low_dim_embedder.embed_message(query)
+            query = query.text
+        else:
+            embedding = self.memory.low_dim_embedder.embed_one(query)
+        short_term = [
+            text
+            for text, score in self.memory.retrieve_from_short_term_memory(
+                query, k=self.top_k, embedding=embedding
+            )
+            if score >= self.min_short_term_score
+        ]
+        long_term = [
+            text
+            for text, _ in self.memory.search_long_term_memory(
+                query, k=self.top_k, embedding=embedding
+            )
+        ]
+        # Memories found by both rank higher, and appear once
+        ranked = [text for text, _ in reciprocal_rank_fusion([short_term, long_term])]
+        return _top_with_reserved(ranked, set(long_term), self.top_k, self.long_term_slots)
+
+    def retrieve(self, query: str | Message) -> RetrievedMemories:
+        """
+        Look up memories and format them for the prompt. Runs on the retrieval thread pool,
+        so tokenizing the context never holds up the event loop.
+        """
+        memories = self.lookup(query)
+        context = format_memory_context(memories) if memories else None
+        return RetrievedMemories(memories, context, count_tokens(context) if context else 0)
+
+    def start_turn(self) -> "RetrievalTurn":
+        return RetrievalTurn(self)
+
+
+def _top_with_reserved(ranked: list[str], reserved: set[str], k: int, slots: int) -> list[str]:
+    """The best `k` of `ranked`, including at least `slots` from `reserved` where there are that many."""
+    needed = min(slots, len(reserved), k)
+    top = []
+    for text in ranked:
+        if len(top) == k:
+            break
+        if text in reserved:
+            top.append(text)
+            needed = max(0, needed - 1)
+        elif len(top) + needed < k:
+            top.append(text)
+    return top
+
+
+class RetrievalTurn:
+    """
+    Memory retrieval for a single conversation turn.
+
+    Transcript segments are prefetched as soon as they are final, in parallel with the rest
+    of transcription. When the final transcript is known, results are used only if they
+    arrive within the retriever's deadline; otherwise the latest finished prefetch (or
+    nothing) is used, so the response is never held up for longer than the deadline.
+    """
+
+    def __init__(self, retriever: MemoryRetriever):
+        self.retriever = retriever
+        self.loop = asyncio.get_running_loop()
+        self.prefetched_query: Optional[str] = None
+        self.prefetch_future: Optional[asyncio.Future] = None
+
+    def prefetch(self, partial_text: str):
+        """Start a lookup for the transcript so far. Safe to call on every final segment."""
+        partial_text = partial_text.strip()
+        if not partial_text or partial_text == self.prefetched_query:
+            return
+        self.prefetched_query = partial_text
+        self.prefetch_future = self.loop.run_in_executor(
+            self.retriever.executor, self.retriever.retrieve, partial_text
+        )
+
+    async def results(self, final: str | Message) -> Optional[str]:
+        """
+        Return formatted memories for the prompt, or None if nothing arrived in time.
+        """
+        start_time = monotonic()
+        final_text = (final.text if isinstance(final, Message) else final).strip()
+        if not final_text:
+            return None
+
+        if final_text == self.prefetched_query:
+            future = self.prefetch_future
+            fallback = None
+        else:
+            fallback = self.prefetch_future
+            future = self.loop.run_in_executor(
+                self.retriever.executor, self.retriever.retrieve, final
+            )
+
+        outcome = "late"
+        retrieved = None
+        try:
+            done, _ = await asyncio.wait({future}, timeout=self.retriever.deadline)
+            if done:
+                retrieved = future.result()
+            elif (
+                fallback is not None
+                and fallback.done()
+                and not fallback.cancelled()
+                and fallback.exception() is None
+            ):
+                # Results for an earlier part of the utterance beat nothing
+                retrieved = fallback.result()
+        except Exception as e:
+            outcome = "error"
+            logger.warning(f"Memory retrieval failed: {e}", exc_info=True)
+
+        latency = monotonic() - start_time
+        memories = retrieved.memories if retrieved else []
+        tokens = retrieved.tokens if retrieved else 0
+        if outcome != "error":
+            outcome = "hit" if memories else ("empty" if retrieved is not None else "late")
+        RETRIEVAL_TURNS.labels(outcome).inc()
+        RETRIEVAL_LATENCY.observe(latency)
+        RETRIEVAL_PROMPT_TOKENS.observe(tokens)
+        logger.info(
+            f"Memory retrieval {outcome}: {len(memories)} memories, "
+            f"{latency * 1000:.1f} ms, {tokens} prompt tokens added"
+        )
+        return retrieved.context if retrieved else None
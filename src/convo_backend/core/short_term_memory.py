@@ -0,0 +1,150 @@
+import threading
+from time import time
+from typing import Optional
+import numpy as np
+
+
+class ShortTermMemory:
+    """
+    Fixed-capacity ring of recent memories for the current session.
+
+    Normalized float32 embeddings live in a preallocated matrix with parallel text and
+    timestamp arrays, so memory use is constant no matter how long the session runs. Once
+    full, the oldest entry is overwritten (count-based eviction); entries older than
+    `max_age` are ignored by searches and dropped by `evict_expired()` (time-based
+    eviction). A search is one matrix-vector product over the ring, weighted by recency.
+    """
+
+    def __init__(
+        self,
+        dim: int,
+        capacity: int = 512,
+        max_age: Optional[float] = 3600.0,
+        half_life: Optional[float] = 900.0,
+    ):
+        """
+        Args:
+            dim (int): Embedding dimension
+            capacity (int): Entries kept at most
+            max_age (float, optional): Seconds after which an entry expires. None keeps entries until overwritten.
+            half_life (float, optional): Seconds for the recency weight to halve. None disables recency weighting.
+        """
+        self.dim = dim
+        self.capacity = capacity
+        self.max_age = max_age
+        self.half_life = half_life
+
+        self.matrix = np.zeros((capacity, dim), dtype=np.float32)
+        self.timestamps = np.full(capacity, -np.inf, dtype=np.float64)
+        self.texts: list[Optional[str]] = [None] * capacity
+        self.head = 0  # Next slot to write
+        self.size = 0
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the preallocated arrays (excluding texts)"""
+        return self.matrix.nbytes + self.timestamps.nbytes
+
+    def add(self, texts: list[str], vectors, timestamps: Optional[list[float]] = None):
+        """
+        Insert entries, overwriting the oldest ones once the ring is full.
+
+        Args:
+            texts (list[str]): Entry texts
+            vectors (array-like): Embeddings of shape (len(texts), dim)
+            timestamps (list[float], optional): Unix times for each entry, defaults to now
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim == 1:
+            vectors = vectors[np.newaxis, :]
+        if len(texts) != len(vectors):
+            raise ValueError(f"Got {len(texts)} texts for {len(vectors)} vectors")
+        if not len(texts):
+            return
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        vectors = vectors / norms
+        if timestamps is None:
+            timestamps = np.full(len(texts), time())
+
+        # Only the newest `capacity` entries of an oversized batch survive anyway
+        texts = texts[-self.capacity :]
+        vectors = vectors[-self.capacity :]
+        timestamps = np.asarray(timestamps, dtype=np.float64)[-self.capacity :]
+        with self.lock:
+            slots = (self.head + np.arange(len(texts))) % self.capacity
+            self.matrix[slots] = vectors
+            self.timestamps[slots] = timestamps
+            for slot, text in zip(slots.tolist(), texts):
+                self.texts[slot] = text
+            self.head = int(slots[-1] + 1) % self.capacity
+            # Overwritten slots may already have been evicted, so count live ones
+            self.size = int(np.count_nonzero(np.isfinite(self.timestamps)))
+
+    def search(
+        self, query, k: int = 4, now: Optional[float] = None
+    ) -> list[tuple[str, float]]:
+        """
+        Find the k best entries by cosine similarity weighted by recency.
+
+        Args:
+            query (array-like): Query embedding of shape (dim,)
+            k (int): Number of results
+            now (float, optional): Unix time to measure entry age from, defaults to now
+
+        Returns:
+            list[tuple[str, float]]: (text, weighted score) pairs, best first
+        """
+        query = np.asarray(query, dtype=np.float32).ravel()
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+        now = time() if now is None else now
+        with self.lock:
+            if self.size == 0 or k <= 0:
+                return []
+            ages = now - self.timestamps
+            scores = self.matrix @ query
+            if self.half_life:
+                scores *= np.exp2(-np.maximum(ages, 0) / self.half_life).astype(np.float32)
+            valid = np.isfinite(self.timestamps)  # Empty and evicted slots are -inf
+            if self.max_age is not None:
+                valid &= ages <= self.max_age
+            scores[~valid] = -np.inf
+            k = min(k, int(np.count_nonzero(valid)))
+            if k == 0:
+                return []
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [(self.texts[i], float(scores[i])) for i in top.tolist()]
+
+    def evict_expired(self, now: Optional[float] = None) -> int:
+        """
+        Drop entries older than `max_age` so their texts can be freed.
+
+        Returns:
+            int: Number of entries evicted
+        """
+        if self.max_age is None:
+            return 0
+        now = time() if now is None else now
+        with self.lock:
+            expired = np.flatnonzero(
+                (now - self.timestamps > self.max_age) & np.isfinite(self.timestamps)
+            )
+            for slot in expired.tolist():
+                self.texts[slot] = None
+            self.timestamps[expired] = -np.inf
+            self.size -= len(expired)
+            return len(expired)
+
+    def clear(self):
+        with self.lock:
+            self.timestamps.fill(-np.inf)
+            self.texts = [None] * self.capacity
+            self.head = 0
+            self.size = 0
@@ -0,0 +1,218 @@
+import logging
+import threading
+from typing import Hashable, Optional
+import numpy as np
+
+logger = logging.getLogger("convo.memory")
+
+# Rows scored per chunk when int8 rows have to be converted to float32
+_SCORE_CHUNK_ROWS = 65536
+
+
+class VectorIndex:
+    """
+    In-process cosine similarity index over a contiguous matrix of normalized embeddings.
+
+    Vectors are L2-normalized on insert so a top-k query is a single matrix-vector product
+    followed by argpartition. Rows can optionally be stored as int8 with a per-row scale
+    (4x less memory). Once the index passes `ivf_threshold` rows it trains a coarse
+    k-means quantizer and only scores the `nprobe` closest inverted lists per query.
+    """
+
+    def __init__(
+        self,
+        dim: int,
+        quantize: bool = False,
+        ivf_threshold: int = 200_000,
+        nprobe: int = 8,
+        initial_capacity: int = 1024,
+    ):
+        """
+        Args:
+            dim (int): Embedding dimension
+            quantize (bool): Store rows as int8 with a per-row scale instead of float32
+            ivf_threshold (int): Row count at which the IVF quantizer is trained
+            nprobe (int): Inverted lists scored per query once IVF is active
+            initial_capacity (int): Rows preallocated before the first resize
+        """
+        self.dim = dim
+        self.quantize = quantize
+        self.ivf_threshold = ivf_threshold
+        self.nprobe = nprobe
+
+        self.size = 0
+        self.ids: list[Hashable] = []
+        self.matrix = np.empty(
+            (initial_capacity, dim), dtype=np.int8 if quantize else np.float32
+        )
+        self.scales = np.empty(initial_capacity, dtype=np.float32) if quantize else None
+        self.lock = threading.RLock()
+
+        # IVF state
+        self.centroids: Optional[np.ndarray] = None
+        self.list_rows: list[list[int]] = []
+        self._list_arrays: list[Optional[np.ndarray]] = []
+        self._trained_size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the stored rows (excluding ids)"""
+        total = self.matrix[: self.size].nbytes
+        if self.scales is not None:
+            total += self.scales[: self.size].nbytes
+        return total
+
+    @staticmethod
+    def normalize(vectors) -> np.ndarray:
+        """Return vectors as a 2D float32 array of unit-length rows."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim == 1:
+            vectors = vectors[np.newaxis, :]
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def add(self, ids: list[Hashable], vectors) -> None:
+        """
+        Append vectors to the index.
+
+        Args:
+            ids (list): Identifier returned by search() for each vector
+            vectors (array-like): Embeddings of shape (len(ids), dim)
+        """
+        vectors = self.normalize(vectors)
+        if len(ids) != len(vectors):
+            raise ValueError(f"Got {len(ids)} ids for {len(vectors)} vectors")
+        if vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected dimension {self.dim}, got {vectors.shape[1]}")
+        if not len(ids):
+            return
+
+        with self.lock:
+            start = self.size
+            end = start + len(vectors)
+            self._reserve(end)
+            if self.quantize:
+                scales = np.abs(vectors).max(axis=1)
+                scales[scales == 0] = 1.0
+                self.matrix[start:end] = np.round(
+                    vectors / scales[:, np.newaxis] * 127
+                ).astype(np.int8)
+                self.scales[start:end] = scales / 127
+            else:
+                self.matrix[start:end] = vectors
+            self.ids.extend(ids)
+            self.size = end
+
+            if self.centroids is not None:
+                self._assign(np.arange(start, end), vectors)
+            if self.size >= self.ivf_threshold and self.size >= 4 * self._trained_size:
+                self._train()
+
+    def search(self, query, k: int = 5) -> list[tuple[Hashable, float]]:
+        """
+        Find the k most similar vectors to the query.
+
+        Args:
+            query (array-like): Query embedding of shape (dim,)
+            k (int): Number of results
+
+        Returns:
+            list[tuple[Hashable, float]]: (id, cosine similarity) pairs, best first
+        """
+        query = self.normalize(query)[0]
+        with self.lock:
+            if self.size == 0 or k <= 0:
+                return []
+            if self.centroids is None:
+                rows = None
+                scores = self._score(slice(0, self.size), query)
+            else:
+                rows = self._probe(query)
+                if len(rows) == 0:
+                    return []
+                scores = self._score(rows, query)
+
+            k = min(k, len(scores))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            positions = rows[top] if rows is not None else top
+            return [(self.ids[p], float(scores[t])) for p, t in zip(positions, top)]
+
+    def _reserve(self, needed: int):
+        capacity = len(self.matrix)
+        if needed <= capacity:
+            return
+        new_capacity = max(needed, capacity * 2)
+        matrix = np.empty((new_capacity, self.dim), dtype=self.matrix.dtype)
+        matrix[: self.size] = self.matrix[: self.size]
+        self.matrix = matrix
+        if self.scales is not None:
+            scales = np.empty(new_capacity, dtype=np.float32)
+            scales[: self.size] = self.scales[: self.size]
+            self.scales = scales
+
+    def _decode(self, rows) -> np.ndarray:
+        """Return stored rows as float32."""
+        if not self.quantize:
+            return self.matrix[rows]
+        return self.matrix[rows].astype(np.float32) * self.scales[rows][:, np.newaxis]
+
+    def _score(self, rows, query: np.ndarray) -> np.ndarray:
+        if not self.quantize:
+            return self.matrix[rows] @ query
+        if isinstance(rows, slice):
+            rows = np.arange(rows.start, rows.stop)
+        scores = np.empty(len(rows), dtype=np.float32)
+        for start in range(0, len(rows), _SCORE_CHUNK_ROWS):
+            chunk = rows[start : start + _SCORE_CHUNK_ROWS]
+            scores[start : start + len(chunk)] = (
+                self.matrix[chunk].astype(np.float32) @ query
+            ) * self.scales[chunk]
+        return scores
+
+    def _train(self, iterations: int = 10):
+        """Train the coarse quantizer with spherical k-means and rebuild the inverted lists."""
+        nlist = max(1, int(np.sqrt(self.size)))
+        rng = np.random.default_rng(0)
+        sample_size = min(self.size, nlist * 64)
+        sample = self._decode(np.sort(rng.choice(self.size, sample_size, replace=False)))
+        centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, sample)
+            counts = np.bincount(assignment, minlength=nlist)
+            occupied = counts > 0
+            centroids[occupied] = self.normalize(sums[occupied])
+
+        self.centroids = centroids
+        self.list_rows = [[] for _ in range(nlist)]
+        self._list_arrays = [None] * nlist
+        for start in range(0, self.size, _SCORE_CHUNK_ROWS):
+            rows = np.arange(start, min(start + _SCORE_CHUNK_ROWS, self.size))
+            self._assign(rows, self._decode(rows))
+        self._trained_size = self.size
+        logger.info(f"Trained IVF index with {nlist} lists over {self.size} vectors")
+
+    def _assign(self, rows: np.ndarray, vectors: np.ndarray):
+        assignment = np.argmax(vectors @ self.centroids.T, axis=1)
+        for row, list_id in zip(rows.tolist(), assignment.tolist()):
+            self.list_rows[list_id].append(row)
+            self._list_arrays[list_id] = None
+
+    def _probe(self, query: np.ndarray) -> np.ndarray:
+        centroid_scores = self.centroids @ query
+        nprobe = min(self.nprobe, len(centroid_scores))
+        probed = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+        arrays = []
+        for list_id in probed:
+            array = self._list_arrays[list_id]
+            if array is None:
+                array = np.asarray(self.list_rows[list_id], dtype=np.int64)
+                self._list_arrays[list_id] = array
+            arrays.append(array)
+        return np.concatenate(arrays)
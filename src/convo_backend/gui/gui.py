@@ -5,44 +5,75 @@ import asyncio
 from convo_backend.core.core import ConvoCore
 from logging import Handler
 import sys
+from collections import deque
 from convo_backend.config import Config
 
 class LogHandler(Handler):
-    def __init__(self, tree_widget: ttk.Treeview):
-        super().__init__()
+    """
+    Log sink for the GUI that coalesces records and flushes them into the Treeview in batches.
+
+    emit() only appends the raw record to a bounded deque, so it is cheap from any thread.
+    A task on the event loop formats and inserts pending records at a fixed frame rate,
+    keeping the item ids of inserted rows so trimming to MAX_ROWS is O(1) per row.
+    """
+
+    MAX_ROWS = 1000  # Rows kept in the Treeview
+    MAX_PENDING = 5000  # Records buffered between flushes before the oldest are dropped
+    FLUSH_INTERVAL = 1 / 15  # Seconds between flushes
+
+    def __init__(self, tree_widget: ttk.Treeview, level: int = logging.NOTSET):
+        super().__init__(level)
         self.tree = tree_widget
-        self.queue = asyncio.Queue()
-        self.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
-        self.loop = asyncio.get_event_loop()  # Store the event loop when created
-        
+        self.pending: deque[logging.LogRecord] = deque(maxlen=self.MAX_PENDING)
+        self.rows: deque[str] = deque()  # Treeview item ids, oldest first
+        self.dropped = 0
+        self.setFormatter(logging.Formatter('%(message)s'))
+        self.tree.tag_configure('error', foreground='red')
+
         # Start the process_logs task
-        asyncio.create_task(self.process_logs())
-        
+        self.process_task = asyncio.create_task(self.process_logs())
+
     def emit(self, record):
-        msg = self.format(record)
-        # Use the stored event loop reference
-        self.loop.call_soon_threadsafe(
-            self.queue.put_nowait, msg
-        )
-    
+        # Level filtering has already happened in Handler.handle, formatting waits for the flush
+        if len(self.pending) == self.MAX_PENDING:
+            self.dropped += 1
+        self.pending.append(record)
+
+    def _insert_row(self, values: tuple, error: bool = False):
+        item = self.tree.insert('', 'end', values=values, tags=('error',) if error else ())
+        self.rows.append(item)
+
+    def flush_pending(self):
+        """Move all pending records into the Treeview and trim it to MAX_ROWS"""
+        records = []
+        while self.pending:
+            records.append(self.pending.popleft())
+        if not records:
+            return
+
+        # Rows older than the newest MAX_ROWS would be trimmed straight away
+        skipped = max(0, len(records) - self.MAX_ROWS)
+        dropped = self.dropped + skipped
+        self.dropped = 0
+        for record in records[skipped:]:
+            values = (
+                self.formatter.formatTime(record),
+                record.levelname,
+                self.format(record),
+            )
+            self._insert_row(values, error=record.levelno >= logging.ERROR)
+        if dropped:
+            self._insert_row(("", "WARNING", f"{dropped} log records not shown"))
+
+        overflow = len(self.rows) - self.MAX_ROWS
+        if overflow > 0:
+            self.tree.delete(*(self.rows.popleft() for _ in range(overflow)))
+
     async def process_logs(self):
         while True:
+            await asyncio.sleep(self.FLUSH_INTERVAL)
             try:
-                msg = await self.queue.get()
-                parts = msg.split(' - ', 2)
-                if len(parts) == 3:
-                    time, level, message = parts
-                    
-                    if level.lower() == "error":
-                        self.tree.insert('', 'end', values=(time, level, message), tags=('error',))
-                        self.tree.tag_configure('error', foreground='red')
-                    else:
-                        self.tree.insert('', 'end', values=(time, level, message))
-                        
-                    # Keep only the last 1000 entries
-                    if len(self.tree.get_children()) > 1000:
-                        self.tree.delete(self.tree.get_children()[0])
-                    
+                self.flush_pending()
             except Exception as e:
                 print(f"Error processing log: {e}")
 
@@ -1,6 +1,42 @@
 import mongoengine as me
 from datetime import datetime
 from uuid import uuid4
+import struct
+import numpy as np
+
+# Packed embedding layout: magic, format version, dtype code, dimension, then raw little endian values
+EMBEDDING_HEADER = struct.Struct("<2sBBI")
+EMBEDDING_MAGIC = b"CE"
+EMBEDDING_VERSION = 1
+EMBEDDING_DTYPES = {1: np.dtype("<f4"), 2: np.dtype("<f2")}
+EMBEDDING_DTYPE_CODES = {"float32": 1, "float16": 2}
+
+
+def pack_embedding(vector, dtype: str = "float32") -> bytes:
+    """
+    Pack an embedding into a binary blob with a dtype and dimension header.
+
+    Args:
+        vector (array-like): 1D embedding
+        dtype (str): "float32" or "float16"
+    """
+    code = EMBEDDING_DTYPE_CODES[dtype]
+    array = np.asarray(vector, dtype=EMBEDDING_DTYPES[code]).ravel()
+    header = EMBEDDING_HEADER.pack(EMBEDDING_MAGIC, EMBEDDING_VERSION, code, array.size)
+    return header + array.tobytes()
+
+
+def unpack_embedding(blob: bytes) -> np.ndarray:
+    """
+    Decode a packed embedding without copying. The returned array is a read-only view
+    of the blob (float16 blobs stay float16).
+    """
+    magic, version, code, dim = EMBEDDING_HEADER.unpack_from(blob)
+    if magic != EMBEDDING_MAGIC or version != EMBEDDING_VERSION:
+        raise ValueError("Not a packed embedding")
+    return np.frombuffer(
+        blob, dtype=EMBEDDING_DTYPES[code], count=dim, offset=EMBEDDING_HEADER.size
+    )
 
 
 class Memory(me.Document):
@@ -12,4 +48,34 @@ class Memory(me.Document):
     low_dim_embedding = me.ListField(
         me.FloatField()
     )  # Better for tasks requiring low latency
+    # Packed alternatives to the list fields (see pack_embedding)
+    high_dim_embedding_bin = me.BinaryField()
+    low_dim_embedding_bin = me.BinaryField()
     created_at = me.DateTimeField(required=True)
+
+    def set_embeddings(self, high_dim, low_dim, storage: str = "list"):
+        """
+        Store embeddings either as float lists or as packed blobs.
+
+        Args:
+            storage (str): "list", "float32" or "float16"
+        """
+        if storage == "list":
+            self.high_dim_embedding = [float(x) for x in high_dim]
+            self.low_dim_embedding = [float(x) for x in low_dim]
+        else:
+            self.high_dim_embedding_bin = pack_embedding(high_dim, storage)
+            self.low_dim_embedding_bin = pack_embedding(low_dim, storage)
+
+    def get_high_dim_embedding(self) -> np.ndarray:
+        return load_embedding(self.high_dim_embedding_bin, self.high_dim_embedding)
+
+    def get_low_dim_embedding(self) -> np.ndarray:
+        return load_embedding(self.low_dim_embedding_bin, self.low_dim_embedding)
+
+
+def load_embedding(blob, values) -> np.ndarray:
+    """Return an embedding from whichever of the packed or list representations is set."""
+    if blob:
+        return unpack_embedding(blob)
+    return np.asarray(values or [], dtype=np.float32)
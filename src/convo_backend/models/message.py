@@ -0,0 +1,104 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
+from typing import Literal, Optional
+import msgpack
+import orjson
+from convo_backend.config import Config
+
+Sender = Literal["user", "bot"]
+
+# Record layout version, first element of the packed array
+MESSAGE_FORMAT_VERSION = 1
+
+
+@lru_cache(maxsize=1)
+def _token_encoding():
+    import tiktoken
+
+    return tiktoken.get_encoding("o200k_base")  # gpt-4o family
+
+
+def count_tokens(text: str) -> int:
+    return len(_token_encoding().encode(text))
+
+
+@dataclass(frozen=True, slots=True)
+class Message:
+    """
+    One chat message, as transcribed from a user or generated by the bot.
+
+    Immutable and slotted so histories are cheap to hold and safe to share between tasks.
+    The token count and embedding cache key are kept on the record once known, either
+    passed in by whoever already has them or computed on first use.
+    """
+
+    text: str
+    sender: Sender
+    timestamp: Optional[datetime] = None
+    _token_count: Optional[int] = field(default=None, compare=False, repr=False)
+    _embedding_key: Optional[bytes] = field(default=None, compare=False, repr=False)
+
+    @property
+    def token_count(self) -> int:
+        """Tokens the message adds to a prompt."""
+        if self._token_count is None:
+            object.__setattr__(self, "_token_count", count_tokens(self.text))
+        return self._token_count
+
+    @property
+    def embedding_key(self) -> bytes:
+        """Key of the message's low dimensional embedding in the EmbeddingCache."""
+        if self._embedding_key is None:
+            from convo_backend.core.embedding_cache import cache_key
+
+            object.__setattr__(
+                self, "_embedding_key", cache_key(Config.LOW_DIM_EMBEDDING_MODEL, self.text)
+            )
+        return self._embedding_key
+
+    def to_msgpack(self) -> bytes:
+        """Pack as [version, text, sender, unix timestamp or None]."""
+        return msgpack.packb(
+            [
+                MESSAGE_FORMAT_VERSION,
+                self.text,
+                self.sender,
+                self.timestamp.timestamp() if self.timestamp else None,
+            ]
+        )
+
+    @classmethod
+    def from_msgpack(cls, data: bytes) -> "Message":
+        version, text, sender, timestamp = msgpack.unpackb(data)
+        if version != MESSAGE_FORMAT_VERSION:
+            raise ValueError(f"Unsupported message format version {version}")
+        return cls(text, sender, datetime.fromtimestamp(timestamp) if timestamp else None)
+
+    def to_json(self) -> bytes:
+        """Serialize in the legacy {"message", "timeStamp", "sender"} shape."""
+        return orjson.dumps(
+            {
+                "message": self.text,
+                "timeStamp": self.timestamp.isoformat(sep=" ") if self.timestamp else None,
+                "sender": self.sender,
+            }
+        )
+
+    @classmethod
+    def from_json(cls, data: bytes | str) -> "Message":
+        return cls.from_dict(orjson.loads(data))
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Message":
+        timestamp = data.get("timeStamp")
+        if isinstance(timestamp, str):
+            timestamp = datetime.fromisoformat(timestamp)
+        return cls(data["message"], data["sender"], timestamp)
+
+    @classmethod
+    def decode(cls, data: bytes | str) -> "Message":
+        """Decode either serialization. JSON objects start with "{", msgpack arrays never do."""
+        if data[:1] in (b"{", "{"):
+            return cls.from_json(data)
+        return cls.from_msgpack(data)
@@ -0,0 +1,92 @@
+"""
+Stream existing Memory documents from float list embeddings to packed binary embeddings.
+
+Documents are read in batches with a projection on the fields being migrated and written
+back with one bulk_write per batch. Only documents without a packed low dimensional
+embedding are selected, so the migration can be interrupted and re-run safely.
+
+Usage:
+    python -m convo_backend.models.migrate_embeddings --dtype float32 [--batch-size 1000] [--keep-lists]
+"""
+
+import argparse
+import logging
+import os
+from time import perf_counter
+import mongoengine as me
+from dotenv import load_dotenv
+from pymongo import UpdateOne
+from convo_backend.models.memory import Memory, pack_embedding
+
+logger = logging.getLogger("convo.memory")
+
+
+def migrate_embeddings(dtype: str = "float32", batch_size: int = 1000, keep_lists: bool = False) -> int:
+    """
+    Pack list embeddings into binary fields.
+
+    Args:
+        dtype (str): "float32" or "float16"
+        batch_size (int): Documents read and written per round trip
+        keep_lists (bool): Keep the original list fields instead of unsetting them
+
+    Returns:
+        int: Number of documents migrated
+    """
+    collection = Memory._get_collection()
+    cursor = collection.find(
+        {"low_dim_embedding_bin": {"$exists": False}, "low_dim_embedding.0": {"$exists": True}},
+        projection={"high_dim_embedding": 1, "low_dim_embedding": 1},
+        batch_size=batch_size,
+    )
+
+    migrated = 0
+    operations = []
+    start_time = perf_counter()
+    for document in cursor:
+        update = {
+            "$set": {
+                "low_dim_embedding_bin": pack_embedding(document["low_dim_embedding"], dtype)
+            }
+        }
+        if document.get("high_dim_embedding"):
+            update["$set"]["high_dim_embedding_bin"] = pack_embedding(
+                document["high_dim_embedding"], dtype
+            )
+        if not keep_lists:
+            update["$unset"] = {"high_dim_embedding": "", "low_dim_embedding": ""}
+        operations.append(UpdateOne({"_id": document["_id"]}, update))
+
+        if len(operations) >= batch_size:
+            collection.bulk_write(operations, ordered=False)
+            migrated += len(operations)
+            operations = []
+            logger.info(f"Migrated {migrated} memories ({perf_counter() - start_time:.1f}s)")
+
+    if operations:
+        collection.bulk_write(operations, ordered=False)
+        migrated += len(operations)
+
+    logger.info(f"Migration complete: {migrated} memories in {perf_counter() - start_time:.1f}s")
+    return migrated
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--dtype", choices=["float32", "float16"], default="float32")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument(
+        "--keep-lists",
+        action="store_true",
+        help="Keep the float list fields alongside the packed ones",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    load_dotenv()
+    me.connect(host=os.getenv("MONGO_URI"), db="Convo")
+    migrate_embeddings(args.dtype, args.batch_size, args.keep_lists)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+import atexit
+import io
+import logging
+import os
+import shutil
+import tarfile
+import tempfile
+from functools import partial
+from typing import Optional
+from cryptography.fernet import Fernet, InvalidToken
+from convo_backend.config import Config
+
+logger = logging.getLogger("convo.roaming")
+
+# Chrome rebuilds these on demand, so they aren't worth encrypting and storing
+EXCLUDED_DIRECTORIES = {
+    "Cache",
+    "Code Cache",
+    "GPUCache",
+    "GrShaderCache",
+    "ShaderCache",
+    "DawnCache",
+    "CacheStorage",
+    "Crashpad",
+}
+# Only valid while that Chrome process is running
+EXCLUDED_FILES = {"SingletonLock", "SingletonCookie", "SingletonSocket"}
+
+
+class EncryptedBrowserProfile:
+    """
+    Chrome user-data directory that persists between runs, encrypted at rest.
+
+    The profile is stored as a Fernet-encrypted tar archive. open() decrypts it into a
+    private temporary directory for Chrome to use, and close() archives and encrypts it
+    again once Chrome has quit, then deletes the plaintext copy. Caches are left out of
+    the archive. The key is a Fernet key, taken from BROWSER_PROFILE_KEY by default.
+
+    If the process exits without close(), the plaintext copy is still deleted at exit,
+    though whatever changed in the profile since open() is lost.
+    """
+
+    def __init__(self, path: str = Config.BROWSER_PROFILE_PATH, key: Optional[str] = None):
+        """
+        Args:
+            path (str): Encrypted archive location
+            key (str, optional): Fernet key, defaults to the BROWSER_PROFILE_KEY environment variable
+
+        Raises:
+            ValueError: If no key is available or it isn't a valid Fernet key
+        """
+        key = key or os.getenv("BROWSER_PROFILE_KEY")
+        if not key:
+            raise ValueError(
+                "BROWSER_PROFILE_KEY is not set. Generate one with: python -c "
+                "\"from cryptography.fernet import Fernet; print(Fernet.generate_key().decode())\""
+            )
+        self.fernet = Fernet(key)
+        self.path = path
+        self.directory: Optional[str] = None
+        self._remove_plaintext = None
+
+    def open(self) -> str:
+        """
+        Decrypt the stored profile, if any, into a new temporary directory.
+
+        Returns:
+            str: The user-data directory to start Chrome with
+        """
+        self.directory = tempfile.mkdtemp(prefix="convo-chrome-")
+        # Don't leave the decrypted profile behind if we exit without close()
+        self._remove_plaintext = partial(shutil.rmtree, self.directory, ignore_errors=True)
+        atexit.register(self._remove_plaintext)
+        if not os.path.exists(self.path):
+            logger.info("No saved browser profile, starting with a new one")
+            return self.directory
+        try:
+            with open(self.path, "rb") as file:
+                archive = self.fernet.decrypt(file.read())
+            with tarfile.open(fileobj=io.BytesIO(archive), mode="r:gz") as tar:
+                tar.extractall(self.directory, filter="data")
+            logger.info("Restored saved browser profile")
+        except (InvalidToken, tarfile.TarError, OSError) as e:
+            logger.warning(f"Could not restore the saved browser profile, starting with a new one: {e}")
+        return self.directory
+
+    def save(self):
+        """Archive and encrypt the profile. Chrome must have quit so its files are consistent."""
+        if self.directory is None:
+            return
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode="w:gz") as tar:
+            for name in os.listdir(self.directory):
+                tar.add(os.path.join(self.directory, name), arcname=name, filter=_exclude_caches)
+        encrypted = self.fernet.encrypt(buffer.getvalue())
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        temporary_path = f"{self.path}.tmp"
+        # Owner-only permissions, like the plaintext directory mkdtemp creates
+        fd = os.open(temporary_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as file:
+            file.write(encrypted)
+        os.replace(temporary_path, self.path)
+        logger.info(f"Saved encrypted browser profile ({len(encrypted) / 2**20:.1f} MB)")
+
+    def close(self):
+        """Save the profile and delete the plaintext copy."""
+        if self.directory is None:
+            return
+        try:
+            self.save()
+        except Exception as e:
+            logger.error(f"Failed to save the browser profile: {e}", exc_info=True)
+        finally:
+            atexit.unregister(self._remove_plaintext)
+            self._remove_plaintext()
+            self._remove_plaintext = None
+            self.directory = None
+
+
+def _exclude_caches(info: tarfile.TarInfo) -> Optional[tarfile.TarInfo]:
+    parts = info.name.split("/")
+    if EXCLUDED_DIRECTORIES.intersection(parts) or parts[-1] in EXCLUDED_FILES:
+        return None
+    return info
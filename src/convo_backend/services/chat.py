@@ -16,21 +16,29 @@ from convo_backend.services.messages_cache import (
     cache_message,
     get_cached_messages,
 )
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Awaitable, Optional
 import logging
 from convo_backend.services.dex_api import get_token_info
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 from langchain_core.tools import StructuredTool
 from langchain_community.document_loaders import TextLoader
 from convo_backend.config import Config
 from convo_backend.utils.latency import LatencyLog
-from convo_backend.services.classifier import TextClassifier
+from convo_backend.utils.startup import LazyComponent
+from convo_backend.models.message import Message
 import asyncio
 
 latency_log = LatencyLog()
 
 
+def _load_text_classifier():
+    # transformers and torch are only imported if the classifier is used
+    from convo_backend.services.classifier import TextClassifier
+
+    return TextClassifier()
+
+
 class ChatService:
     def __init__(self):
         """Initialize chat service with prompt templates, LLM configuration, and classifier."""
@@ -56,7 +64,8 @@ class ChatService:
                     .load()[0]
                     .page_content,
                 ),
-                # ("system", "You have access to the following external data to answer questions if they're asked: {data}"),
+                # Retrieved memories, only present when they arrived in time
+                MessagesPlaceholder(variable_name="context", optional=True),
                 MessagesPlaceholder(variable_name="chat_history"),
                 ("human", "{input}"),
             ]
@@ -84,16 +93,15 @@ class ChatService:
         # Initialize tools
         self.tools_dict = {"get_token_info": get_token_info}
 
-        # Initialize classifier
-        # self.text_classifier = TextClassifier()
-        # self.logger.info("Text classifier initialized successfully.")
+        # Classifier is loaded on first use
+        self.text_classifier = LazyComponent("classifier", _load_text_classifier)
 
 
     async def stream_filler(self, current_message: str):
         formatted_prompt = self.filler_prompt.format(input=current_message)
         async for chunk in self.llm.astream(formatted_prompt):
             token = chunk.content
-            self.logger.debug(f"Generated response token: {token}")
+            self.logger.debug("Generated response token: %s", token)
             yield token
     
     async def invoke_tools(self, tool_call_response):
@@ -133,7 +141,8 @@ class ChatService:
     @latency_log.track_latency(name="OpenAI <stream_bot_response>", stream=True)
     async def stream_bot_response(
         self,
-        current_message: dict = None,
+        current_message: Message = None,
+        memory_context: Optional[Awaitable[Optional[str]]] = None,
     ) -> AsyncGenerator[str, None]:
         """
         Generate and stream an AI response based on chat history and current message.
@@ -142,7 +151,9 @@ class ChatService:
         system prompt. Responses are streamed token by token and cached after completion.
 
         Args:
-            current_message (dict, optional): The latest user message to respond to
+            current_message (Message, optional): The latest user message to respond to
+            memory_context (Awaitable[str | None], optional): Resolves to retrieved memories
+                to add to the prompt. Awaited alongside the chat history fetch.
 
         Yields:
             str: Response tokens as they are generated (response text chunks)
@@ -154,25 +165,26 @@ class ChatService:
             # self.logger.info("Initiating new chat response")
 
             # # Classify the current message
-            # classification_result = self.text_classifier.classify(current_message["message"])
+            # classification_result = self.text_classifier.classify(current_message.text)
             # self.logger.info(f"Classification result: {classification_result}")
 
             # # Optionally, modify behavior based on classification_result
             # # For example, you can adjust the prompt or take specific actions
 
-            # Initialize response dict
-            response_dict = {"message": "", "timeStamp": None, "sender": "bot"}
+            # Response tokens, joined into a Message once streaming completes
+            response_tokens: list[str] = []
+            response_timestamp = None
 
             #Check if api call is needed
             if False:
                 #Start an async task to get additional data
                 get_api_data_task = asyncio.create_task(
                     self.get_api_data(
-                        current_message["message"]
+                        current_message.text
                     )
                 )
                 # While that's going, stream a filler message
-                async for token in self.stream_filler(current_message["message"]):
+                async for token in self.stream_filler(current_message.text):
                      yield token
 
                 #Await on the api data task to finish
@@ -180,35 +192,54 @@ class ChatService:
             #If not, continue with normal response process
             else: 
                 # Only need chat history if we are proceeding with normal response
-                messages_list = await self.get_chat_history()
+                if memory_context is not None:
+                    messages_list, context = await asyncio.gather(
+                        self.get_chat_history(), memory_context
+                    )
+                else:
+                    messages_list, context = await self.get_chat_history(), None
                 chat_history = [
                     (
-                        AIMessage(content=message_dict["message"])
-                        if message_dict["sender"] == "bot"
-                        else HumanMessage(content=message_dict["message"])
+                        AIMessage(content=message.text)
+                        if message.sender == "bot"
+                        else HumanMessage(content=message.text)
                     )
-                    for message_dict in messages_list
+                    for message in messages_list
                 ]
 
                 # Set time message was generated
-                response_dict["timeStamp"] = datetime.datetime.now()
+                response_timestamp = datetime.datetime.now()
 
             # Create chain
             chain = self.chat_prompt | self.llm
 
-            async for chunk in chain.astream(
-                {
-                    "input": current_message["message"],
-                    "chat_history": chat_history # chat history not required if needing to give api based answer
-                }
-            ):
+            prompt_inputs = {
+                "input": current_message.text,
+                "chat_history": chat_history # chat history not required if needing to give api based answer
+            }
+            if context:
+                prompt_inputs["context"] = [
+                    SystemMessage(
+                        content=f"Things you remember that may be relevant:\n{context}"
+                    )
+                ]
+
+            async for chunk in chain.astream(prompt_inputs):
                 token = chunk.content
-                response_dict["message"] += token
-                self.logger.debug(f"Generated response token: {token}")
+                response_tokens.append(token)
+                self.logger.debug("Generated response token: %s", token)
                 yield token
 
             self.logger.info("Chat response completed")
-            await cache_message(response_dict)
+            # The model streams one token per chunk, so the count comes without re-tokenizing
+            await cache_message(
+                Message(
+                    "".join(response_tokens),
+                    "bot",
+                    response_timestamp,
+                    _token_count=sum(1 for token in response_tokens if token),
+                )
+            )
 
         except Exception as e:
             self.logger.error(f"Error generating chat response: {e}", exc_info=True)
@@ -219,7 +250,7 @@ class ChatService:
         return response.content
 
     async def mute_unmute_sensing_task(
-        self, current_message: dict, toggle_mute_tool: StructuredTool
+        self, current_message: Message, toggle_mute_tool: StructuredTool
     ):
         """
         Sensing task to mute or unmute the bot based on voice command.
@@ -227,10 +258,10 @@ class ChatService:
         llm_with_tool = self.tool_llm.bind_tools([toggle_mute_tool])
 
         if (
-            "mute" in current_message["message"].lower()
-            or "unmute" in current_message["message"].lower()
+            "mute" in current_message.text.lower()
+            or "unmute" in current_message.text.lower()
         ):
-            result = await llm_with_tool.ainvoke(current_message["message"])
+            result = await llm_with_tool.ainvoke(current_message.text)
 
             # Add debug logging
             print(f"Result type: {type(result.tool_calls)}")
@@ -253,6 +284,6 @@ class ChatService:
         Retrieve the conversation history from cache.
 
         Returns:
-            list[dict]: List of previous messages with their metadata
+            list[Message]: Previous messages, oldest first
         """
         return await get_cached_messages()
\ No newline at end of file
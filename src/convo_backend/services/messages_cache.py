@@ -1,127 +1,466 @@
-import redis
-import json
-from datetime import datetime
 import logging
 import platform
-import subprocess
+import asyncio
+import os
 import time
+from collections import deque
+from typing import Callable, Optional
+from uuid import uuid4
+import redis.asyncio as redis
+from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
+from convo_backend.config import Config
+from convo_backend.models.message import Message
+from convo_backend.utils.metrics import REGISTRY
 
-# Try to connect to Redis, with fallback for Windows
-def get_redis_connection():
-    """Get Redis connection with Windows fallback"""
-    try:
-        # Try localhost first (works on Linux/macOS)
-        r = redis.Redis(host="localhost", port=6379, socket_connect_timeout=2)
-        r.ping()  # Test connection
-        return r
-    except (redis.ConnectionError, redis.TimeoutError):
-        if platform.system() == "Windows":
-            # On Windows, try to start Redis if WSL is available
-            try:
-                # Try to start Redis in WSL
-                subprocess.run(
-                    ["wsl", "redis-server", "--daemonize", "yes"],
-                    check=True,
-                    capture_output=True,
-                    timeout=5
-                )
-                time.sleep(1)  # Give Redis time to start
-                r = redis.Redis(host="localhost", port=6379, socket_connect_timeout=2)
-                r.ping()
-                return r
-            except (subprocess.TimeoutExpired, subprocess.CalledProcessError, redis.ConnectionError):
-                logging.warning("Redis not available. Using in-memory fallback.")
-                return None
+logger = logging.getLogger("convo.cache")
+
+REDIS_FALLBACK = REGISTRY.gauge(
+    "convo_redis_fallback",
+    "1 when the message cache is using the in-memory fallback instead of Redis",
+)
+CACHE_OPERATION_LATENCY = REGISTRY.histogram(
+    "convo_message_cache_seconds",
+    "Message cache operation latency by operation and backend",
+    ("operation", "backend"),
+    buckets=(0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5),
+)
+
+REDIS_ERRORS = (RedisConnectionError, RedisTimeoutError, OSError)
+
+
+class RedisMessageCache:
+    """
+    Message cache backed by Redis lists, using redis.asyncio so no call blocks the event loop.
+
+    Conversations are kept per namespace (session and Space) under `<prefix>:<namespace>`,
+    so histories from different Spaces or bot instances sharing a Redis never mix. Writes
+    are one MULTI/EXEC pipeline (RPUSH, LTRIM to the newest `max_length`, EXPIRE), so each
+    message is a single round trip and no list can grow unbounded. Reads and writes both
+    slide the namespace's expiry forward, and a sorted set of namespaces scored by expiry
+    time indexes the live namespaces for cleanup_expired() and clear_all().
+
+    When Redis stops answering, the cache marks itself unhealthy and a background task
+    pings it with backoff; callers check `healthy` and use the in-memory fallback meanwhile
+    instead of waiting on a reconnect.
+    """
+
+    def __init__(
+        self,
+        url: str = Config.REDIS_URL,
+        prefix: str = "convo:chat",
+        max_length: int = Config.MESSAGE_CACHE_MAX_LENGTH,
+        ttl: int = Config.MESSAGE_CACHE_TTL,
+        max_connections: int = 10,
+        timeout: float = Config.REDIS_TIMEOUT,
+    ):
+        """
+        Args:
+            url (str): Redis URL
+            prefix (str): Key prefix for the namespaced conversation lists
+            max_length (int): Messages kept per namespace at most
+            ttl (int): Seconds a namespace is kept after it was last read or written
+            max_connections (int): Connection pool size
+            timeout (float): Seconds to wait for a connection or a reply before falling back
+        """
+        self.prefix = prefix
+        self.namespaces_key = f"{prefix}:namespaces"
+        self.max_length = max_length
+        self.ttl = ttl
+        self.timeout = timeout
+        self.pool = redis.ConnectionPool.from_url(
+            url,
+            max_connections=max_connections,
+            socket_connect_timeout=timeout,
+            socket_timeout=timeout,
+            health_check_interval=30,
+        )
+        self.client = redis.Redis(connection_pool=self.pool)
+        self.healthy = False
+        self.fallback_logged = False
+        self.reconnect_task: Optional[asyncio.Task] = None
+
+    async def connect(self) -> bool:
+        """Check Redis is reachable, scheduling background reconnects if it isn't."""
+        if await self.ping():
+            self._set_healthy(True)
         else:
-            logging.warning("Redis not available. Using in-memory fallback.")
+            self.mark_unhealthy()
+        return self.healthy
+
+    async def ping(self) -> bool:
+        try:
+            return bool(await asyncio.wait_for(self.client.ping(), self.timeout))
+        except (asyncio.TimeoutError, *REDIS_ERRORS):
+            return False
+
+    def mark_unhealthy(self):
+        """Switch callers to the fallback and start reconnecting in the background."""
+        # Once per outage, including when Redis was never reachable in the first place
+        if self.healthy or not self.fallback_logged:
+            logger.warning("Redis not available. Using in-memory fallback.")
+            self.fallback_logged = True
+        self._set_healthy(False)
+        if self.reconnect_task is None or self.reconnect_task.done():
+            self.reconnect_task = asyncio.create_task(self._reconnect())
+
+    def key(self, namespace: str) -> str:
+        return f"{self.prefix}:{namespace}"
+
+    async def append(self, namespace: str, message: Message):
+        """Append a message msgpack-encoded, trimming the list and sliding its expiry."""
+        key = self.key(namespace)
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.rpush(key, message.to_msgpack())
+            pipe.ltrim(key, -self.max_length, -1)
+            pipe.expire(key, self.ttl)
+            pipe.zadd(self.namespaces_key, {namespace: time.time() + self.ttl})
+            await asyncio.wait_for(pipe.execute(), self.timeout)
+
+    async def get_all(self, namespace: str) -> list[Message]:
+        """
+        Return a namespace's messages, oldest first, sliding its expiry.
+        Entries written as JSON by older versions are decoded too.
+        """
+        key = self.key(namespace)
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.lrange(key, 0, -1)
+            pipe.expire(key, self.ttl)
+            pipe.zadd(self.namespaces_key, {namespace: time.time() + self.ttl}, xx=True)
+            messages, _, _ = await asyncio.wait_for(pipe.execute(), self.timeout)
+        return [Message.decode(message) for message in messages]
+
+    async def clear(self, namespace: str):
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.delete(self.key(namespace))
+            pipe.zrem(self.namespaces_key, namespace)
+            await asyncio.wait_for(pipe.execute(), self.timeout)
+
+    async def clear_all(self) -> int:
+        """
+        Delete every conversation under the prefix, from any session, and the namespace index.
+
+        Keys are found with SCAN rather than from the index, so lists whose index entry
+        was already dropped are removed too.
+
+        Returns:
+            int: Number of keys deleted
+        """
+        deleted = 0
+        keys = []
+        async for key in self.client.scan_iter(match=f"{self.prefix}:*", count=500):
+            keys.append(key)
+            if len(keys) == 500:
+                deleted += await asyncio.wait_for(self.client.unlink(*keys), self.timeout)
+                keys = []
+        if keys:
+            deleted += await asyncio.wait_for(self.client.unlink(*keys), self.timeout)
+        return deleted
+
+    async def cleanup_expired(self) -> int:
+        """
+        Drop namespaces whose expiry has passed from the namespace index.
+
+        The lists themselves are removed by their own EXPIRE, which every write and read
+        slides together with the index score. Deleting them here instead would race with a
+        write landing between finding a namespace expired and deleting it.
+
+        Returns:
+            int: Number of namespaces removed
+        """
+        return await asyncio.wait_for(
+            self.client.zremrangebyscore(self.namespaces_key, "-inf", time.time()), self.timeout
+        )
+
+    async def close(self):
+        if self.reconnect_task:
+            self.reconnect_task.cancel()
+        await self.client.aclose()
+        await self.pool.disconnect()
+
+    async def _reconnect(self):
+        delay = 0.5
+        started_redis = False
+        while not self.healthy:
+            if not started_redis and platform.system() == "Windows":
+                # On Windows, try to start Redis if WSL is available
+                started_redis = True
+                await _start_wsl_redis()
+            await asyncio.sleep(delay)
+            if await self.ping():
+                logger.info("Redis connection restored")
+                self._set_healthy(True)
+                return
+            delay = min(delay * 2, 30.0)
+
+    def _set_healthy(self, healthy: bool):
+        self.healthy = healthy
+        REDIS_FALLBACK.set(0 if healthy else 1)
+
+
+class InMemoryMessageCache:
+    """
+    In-process message cache used while Redis is unavailable, with the same interface and
+    expiry rules as RedisMessageCache.
+
+    Each namespace holds a deque of Messages bounded to `max_length`, so appends and
+    trimming are O(1) and reads return the stored records without decoding. Like the Redis
+    lists, a namespace expires as a whole `ttl` seconds after it was last read or written;
+    expired namespaces are dropped lazily on access and in bulk by cleanup_expired().
+    """
+
+    healthy = True
+
+    def __init__(
+        self,
+        max_length: int = Config.MESSAGE_CACHE_MAX_LENGTH,
+        ttl: int = Config.MESSAGE_CACHE_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            max_length (int): Messages kept per namespace at most
+            ttl (int): Seconds a namespace is kept after it was last read or written
+            clock (Callable[[], float]): Monotonic time source, in seconds
+        """
+        self.max_length = max_length
+        self.ttl = ttl
+        self.clock = clock
+        self.conversations: dict[str, deque[Message]] = {}
+        self.expires_at: dict[str, float] = {}
+
+    async def append(self, namespace: str, message: Message):
+        """Append a message, trimming the namespace and sliding its expiry."""
+        now = self.clock()
+        conversation = self._live(namespace, now)
+        if conversation is None:
+            conversation = self.conversations[namespace] = deque(maxlen=self.max_length)
+        conversation.append(message)
+        self.expires_at[namespace] = now + self.ttl
+
+    async def get_all(self, namespace: str) -> list[Message]:
+        """Return a namespace's messages, oldest first, sliding its expiry."""
+        now = self.clock()
+        conversation = self._live(namespace, now)
+        if conversation is None:
+            return []
+        self.expires_at[namespace] = now + self.ttl
+        return list(conversation)
+
+    async def clear(self, namespace: str):
+        self.conversations.pop(namespace, None)
+        self.expires_at.pop(namespace, None)
+
+    async def clear_all(self) -> int:
+        """Drop every namespace, returning how many there were."""
+        cleared = len(self.conversations)
+        self.conversations.clear()
+        self.expires_at.clear()
+        return cleared
+
+    async def cleanup_expired(self) -> int:
+        """
+        Remove namespaces whose expiry has passed.
+
+        Returns:
+            int: Number of namespaces removed
+        """
+        now = self.clock()
+        expired = [namespace for namespace, expires_at in self.expires_at.items() if expires_at <= now]
+        for namespace in expired:
+            await self.clear(namespace)
+        return len(expired)
+
+    async def close(self):
+        await self.clear_all()
+
+    def _live(self, namespace: str, now: float) -> Optional[deque[Message]]:
+        """Return the namespace's messages, or None if it doesn't exist or has expired."""
+        if self.expires_at.get(namespace, now) <= now:
+            # Never written, or expired since
+            self.conversations.pop(namespace, None)
+            self.expires_at.pop(namespace, None)
             return None
+        return self.conversations[namespace]
+
+
+async def _start_wsl_redis():
+    try:
+        process = await asyncio.create_subprocess_exec(
+            "wsl", "redis-server", "--daemonize", "yes",
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        await asyncio.wait_for(process.wait(), 5)
+    except (FileNotFoundError, asyncio.TimeoutError):
+        logger.warning("WSL not found. Redis will use in-memory fallback.")
+
 
-# Global Redis connection
-r = get_redis_connection()
+# Shared Redis cache, created on first use so importing this module never touches the network
+_redis_cache: Optional[RedisMessageCache] = None
+_redis_cache_lock = asyncio.Lock()
 
 # In-memory fallback for when Redis is not available
-_memory_cache = []
+_memory_cache = InMemoryMessageCache()
 
-async def cache_message(message: dict[str, any]):
+# Conversations are namespaced by bot instance and Space so histories never mix
+_session_id = os.getenv("CONVO_SESSION_ID") or uuid4().hex[:12]
+_space_id: Optional[str] = None
+
+
+def current_namespace() -> str:
+    """Namespace for the current session and Space ("local" when not in a Space)."""
+    return f"{_session_id}:{_space_id or 'local'}"
+
+
+def set_cache_space(space_id: Optional[str]):
+    """
+    Switch the message cache to a Space's conversation, or back to the local one with None.
+    The previous namespace is left to expire.
+    """
+    global _space_id
+    _space_id = space_id
+    logger.debug("Message cache namespace set to %s", current_namespace())
+    try:
+        # Good moment to sweep abandoned namespaces, off the caller's path
+        asyncio.get_running_loop().create_task(cleanup_expired_namespaces())
+    except RuntimeError:
+        pass  # No running loop
+
+
+async def get_redis_cache() -> RedisMessageCache:
+    """Return the shared Redis cache, connecting on the first call."""
+    global _redis_cache
+    async with _redis_cache_lock:
+        if _redis_cache is None:
+            _redis_cache = RedisMessageCache()
+            await _redis_cache.connect()
+    return _redis_cache
+
+
+async def cache_message(message: Message, namespace: Optional[str] = None):
     """
     Cache a chat message in Redis with automatic expiration.
 
-    Handles datetime serialization and stores the message in a Redis list.
-    Messages automatically expire after 1 hour.
+    Messages are stored msgpack-encoded in the namespace's Redis list. A namespace
+    expires MESSAGE_CACHE_TTL seconds after it was last used, in Redis and in the
+    in-memory fallback alike.
 
     Args:
-        message (dict): Message to cache containing:
-            - timeStamp (datetime, optional): When message was created
-            - sender (str): Who sent the message
-            - message (str): Content of the message
-
-    Raises:
-        TypeError: If message cannot be serialized to JSON
+        message (Message): Message to cache
+        namespace (str, optional): Defaults to the current session and Space
     """
-    logger = logging.getLogger("convo.cache")
     try:
-        logger.debug(f"Caching message from {message.get('sender')}")
-        # convert datetime object to string
-        if isinstance(message.get("timeStamp"), datetime) and message.get("timeStamp"):
-            message["timeStamp"] = str(message["timeStamp"])
-
-        try:
-            json_message = json.dumps(message)
-            
-            if r is not None:
-                # Use Redis if available
-                r.rpush("chat_cache", json_message)
-                r.expire("chat_cache", 120)  # 2 minutes = 120 seconds
-            else:
-                # Use in-memory fallback
-                _memory_cache.append(json_message)
-                # Keep only last 100 messages
-                if len(_memory_cache) > 100:
-                    _memory_cache.pop(0)
-
-        except TypeError as e:
-            print(f"Error serializing message: {e}")
-            print(f"Message contents: {message}")
+        logger.debug("Caching message from %s", message.sender)
+        namespace = namespace or current_namespace()
+        cache = await get_redis_cache()
+        start_time = asyncio.get_running_loop().time()
+        if cache.healthy:
+            try:
+                await cache.append(namespace, message)
+                CACHE_OPERATION_LATENCY.labels("append", "redis").observe(
+                    asyncio.get_running_loop().time() - start_time
+                )
+                logger.info("Message successfully cached")
+                return
+            except (asyncio.TimeoutError, *REDIS_ERRORS) as e:
+                logger.warning(f"Redis write failed, using in-memory fallback: {e}")
+                cache.mark_unhealthy()
 
+        # Use in-memory fallback
+        await _memory_cache.append(namespace, message)
+        CACHE_OPERATION_LATENCY.labels("append", "memory").observe(
+            asyncio.get_running_loop().time() - start_time
+        )
         logger.info("Message successfully cached")
     except Exception as e:
         logger.error(f"Failed to cache message: {e}", exc_info=True)
 
 
-async def get_cached_messages() -> list[dict]:
+async def get_cached_messages(namespace: Optional[str] = None) -> list[Message]:
     """
-    Retrieve cached messages from Redis.
+    Retrieve cached messages from Redis, or from the in-memory fallback while Redis is down.
+
+    Args:
+        namespace (str, optional): Defaults to the current session and Space
 
     Returns:
-        list[dict]: List of cached messages with the most recent first.
+        list[Message]: List of cached messages, oldest first.
     """
-    logger = logging.getLogger("convo.cache")
     try:
         logger.debug("Retrieving cached messages")
-        
-        if r is not None:
-            # Use Redis if available
-            messages = r.lrange("chat_cache", 0, -1)
-            messages = [json.loads(msg.decode("utf-8")) for msg in messages]
-        else:
+        namespace = namespace or current_namespace()
+        cache = await get_redis_cache()
+        start_time = asyncio.get_running_loop().time()
+
+        messages = None
+        if cache.healthy:
+            try:
+                messages = await cache.get_all(namespace)
+                CACHE_OPERATION_LATENCY.labels("get", "redis").observe(
+                    asyncio.get_running_loop().time() - start_time
+                )
+            except (asyncio.TimeoutError, *REDIS_ERRORS) as e:
+                logger.warning(f"Redis read failed, using in-memory fallback: {e}")
+                cache.mark_unhealthy()
+        if messages is None:
             # Use in-memory fallback
-            messages = [json.loads(msg) for msg in _memory_cache]
-        
-        logger.debug(f"Retrieved {len(messages)} messages from cache")
+            messages = await _memory_cache.get_all(namespace)
+            CACHE_OPERATION_LATENCY.labels("get", "memory").observe(
+                asyncio.get_running_loop().time() - start_time
+            )
+
+        logger.debug("Retrieved %d messages from cache", len(messages))
         return messages
     except Exception as e:
         logger.error(f"Failed to retrieve cached messages: {e}", exc_info=True)
         return []
 
 
-async def clear_cache():
-    """Clear all cached messages."""
-    logger = logging.getLogger("convo.cache")
+async def clear_cache(namespace: Optional[str] = None):
+    """Clear cached messages for a namespace, the current one by default."""
     try:
-        if r is not None:
-            r.delete("chat_cache")
-        else:
-            _memory_cache.clear()
+        namespace = namespace or current_namespace()
+        cache = await get_redis_cache()
+        if cache.healthy:
+            await cache.clear(namespace)
+        await _memory_cache.clear(namespace)
         logger.info("Cache cleared successfully")
     except Exception as e:
         logger.error(f"Failed to clear cache: {e}", exc_info=True)
+
+
+async def clear_all_caches():
+    """Clear cached messages for every session and Space, e.g. left over from earlier runs."""
+    try:
+        cache = await get_redis_cache()
+        if cache.healthy:
+            deleted = await cache.clear_all()
+            logger.info(f"Deleted {deleted} message cache keys from Redis")
+        else:
+            logger.warning("Redis not available, only the in-memory cache was cleared")
+        await _memory_cache.clear_all()
+    except Exception as e:
+        logger.error(f"Failed to clear cache: {e}", exc_info=True)
+
+
+async def cleanup_expired_namespaces() -> int:
+    """Delete expired namespaces from Redis and the in-memory fallback. Returns how many were removed."""
+    try:
+        removed = await _memory_cache.cleanup_expired()
+        cache = await get_redis_cache()
+        if cache.healthy:
+            removed += await cache.cleanup_expired()
+        if removed:
+            logger.info(f"Removed {removed} expired message cache namespaces")
+        return removed
+    except Exception as e:
+        logger.warning(f"Failed to clean up message cache namespaces: {e}")
+        return 0
+
+
+async def close_cache():
+    """Close the shared Redis connection pool."""
+    global _redis_cache
+    if _redis_cache is not None:
+        await _redis_cache.close()
+        _redis_cache = None
@@ -0,0 +1,160 @@
+import time
+from collections import defaultdict
+from typing import Callable, Iterable, Optional
+from convo_backend.config import Config
+
+
+class SpaceCatalog:
+    """
+    Live Spaces seen across searches, indexed for O(1) lookups.
+
+    Spaces are kept in the shape returned by parse_x_spaces, keyed by Space id, with
+    users and topics indexed by id and reverse indexes from user and topic ids to the
+    Spaces they appear in. merge() adds or replaces Spaces in place and retain() drops
+    the ones that are no longer live, so the catalog is updated incrementally rather
+    than rebuilt after every search.
+
+    Join history outlives the Spaces themselves: joined Spaces and failed join attempts
+    are kept until clear_history() ages them out, so the roamer doesn't revisit a Space
+    or keep retrying one it can't get into.
+    """
+
+    def __init__(
+        self,
+        max_failures: int = Config.SPACE_MAX_JOIN_FAILURES,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            max_failures (int): Failed joins after which a Space is no longer a candidate
+            clock (Callable[[], float]): Time source for the join history, in seconds
+        """
+        self.max_failures = max_failures
+        self.clock = clock
+        self.spaces: dict[str, dict] = {}
+        self.users: dict[str, dict] = {}
+        self.topics: dict[str, dict] = {}
+        self.spaces_by_user: defaultdict[str, set[str]] = defaultdict(set)
+        self.spaces_by_topic: defaultdict[str, set[str]] = defaultdict(set)
+        self.joined: dict[str, float] = {}  # Space id -> when it was joined
+        self.failures: defaultdict[str, int] = defaultdict(int)
+        self.last_failed: dict[str, float] = {}  # Space id -> when a join last failed
+        # Joins and failed joins per host, so new Spaces by the same hosts can be judged
+        self.host_joins: defaultdict[str, int] = defaultdict(int)
+        self.host_failures: defaultdict[str, int] = defaultdict(int)
+
+    def __len__(self) -> int:
+        return len(self.spaces)
+
+    def __contains__(self, space_id: str) -> bool:
+        return space_id in self.spaces
+
+    def get(self, space_id: str) -> Optional[dict]:
+        return self.spaces.get(space_id)
+
+    def user(self, user_id: str) -> Optional[dict]:
+        return self.users.get(user_id)
+
+    def topic(self, topic_id: str) -> Optional[dict]:
+        return self.topics.get(topic_id)
+
+    def spaces_for_user(self, user_id: str) -> list[dict]:
+        """Live Spaces the user hosts or speaks in."""
+        return [self.spaces[space_id] for space_id in self.spaces_by_user.get(user_id, ())]
+
+    def spaces_for_topic(self, topic_id: str) -> list[dict]:
+        return [self.spaces[space_id] for space_id in self.spaces_by_topic.get(topic_id, ())]
+
+    def merge(self, spaces: Iterable[dict]):
+        """Add parsed Spaces, replacing earlier versions of the same Space."""
+        for space in spaces:
+            space_id = space["space_id"]
+            if space_id in self.spaces:
+                self._unindex(space_id)
+            self.spaces[space_id] = space
+            for user in (*space["hosts"], *space["speakers"]):
+                self.users[user["id"]] = user
+                self.spaces_by_user[user["id"]].add(space_id)
+            for topic in space["topics"]:
+                self.topics[topic["id"]] = topic
+                self.spaces_by_topic[topic["id"]].add(space_id)
+
+    def retain(self, space_ids: Iterable[str]):
+        """Drop every Space not in `space_ids`, e.g. ones no search returns any more."""
+        live = set(space_ids)
+        for space_id in [space_id for space_id in self.spaces if space_id not in live]:
+            self.remove(space_id)
+
+    def remove(self, space_id: str):
+        if space_id in self.spaces:
+            self._unindex(space_id)
+            del self.spaces[space_id]
+
+    def mark_joined(self, space_id: str):
+        self.joined[space_id] = self.clock()
+        for host in self._hosts(space_id):
+            self.host_joins[host["id"]] += 1
+
+    def mark_failed(self, space_id: str):
+        self.failures[space_id] += 1
+        self.last_failed[space_id] = self.clock()
+        for host in self._hosts(space_id):
+            self.host_failures[host["id"]] += 1
+
+    def host_success_rate(self, user_id: str, prior: float = 0.5) -> float:
+        """Share of joins into the user's Spaces that succeeded, smoothed towards `prior`."""
+        joins = self.host_joins.get(user_id, 0)
+        failures = self.host_failures.get(user_id, 0)
+        return (joins + prior) / (joins + failures + 1)
+
+    def is_candidate(self, space_id: str) -> bool:
+        """True unless the Space was already joined or has failed too often."""
+        return space_id not in self.joined and self.failures.get(space_id, 0) < self.max_failures
+
+    def candidates(self) -> list[dict]:
+        """Live Spaces worth joining, in the order they were first seen."""
+        return [space for space_id, space in self.spaces.items() if self.is_candidate(space_id)]
+
+    def clear_history(self, max_age: Optional[float] = None):
+        """
+        Forget join history, so the history doesn't grow for as long as the roamer runs.
+
+        Args:
+            max_age (Optional[float]): Only forget joins and failed joins older than this
+                many seconds, keeping per-host statistics. None forgets everything.
+        """
+        if max_age is None:
+            self.joined.clear()
+            self.failures.clear()
+            self.last_failed.clear()
+            self.host_joins.clear()
+            self.host_failures.clear()
+            return
+        cutoff = self.clock() - max_age
+        for space_id in [space_id for space_id, joined in self.joined.items() if joined < cutoff]:
+            del self.joined[space_id]
+        for space_id in [space_id for space_id, failed in self.last_failed.items() if failed < cutoff]:
+            del self.last_failed[space_id]
+            self.failures.pop(space_id, None)
+
+    def _hosts(self, space_id: str) -> list[dict]:
+        space = self.spaces.get(space_id)
+        return space["hosts"] if space else []
+
+    def _unindex(self, space_id: str):
+        space = self.spaces[space_id]
+        for user in (*space["hosts"], *space["speakers"]):
+            self._discard(self.spaces_by_user, self.users, user["id"], space_id)
+        for topic in space["topics"]:
+            self._discard(self.spaces_by_topic, self.topics, topic["id"], space_id)
+
+    @staticmethod
+    def _discard(index: dict[str, set[str]], records: dict[str, dict], key: str, space_id: str):
+        """Unlink a Space from a user or topic, forgetting the user or topic once unreferenced."""
+        space_ids = index.get(key)
+        if space_ids is None:
+            return
+        space_ids.discard(space_id)
+        if not space_ids:
+            del index[key]
+            records.pop(key, None)
@@ -0,0 +1,264 @@
+import asyncio
+import logging
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Iterable, Optional
+import httpx
+from convo_backend.config import Config
+from convo_backend.services.space_catalog import SpaceCatalog
+from convo_backend.services.x_api import X_API_BASE_URL, parse_x_spaces, search_x_spaces
+from convo_backend.utils.metrics import REGISTRY
+
+logger = logging.getLogger("convo.roaming")
+
+DISCOVERY_SEARCHES = REGISTRY.counter(
+    "convo_space_discovery_searches",
+    "Space searches by result (hit, miss, rate_limited, error)",
+    ("result",),
+)
+DISCOVERY_CANDIDATES = REGISTRY.gauge(
+    "convo_space_discovery_candidates",
+    "Live Spaces found by discovery that were not yet joined or failed too often",
+)
+
+
+class TokenBucket:
+    """
+    Token bucket for an X API endpoint's rate limit.
+
+    Refills at `capacity / period` tokens per second, and is corrected from the
+    x-rate-limit-* headers of every response so it tracks the server's count rather than
+    our own guess. Once the server reports no requests remaining, or sends Retry-After,
+    acquire() waits until the window resets or the retry time has passed.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        period: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            capacity (int): Requests allowed per window
+            period (float): Window length in seconds
+            clock (Callable[[], float]): Monotonic time source, in seconds
+        """
+        self.capacity = capacity
+        self.period = period
+        self.clock = clock
+        self.tokens = float(capacity)
+        self.updated_at = clock()
+        self.blocked_until = 0.0
+
+    def _refill(self, now: float):
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated_at) * self.capacity / self.period
+        )
+        self.updated_at = now
+
+    def wait_time(self) -> float:
+        """Seconds until a token is available."""
+        now = self.clock()
+        self._refill(now)
+        refill_wait = 0.0 if self.tokens >= 1 else (1 - self.tokens) * self.period / self.capacity
+        return max(0.0, self.blocked_until - now, refill_wait)
+
+    async def acquire(self, max_wait: float = 0.0) -> bool:
+        """
+        Take a token, waiting up to `max_wait` seconds for one.
+
+        The token is reserved before waiting, so concurrent callers queue up behind each
+        other's reservations and wait at the same time rather than one after another.
+
+        Returns:
+            bool: False if no token becomes available in time, without consuming one
+        """
+        wait = self.wait_time()
+        if wait > max_wait:
+            return False
+        # Can go negative; later callers then wait until the reservations are paid back
+        self.tokens -= 1
+        if wait:
+            await asyncio.sleep(wait)
+        return True
+
+    def pause(self, seconds: float):
+        """Hand out no tokens for `seconds`, then refill from empty, e.g. after a 429."""
+        now = self.clock()
+        self._refill(now)
+        self.tokens = min(self.tokens, 0.0)
+        self.blocked_until = max(self.blocked_until, now + seconds)
+
+    def update(self, headers: httpx.Headers):
+        """
+        Sync with x-rate-limit-limit, -remaining and -reset (epoch seconds) if present, and
+        pause for Retry-After (seconds or an HTTP date) if present.
+        """
+        retry_after = _retry_after(headers)
+        if retry_after is not None:
+            self.pause(retry_after)
+            logger.warning(f"X Spaces search asked to retry after {retry_after:.0f}s")
+        try:
+            limit = int(headers["x-rate-limit-limit"])
+            remaining = int(headers["x-rate-limit-remaining"])
+            reset = float(headers["x-rate-limit-reset"])
+        except (KeyError, ValueError):
+            return
+        now = self.clock()
+        self._refill(now)
+        self.capacity = limit
+        self.tokens = min(self.tokens, remaining)
+        if remaining == 0:
+            self.blocked_until = max(self.blocked_until, now + max(0.0, reset - time.time()))
+            logger.warning(
+                f"X Spaces search rate limit reached, pausing searches for "
+                f"{self.blocked_until - now:.0f}s"
+            )
+
+
+def _retry_after(headers: httpx.Headers) -> Optional[float]:
+    """Seconds to wait from a Retry-After header, None if it's missing or malformed."""
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class SpaceDiscovery:
+    """
+    Finds live Spaces for the configured keywords.
+
+    All keywords are searched concurrently through one pooled httpx.AsyncClient. Results
+    are cached per query for `ttl` seconds, and requests go through a TokenBucket kept in
+    sync with X's rate-limit headers. When a search is rate limited or fails, the last
+    results for that query are used instead. discover() merges every query's results into
+    a SpaceCatalog, de-duplicated by Space id, which also holds the join history.
+    """
+
+    def __init__(
+        self,
+        keywords: Iterable[str],
+        ttl: float = Config.SPACE_DISCOVERY_TTL,
+        base_url: str = X_API_BASE_URL,
+        max_connections: int = Config.SPACE_DISCOVERY_MAX_CONNECTIONS,
+        timeout: float = Config.SPACE_DISCOVERY_TIMEOUT,
+        rate_limit: int = Config.X_SPACES_SEARCH_RATE_LIMIT,
+        rate_limit_period: float = Config.X_SPACES_SEARCH_RATE_LIMIT_PERIOD,
+        only_english: bool = True,
+        catalog: Optional[SpaceCatalog] = None,
+        clock: Callable[[], float] = time.monotonic,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """
+        Args:
+            keywords (Iterable[str]): Search queries
+            ttl (float): Seconds a query's results are reused
+            base_url (str): X API base URL, overridable to point at a stub server
+            max_connections (int): Connection pool size
+            timeout (float): Seconds to wait for a response, or for a rate-limit token
+            rate_limit (int): Searches allowed per rate-limit window
+            rate_limit_period (float): Rate-limit window in seconds
+            only_english (bool): Drop Spaces not in English
+            catalog (SpaceCatalog, optional): Catalog to merge results into
+            clock (Callable[[], float]): Monotonic time source, in seconds
+            transport (httpx.AsyncBaseTransport, optional): Transport for the client, e.g. an
+                httpx.MockTransport in tests
+        """
+        self.keywords = list(dict.fromkeys(keywords or ()))
+        self.ttl = ttl
+        self.base_url = base_url
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.only_english = only_english
+        self.clock = clock
+        self.bucket = TokenBucket(rate_limit, rate_limit_period, clock)
+        self.cache: dict[str, tuple[float, list[dict]]] = {}
+        self.catalog = catalog or SpaceCatalog()
+        self.transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # Created on first use, inside the running event loop
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                transport=self.transport,
+            )
+        return self._client
+
+    async def search(self, query: str) -> list[dict]:
+        """Return the parsed live Spaces for a query, from the cache while it is fresh."""
+        cached = self.cache.get(query)
+        if cached and cached[0] > self.clock():
+            DISCOVERY_SEARCHES.labels("hit").inc()
+            return cached[1]
+        stale = cached[1] if cached else []
+
+        if not await self.bucket.acquire(self.timeout):
+            DISCOVERY_SEARCHES.labels("rate_limited").inc()
+            return stale
+        try:
+            response = await search_x_spaces(self.client, query, self.base_url)
+        except httpx.HTTPError as e:
+            logger.warning(f"Space search for {query!r} failed: {e}")
+            DISCOVERY_SEARCHES.labels("error").inc()
+            return stale
+        self.bucket.update(response.headers)
+        if response.status_code == 429:
+            if self.bucket.wait_time() == 0:
+                # No header said how long to back off, so wait for the next token
+                self.bucket.pause(0.0)
+            DISCOVERY_SEARCHES.labels("rate_limited").inc()
+            return stale
+        if response.is_error:
+            logger.warning(f"Space search for {query!r} returned HTTP {response.status_code}")
+            DISCOVERY_SEARCHES.labels("error").inc()
+            return stale
+
+        try:
+            spaces = parse_x_spaces(response.json(), self.only_english)
+        except ValueError as e:
+            logger.warning(f"Space search for {query!r} returned an unreadable body: {e}")
+            DISCOVERY_SEARCHES.labels("error").inc()
+            return stale
+        self.cache[query] = (self.clock() + self.ttl, spaces)
+        DISCOVERY_SEARCHES.labels("miss").inc()
+        return spaces
+
+    async def discover(self) -> list[dict]:
+        """
+        Search every keyword concurrently and update the catalog.
+
+        Spaces no query returns any more are dropped from the catalog.
+
+        Returns:
+            list[dict]: Parsed Spaces not yet joined and not failed too often
+        """
+        results = await asyncio.gather(*(self.search(query) for query in self.keywords))
+        live: set[str] = set()
+        for spaces in results:
+            self.catalog.merge(spaces)
+            live.update(space["space_id"] for space in spaces)
+        self.catalog.retain(live)
+
+        candidates = self.catalog.candidates()
+        DISCOVERY_CANDIDATES.set(len(candidates))
+        return candidates
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
@@ -0,0 +1,210 @@
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from typing import Awaitable, Callable, Optional
+import numpy as np
+from convo_backend.config import Config
+from convo_backend.services.space_catalog import SpaceCatalog
+from convo_backend.utils.metrics import REGISTRY
+
+logger = logging.getLogger("convo.roaming")
+
+RANKING_LATENCY = REGISTRY.histogram(
+    "convo_space_ranking_seconds",
+    "Time to rank candidate Spaces, including any LLM tie-break",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0),
+)
+RANKING_DECISIONS = REGISTRY.counter(
+    "convo_space_ranking_decisions",
+    "Space choices by how they were made (local, llm_tie_break, llm_failed)",
+    ("decision",),
+)
+
+# How much each feature, scaled to [0, 1], contributes to a Space's score
+FEATURE_WEIGHTS = {
+    "participants": 0.30,
+    "speakers": 0.10,
+    "host_followers": 0.15,
+    "topic_match": 0.15,
+    "language": 0.10,
+    "persona_similarity": 0.10,
+    "join_history": 0.10,
+}
+
+
+class SpaceRanker:
+    """
+    Picks which Space to join next from local features, instead of asking the LLM every hop.
+
+    Each candidate is scored on participant and speaker counts, host follower counts,
+    keyword matches in its title and topics, language, similarity of its title to the
+    persona prompt, and how joins into it and its hosts' Spaces went before. Counts are
+    log-scaled relative to the best candidate. The LLM is only asked when several
+    candidates score within `tie_margin` of the best, and then only about the top
+    `llm_max_candidates` of them.
+    """
+
+    def __init__(
+        self,
+        keywords: list[str],
+        catalog: SpaceCatalog,
+        tie_break: Optional[Callable[[list[dict]], Awaitable[str]]] = None,
+        embed: Optional[Callable[[list[str]], np.ndarray]] = None,
+        persona: Optional[str] = None,
+        weights: Optional[dict[str, float]] = None,
+        tie_margin: float = Config.SPACE_RANKER_TIE_MARGIN,
+        llm_max_candidates: Optional[int] = Config.SPACE_RANKER_LLM_MAX_CANDIDATES,
+    ):
+        """
+        Args:
+            keywords (list[str]): Configured spaces_keywords
+            catalog (SpaceCatalog): Catalog holding the join history
+            tie_break (Callable, optional): Async function choosing a Space id from a list of
+                Spaces, e.g. ChatService.choose_x_space. Ties go to the best score without it
+            embed (Callable, optional): Batch text embedding function for persona similarity
+            persona (str, optional): Text the Space titles are compared to
+            weights (dict[str, float], optional): Overrides for FEATURE_WEIGHTS
+            tie_margin (float): Score difference within which candidates count as tied
+            llm_max_candidates (int, optional): Most candidates sent to the LLM, None for all
+        """
+        self.keywords = [keyword.lower() for keyword in keywords or ()]
+        self.catalog = catalog
+        self.tie_break = tie_break
+        self.embed = embed
+        self.persona = persona
+        self.weights = {**FEATURE_WEIGHTS, **(weights or {})}
+        self.tie_margin = tie_margin
+        self.llm_max_candidates = llm_max_candidates
+        self._persona_embedding: Optional[np.ndarray] = None
+        self._local_decisions: deque[float] = deque()  # When the LLM was not needed
+
+    def features(self, spaces: list[dict], similarities: Optional[np.ndarray] = None) -> np.ndarray:
+        """Return a (len(spaces), len(weights)) array of features scaled to [0, 1]."""
+        participants = np.array([math.log1p(space.get("participant_count") or 0) for space in spaces])
+        speakers = np.array([math.log1p(len(space["speakers"]) + len(space["hosts"])) for space in spaces])
+        followers = np.array(
+            [
+                math.log1p(
+                    sum(
+                        host.get("public_metrics", {}).get("followers_count", 0)
+                        for host in space["hosts"]
+                    )
+                )
+                for space in spaces
+            ]
+        )
+        columns = {
+            "participants": _scale(participants),
+            "speakers": _scale(speakers),
+            "host_followers": _scale(followers),
+            "topic_match": np.array([self._topic_match(space) for space in spaces]),
+            "language": np.array([1.0 if space.get("lang", "en") == "en" else 0.0 for space in spaces]),
+            "persona_similarity": (
+                np.clip(similarities, 0.0, 1.0) if similarities is not None else np.zeros(len(spaces))
+            ),
+            "join_history": np.array([self._join_history(space) for space in spaces]),
+        }
+        return np.column_stack([columns[name] for name in self.weights])
+
+    def score(self, spaces: list[dict], similarities: Optional[np.ndarray] = None) -> np.ndarray:
+        if not spaces:
+            return np.empty(0)
+        return self.features(spaces, similarities) @ np.array(list(self.weights.values()))
+
+    async def choose(self, spaces: list[dict]) -> Optional[str]:
+        """
+        Return the id of the Space to join, or None if there are no candidates.
+
+        Args:
+            spaces (list[dict]): Candidate Spaces as returned by parse_x_spaces
+        """
+        if not spaces:
+            return None
+        start_time = time.perf_counter()
+        scores = self.score(spaces, await self._persona_similarities(spaces))
+        order = np.argsort(-scores, kind="stable")
+        best = spaces[order[0]]["space_id"]
+
+        tied = [spaces[i] for i in order if scores[order[0]] - scores[i] <= self.tie_margin]
+        if len(tied) > 1 and self.tie_break is not None:
+            if self.llm_max_candidates:
+                tied = tied[: self.llm_max_candidates]
+            try:
+                choice = (await self.tie_break(tied)).strip()
+            except Exception as e:
+                RANKING_DECISIONS.labels("llm_failed").inc()
+                logger.warning(f"LLM tie-break failed, using the best scored Space: {e}")
+            else:
+                RANKING_DECISIONS.labels("llm_tie_break").inc()
+                if any(space["space_id"] == choice for space in tied):
+                    best = choice
+                else:
+                    logger.warning(f"LLM chose an unknown Space {choice!r}, using the best scored one")
+        else:
+            RANKING_DECISIONS.labels("local").inc()
+            self._local_decisions.append(time.monotonic())
+
+        elapsed = time.perf_counter() - start_time
+        RANKING_LATENCY.observe(elapsed)
+        logger.info(
+            f"Ranked {len(spaces)} Spaces in {elapsed * 1000:.1f} ms, chose {best} "
+            f"({self.llm_calls_avoided_per_hour()} LLM calls avoided in the last hour)"
+        )
+        return best
+
+    def llm_calls_avoided_per_hour(self) -> int:
+        """Spaces chosen without the LLM in the last hour."""
+        cutoff = time.monotonic() - 3600
+        while self._local_decisions and self._local_decisions[0] < cutoff:
+            self._local_decisions.popleft()
+        return len(self._local_decisions)
+
+    def _topic_match(self, space: dict) -> float:
+        if not self.keywords:
+            return 0.0
+        text = " ".join(
+            [space.get("title") or "", *(topic.get("name", "") for topic in space["topics"])]
+        ).lower()
+        matches = sum(keyword in text for keyword in self.keywords)
+        return min(1.0, matches / 2)  # Two matching keywords is a full match
+
+    def _join_history(self, space: dict) -> float:
+        hosts = space["hosts"]
+        success = (
+            sum(self.catalog.host_success_rate(host["id"]) for host in hosts) / len(hosts)
+            if hosts
+            else 0.5
+        )
+        return success / (1 + self.catalog.failures.get(space["space_id"], 0))
+
+    async def _persona_similarities(self, spaces: list[dict]) -> Optional[np.ndarray]:
+        """Cosine similarity of each Space title to the persona, None without an embedder."""
+        if self.embed is None or not self.persona:
+            return None
+        titles = [space.get("title") or "" for space in spaces]
+        try:
+            if self._persona_embedding is None:
+                self._persona_embedding = _normalize(
+                    (await asyncio.to_thread(self.embed, [self.persona]))[0]
+                )
+            vectors = await asyncio.to_thread(self.embed, titles)
+        except Exception as e:
+            logger.warning(f"Persona similarity unavailable: {e}")
+            return None
+        vectors = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        similarities = vectors @ self._persona_embedding
+        # Untitled Spaces carry no signal
+        similarities[[not title for title in titles]] = 0.0
+        return similarities
+
+
+def _scale(values: np.ndarray) -> np.ndarray:
+    """Scale to [0, 1] relative to the largest value."""
+    peak = values.max() if len(values) else 0.0
+    return values / peak if peak > 0 else np.zeros_like(values)
+
+
+def _normalize(vector: np.ndarray) -> np.ndarray:
+    return vector / max(float(np.linalg.norm(vector)), 1e-12)
@@ -7,7 +7,9 @@ from google.oauth2 import service_account
 import asyncio
 from convo_backend.utils.audio import raw_to_wav
 from convo_backend.services.messages_cache import cache_message
+from convo_backend.models.message import Message
 import logging
+from typing import Callable, Optional
 from convo_backend.utils.latency import LatencyLog
 
 latency_log = LatencyLog()
@@ -15,7 +17,8 @@ latency_log = LatencyLog()
 
 async def transcribe_audio(
     audio_queue: asyncio.Queue = None,
-) -> dict[str, datetime.datetime | str]:
+    on_segment: Optional[Callable[[str], None]] = None,
+) -> Message:
     """
     Transcribe streaming audio data using Google Cloud Speech-to-Text API.
 
@@ -26,12 +29,11 @@ async def transcribe_audio(
     Args:
         audio_queue (asyncio.Queue, optional): Queue containing audio chunks to transcribe.
             Chunks should be either bytes or numpy arrays convertible to bytes.
+        on_segment (Callable[[str], None], optional): Called with the transcript so far
+            each time a segment becomes final.
 
     Returns:
-        dict: Transcription result containing:
-            - message (str): The transcribed text
-            - timeStamp (datetime): When the transcription was completed
-            - sender (str): Always "user" for transcribed audio
+        Message: The transcribed text from the "user", timestamped when the stream was established
 
     Raises:
         Exception: If there are errors during transcription or audio processing
@@ -40,10 +42,7 @@ async def transcribe_audio(
     logger = logging.getLogger("convo.transcription")
     logger.info("Starting new transcription session")
 
-    transcription = {"message": "", "timeStamp": None, "sender": "user"}
-
-    # lock to prevent concurrent dictionary access
-    lock = asyncio.Lock()
+    segments: list[str] = []
 
     project_id = "convo-wtf"
 
@@ -123,7 +122,7 @@ async def transcribe_audio(
                 buffer.extend(chunk)
 
                 if len(buffer) >= target_size:
-                    logger.debug(f"Sending buffered chunk (size: {len(buffer)})")
+                    logger.debug("Sending buffered chunk (size: %d)", len(buffer))
                     # debug_file.write(bytes(buffer))
                     yield cloud_speech_types.StreamingRecognizeRequest(
                         audio=bytes(buffer)
@@ -146,16 +145,16 @@ async def transcribe_audio(
     responses_iterator = await responses_stream
 
     # record the time of transcription
-    transcription["timeStamp"] = datetime.datetime.now()
+    timestamp = datetime.datetime.now()
 
     try:
         async for response in responses_iterator:
-            logger.debug(f"Got response: {response}")
+            logger.debug("Got response: %s", response)
             for result in response.results:
                 if result.is_final and result.alternatives:
-                    transcript = result.alternatives[0].transcript
-                    async with lock:
-                        transcription["message"] += transcript
+                    segments.append(result.alternatives[0].transcript)
+                    if on_segment:
+                        on_segment("".join(segments))
 
     except Exception as e:
         print(f"Error in transcription: {str(e)}")
@@ -164,6 +163,8 @@ async def transcribe_audio(
     finally:
         print(f"Transcription completed")
 
+    transcription = Message("".join(segments), "user", timestamp)
+
     # cache transcription
     await cache_message(transcription)
     logger.info(f"Transcription: {transcription}")
@@ -7,9 +7,16 @@ import base64
 import logging
 from convo_backend.config import Config
 from convo_backend.utils.latency import LatencyLog
+from convo_backend.utils.metrics import REGISTRY
 
 latency_log = LatencyLog()
 
+TTS_RECONNECTS = REGISTRY.counter(
+    "convo_tts_reconnects",
+    "Reconnects to the ElevenLabs websocket",
+    ("reason",),
+)
+
 
 class TTSStream:
     """
@@ -163,6 +170,7 @@ class TTSStream:
                 except websockets.exceptions.ConnectionClosedError as e:
                     self.logger.warning(f"Connection closed during TTS streaming: {e}")
                     # Attempt to reconnect
+                    TTS_RECONNECTS.labels("streaming").inc()
                     try:
                         await self.connect_to_tts_server()
                         continue
@@ -199,13 +207,13 @@ class TTSStream:
                 text_buffer += chunk
                 if len(text_buffer) >= min_chunk_size:
                     await self.socket_connection.send(json.dumps({"text": text_buffer}))
-                    self.logger.debug(f"Sent text chunk: {text_buffer}")
+                    self.logger.debug("Sent text chunk: %s", text_buffer)
                     text_buffer = ""
 
             # Send any remaining text and signal end of stream
             if text_buffer:
                 await self.socket_connection.send(json.dumps({"text": text_buffer}))
-                self.logger.debug(f"Sent final text chunk: {text_buffer}")
+                self.logger.debug("Sent final text chunk: %s", text_buffer)
 
             # Signal end of stream
             await self.socket_connection.send(json.dumps({"text": " ", "flush": True}))
@@ -285,6 +293,7 @@ class TTSStream:
             except websockets.exceptions.ConnectionClosedError as e:
                 self.logger.warning(f"Connection closed during keep-alive: {e}")
                 # Attempt to reconnect
+                TTS_RECONNECTS.labels("keep_alive").inc()
                 try:
                     await self.connect_to_tts_server()
                     continue
@@ -316,6 +325,7 @@ class TTSStream:
             self.logger.warning(f"Connection closed while draining messages: {e}")
             self.chunks_incoming = False
             # Attempt to reconnect
+            TTS_RECONNECTS.labels("drain").inc()
             try:
                 await self.connect_to_tts_server()
             except Exception as e:
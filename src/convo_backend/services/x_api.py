@@ -1,54 +1,77 @@
-import requests
+import httpx
 import os
+from typing import Optional
 
 from dotenv import load_dotenv
 
 load_dotenv()
 
+X_API_BASE_URL = "https://api.x.com/2"
+SPACES_SEARCH_PARAMS = {
+    "state": "live",
+    "expansions": "host_ids,speaker_ids,topic_ids",
+    "space.fields": "lang,title,participant_count",
+    "user.fields": "public_metrics",
+}
 
-async def get_x_spaces(query: str):
-    url = f"https://api.x.com/2/spaces/search?query={query}&state=live&expansions=host_ids,speaker_ids,topic_ids&space.fields=lang"
-    headers = {"Authorization": f"Bearer {os.environ['X_API_BEARER_TOKEN']}"}
-    response = requests.get(url, headers=headers)
-    return response.json()
+
+async def search_x_spaces(
+    client: httpx.AsyncClient, query: str, base_url: str = X_API_BASE_URL
+) -> httpx.Response:
+    """
+    Search live Spaces, returning the raw response so callers can read rate-limit headers.
+
+    Args:
+        client (httpx.AsyncClient): Client to send the request with
+        query (str): Search terms
+        base_url (str): X API base URL
+    """
+    return await client.get(
+        f"{base_url}/spaces/search",
+        params={"query": query, **SPACES_SEARCH_PARAMS},
+        headers={"Authorization": f"Bearer {os.environ['X_API_BEARER_TOKEN']}"},
+    )
+
+
+async def get_x_spaces(query: str, client: Optional[httpx.AsyncClient] = None) -> dict:
+    """Search live Spaces and return the decoded response, using a one-off client if none is given."""
+    if client is not None:
+        return (await search_x_spaces(client, query)).json()
+    async with httpx.AsyncClient() as client:
+        return (await search_x_spaces(client, query)).json()
 
 
 def parse_x_spaces(api_response: dict, only_english: bool = True):
-    api_response = api_response.copy()
-    parsed_spaces = []
+    """
+    Resolve each Space's host, speaker and topic ids against the response's includes.
+
+    Users and topics are indexed by id first, so parsing is O(spaces + users) rather than
+    scanning every user for every Space.
+    """
     if not api_response.get("data"):
         return []
+    includes = api_response.get("includes", {})
+    users = {user["id"]: user for user in includes.get("users", ())}
+    topics = {topic["id"]: topic for topic in includes.get("topics", ())}
+
+    parsed_spaces = []
     for space in api_response["data"]:
-        if only_english and space["lang"] != "en":
+        if only_english and space.get("lang") != "en":
             continue
-        parsed_space = {}
-        # parse user info
-        parsed_space["speakers"] = []
-        parsed_space["hosts"] = []
-        for user in api_response["includes"]["users"]:
-            if space.get("speaker_ids") and user["id"] in space["speaker_ids"]:
-                parsed_space["speakers"].append(user)
-            if user["id"] in space["host_ids"]:
-                parsed_space["hosts"].append(user)
-
-        # parse topic info
-        parsed_space["topics"] = []
-        for topic in api_response["includes"].get("topics", []):
-            if space.get("topic_ids") and topic["id"] in space["topic_ids"]:
-                parsed_space["topics"].append(topic)
-
-        parsed_space["space_id"] = space["id"]
-        parsed_spaces.append(parsed_space)
+        parsed_spaces.append(
+            {
+                "speakers": [users[i] for i in space.get("speaker_ids", ()) if i in users],
+                "hosts": [users[i] for i in space.get("host_ids", ()) if i in users],
+                "topics": [topics[i] for i in space.get("topic_ids", ()) if i in topics],
+                "space_id": space["id"],
+                "title": space.get("title", ""),
+                "participant_count": space.get("participant_count", 0),
+                "lang": space.get("lang"),
+            }
+        )
 
     return parsed_spaces
 
 
-def get_space_by_id(spaces: list, space_id: str):
-    for space in spaces:
-        if space["space_id"] == space_id:
-            return space
-    return None
-
-
 def construct_x_api_url(space_id: str):
     return f"https://x.com/i/spaces/{space_id}"
@@ -2,41 +2,147 @@ from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 import logging
-from typing import Optional
+from typing import Callable, Optional
+import numpy as np
 import asyncio
+import json
 import os
-from convo_backend.services.x_api import get_x_spaces, parse_x_spaces
-import random
+import time
+from convo_backend.services.space_discovery import SpaceDiscovery
+from convo_backend.services.space_ranker import SpaceRanker
 from langchain_core.tools import tool
-from selenium.common.exceptions import StaleElementReferenceException
 from langchain.tools import StructuredTool
 from convo_backend.services.chat import ChatService
+from convo_backend.services.messages_cache import set_cache_space
 from selenium.common.exceptions import TimeoutException
 from convo_backend.config import Config
+from convo_backend.utils.metrics import REGISTRY
+from convo_backend.utils.webdriver_executor import WebDriverExecutor
+from convo_backend.utils.startup import StartupSpan, startup_timeline
+from convo_backend.services.browser_profile import EncryptedBrowserProfile
+
+ROAMING_JOINS = REGISTRY.counter(
+    "convo_roaming_joins",
+    "Spaces joined and unmuted in successfully",
+)
+ROAMING_FAILURES = REGISTRY.counter(
+    "convo_roaming_failures",
+    "Failed attempts to join or speak in a space",
+    ("stage",),
+)
+TIME_TO_FIRST_JOIN = REGISTRY.gauge(
+    "convo_roaming_time_to_first_join_seconds",
+    "Seconds from starting the browser to the first Space joined and unmuted in",
+    ("profile",),
+)
+MUTE_STATE_LAG = REGISTRY.histogram(
+    "convo_mute_state_lag_seconds",
+    "Time from a mute button change in the page to the roamer seeing it",
+    ("source",),
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+
+# Installs a MutationObserver on the Space page (once per page) that records every change
+# of the microphone button with a timestamp, then drains the recorded changes. Changes are
+# also logged to the console, so they are pushed to us when BiDi console events are on.
+MUTE_OBSERVER_JS = """
+const selector = "button[aria-label='Mute'], button[aria-label='Unmute'], "
+    + "[data-testid='audioSpaceToolbarMicrophoneButton']";
+let tracker = window.__convoMute;
+if (!tracker) {
+    const read = () => {
+        const button = document.querySelector(selector);
+        return {
+            present: Boolean(button),
+            label: button ? button.getAttribute("aria-label") : null,
+            disabled: button ? button.getAttribute("aria-disabled") : null,
+            t: Date.now(),
+        };
+    };
+    tracker = window.__convoMute = {state: read(), events: []};
+    tracker.events.push(tracker.state);
+    new MutationObserver(() => {
+        const state = read();
+        const last = tracker.state;
+        if (state.present === last.present && state.label === last.label
+                && state.disabled === last.disabled) {
+            return;
+        }
+        tracker.state = state;
+        tracker.events.push(state);
+        if (tracker.events.length > 100) tracker.events.shift();
+        console.debug("convo:mute " + JSON.stringify(state));
+    }).observe(document.documentElement, {
+        subtree: true,
+        childList: true,
+        attributes: true,
+        attributeFilter: ["aria-label", "aria-disabled"],
+    });
+}
+return {state: tracker.state, events: tracker.events.splice(0)};
+"""
+MUTE_CONSOLE_PREFIX = "convo:mute "
+
+UNMUTE_XPATH = "//button[@aria-label='Unmute']"
+MIC_BUTTON_XPATH = (
+    "//button[@aria-label='Mute' or @aria-label='Unmute']"
+    " | //*[@data-testid='audioSpaceToolbarMicrophoneButton']"
+)
 
 class ConvoRoamer:
     """
     Handles browser automation for X (Twitter) spaces interaction using Selenium.
     """
 
-    def __init__(self, desired_spaces: Optional[list[str]] = None):
-        """Initialize browser automation components and configuration."""
+    def __init__(
+        self,
+        desired_spaces: Optional[list[str]] = None,
+        chat_service: Optional[ChatService] = None,
+        embed: Optional[Callable[[list[str]], np.ndarray]] = None,
+    ):
+        """
+        Initialize browser automation components and configuration.
+
+        Args:
+            desired_spaces (list[str], optional): Space ids or URLs to visit instead of roaming
+            chat_service (ChatService, optional): Shared chat service, created if not given
+            embed (Callable, optional): Batch text embedding function used to rank Spaces
+                by similarity to the persona
+        """
         self.browser_logger = logging.getLogger("convo.roaming")
         self.driver = None
+        # Every driver call goes through this single dedicated thread
+        self.webdriver = WebDriverExecutor()
+        self.profile: Optional[EncryptedBrowserProfile] = None
+        self.first_join_span: Optional[StartupSpan] = None
         self.logged_in = False
         self.current_space_id: Optional[str] = None
-        self.joined_spaces: list[str] = []
         self.roaming_interval = Config.BEHAVIORAL_CONFIG.get("spaces_interval")
         self.is_roaming = False
         self.topics = Config.BEHAVIORAL_CONFIG.get("spaces_keywords")
+        self.discovery = SpaceDiscovery(self.topics)
+        self.catalog = self.discovery.catalog  # Joined and failed Spaces
+        self.discovery_backoff = Config.SPACE_DISCOVERY_BACKOFF
         self.desired_spaces = self.parse_spaces(desired_spaces)
         self.is_muted = True
         self.sync_mute_task: asyncio.Task | None = None
+        self.mute_observer = Config.MUTE_TRACKING == "observer"
+        self.bidi_mute_events = False  # True once console events are pushed over BiDi
+        self.mute_button_missing_since: Optional[float] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
         self.roaming_task = None
-        self.chat_service = ChatService()
+        # Share the caller's chat service rather than building a second set of LLM clients
+        self.chat_service = chat_service or ChatService()
+        with open(Config.DEFAULT_PROMPT_PATH, "r", encoding="utf-8") as file:
+            persona = file.read()
+        self.ranker = SpaceRanker(
+            self.topics,
+            self.catalog,
+            tie_break=self.chat_service.choose_x_space,
+            embed=embed,
+            persona=persona,
+        )
 
     def parse_spaces(self, spaces: list[dict]) -> list[str]:
         """Parse the spaces into a list of space IDs if not already IDs"""
@@ -53,6 +159,7 @@ class ConvoRoamer:
         """Initialize and start Chrome session with necessary permissions."""
         try:
             self.browser_logger.info("Initializing Chrome session...")
+            self.first_join_span = startup_timeline.begin("first join")
 
             chrome_options = Options()
             chrome_options.add_argument("--disable-blink-features=AutomationControlled")
@@ -63,16 +170,39 @@ class ConvoRoamer:
             chrome_options.add_argument("--disable-extensions")
             chrome_options.add_argument("--disable-background-networking")
             chrome_options.add_argument("--log-level=3")
+            if self.mute_observer:
+                # WebDriver BiDi, so mute changes logged by the page observer are pushed to us
+                chrome_options.enable_bidi = True
+            if Config.BROWSER_PERSISTENT_PROFILE:
+                try:
+                    self.profile = EncryptedBrowserProfile()
+                    profile_directory = await asyncio.to_thread(self.profile.open)
+                    chrome_options.add_argument(f"--user-data-dir={profile_directory}")
+                except ValueError as e:
+                    self.profile = None
+                    self.browser_logger.warning(f"Persistent browser profile disabled: {e}")
+            if Config.BROWSER_TRIM_RESOURCES:
+                chrome_options.add_experimental_option(
+                    "prefs", {"profile.managed_default_content_settings.images": 2}
+                )
 
-            self.driver = await asyncio.to_thread(
-                webdriver.Chrome, options=chrome_options
+            self.driver = await self.webdriver.run(
+                "start", webdriver.Chrome, options=chrome_options
             )
+            self.webdriver.driver = self.driver
 
             # Set window size
-            self.driver.set_window_size(1280, 720)
+            await self.webdriver.run("set_window_size", self.driver.set_window_size, 1280, 720)
 
             # Set implicit wait time
-            self.driver.implicitly_wait(0.1)
+            await self.webdriver.run("implicitly_wait", self.driver.implicitly_wait, 0.1)
+
+            if Config.BROWSER_TRIM_RESOURCES:
+                await self.webdriver.run("block_urls", self._block_urls)
+
+            self.loop = asyncio.get_running_loop()
+            if self.mute_observer:
+                await self._subscribe_mute_events()
 
             self.browser_logger.info("Chrome session started successfully")
 
@@ -83,43 +213,71 @@ class ConvoRoamer:
             await self.stop()
             raise
 
+    def _block_urls(self):
+        # Images and video only, Space audio is streamed from other hosts
+        self.driver.execute_cdp_cmd("Network.enable", {})
+        self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": Config.BROWSER_BLOCKED_URLS})
+
+    async def is_logged_in(self) -> bool:
+        """Check for an X session cookie, which only a restored browser profile can have."""
+        if self.profile is None:
+            return False
+
+        def has_session_cookie() -> bool:
+            # Cookies can only be read on their domain, robots.txt is the cheapest page there
+            self.driver.get("https://x.com/robots.txt")
+            return self.driver.get_cookie("auth_token") is not None
+
+        try:
+            logged_in = await self.webdriver.run("login_check", has_session_cookie)
+        except Exception as e:
+            self.browser_logger.warning(f"Login check failed: {e}")
+            return False
+        self.browser_logger.info(
+            "Restored X session from browser profile" if logged_in else "Saved X session expired"
+        )
+        return logged_in
+
+    def _record_first_join(self):
+        if self.first_join_span is None:
+            return
+        startup_timeline.end(self.first_join_span)
+        elapsed = self.first_join_span.duration
+        TIME_TO_FIRST_JOIN.labels("persistent" if self.profile else "fresh").set(elapsed)
+        self.browser_logger.info(f"First Space joined {elapsed:.1f}s after starting the browser")
+        self.first_join_span = None
+
     async def login_to_x(self):
         """Login to X using Chrome."""
         try:
             username = os.environ["X_USERNAME"]
             password = os.environ["X_PASSWORD"]
 
-            await asyncio.to_thread(self.driver.get, "https://x.com/i/flow/login")
+            await self.webdriver.run("get", self.driver.get, "https://x.com/i/flow/login")
 
-            # Wait for and fill username
-            username_input = await asyncio.to_thread(
-                WebDriverWait(self.driver, 10).until,
-                EC.presence_of_element_located((By.NAME, "text")),
+            # Wait for and fill username (typed through WebDriver so the page sees real key events)
+            await self.webdriver.wait_for("//input[@name='text']", 10)
+            await self.webdriver.run(
+                "send_keys",
+                lambda: self.driver.find_element(By.NAME, "text").send_keys(username),
             )
-            await asyncio.to_thread(username_input.send_keys, username)
 
             # Click next
-            next_button = self.driver.find_element(
-                By.XPATH, "//span[text()='Next']/ancestor::button"
-            )
-            await asyncio.to_thread(next_button.click)
+            await self.webdriver.wait_for("//span[text()='Next']/ancestor::button", 10, click=True)
 
             await asyncio.sleep(1)
 
             # Fill password
-            password_input = await asyncio.to_thread(
-                WebDriverWait(self.driver, 10).until,
-                EC.presence_of_element_located((By.NAME, "password")),
+            await self.webdriver.wait_for("//input[@name='password']", 10)
+            await self.webdriver.run(
+                "send_keys",
+                lambda: self.driver.find_element(By.NAME, "password").send_keys(password),
             )
-            await asyncio.to_thread(password_input.send_keys, password)
 
             await asyncio.sleep(1)
 
             # Click login
-            login_button = self.driver.find_element(
-                By.XPATH, "//span[text()='Log in']/ancestor::button"
-            )
-            await asyncio.to_thread(login_button.click)
+            await self.webdriver.wait_for("//span[text()='Log in']/ancestor::button", 10, click=True)
 
             self.logged_in = True
             await asyncio.sleep(1)
@@ -132,92 +290,65 @@ class ConvoRoamer:
         """Join a specific X space."""
         try:
             url = f"https://x.com/i/spaces/{space_id}"
-            await asyncio.to_thread(self.driver.get, url)
+            await self.webdriver.run("get", self.driver.get, url)
             self.current_space_id = space_id
+            set_cache_space(space_id)
             self.browser_logger.info(f"Joined space {url}")
 
             # Wait for and click start listening button
-            start_button = await asyncio.to_thread(
-                WebDriverWait(self.driver, 10).until,
-                EC.presence_of_element_located(
-                    (By.XPATH, "//span[text()='Start listening']/ancestor::button")
-                ),
+            await self.webdriver.wait_for(
+                "//span[text()='Start listening']/ancestor::button", 10, click=True
             )
-            await asyncio.to_thread(start_button.click)
 
             if not auto_ask_to_speak:
                 return True
 
             # Click ask to speak
-            ask_to_speak_button = await asyncio.to_thread(
-                WebDriverWait(self.driver, 10).until,
-                EC.presence_of_element_located(
-                    (By.XPATH, "//button[@aria-label='Request to speak']")
-                ),
+            await self.webdriver.wait_for(
+                "//button[@aria-label='Request to speak']", 10, click=True
             )
-            await asyncio.to_thread(ask_to_speak_button.click)
             await asyncio.sleep(6)
 
             try:
                 self.browser_logger.debug("Waiting for speaking permission...")
-                wait = WebDriverWait(
-                    self.driver,
-                    self.TOLERANCE,
-                    ignored_exceptions=[StaleElementReferenceException],
-                )
-                # Wait for unmute button to be present AND visible
-                await asyncio.to_thread(
-                    wait.until,
-                    EC.element_to_be_clickable(
-                        (By.XPATH, "//button[@aria-label='Unmute']")
-                    )
-                    and EC.visibility_of_element_located(
-                        (By.XPATH, "//button[@aria-label='Unmute']")
-                    ),
-                )
-                # Try to find again to ensure element isn't stale
-                unmute_button = await asyncio.to_thread(
-                    wait.until,
-                    EC.element_to_be_clickable(
-                        (By.XPATH, "//button[@aria-label='Unmute']")
-                    )
-                    and EC.visibility_of_element_located(
-                        (By.XPATH, "//button[@aria-label='Unmute']")
-                    ),
-                )
+                # Wait for unmute button to be present, visible and enabled
+                await self.webdriver.wait_for(UNMUTE_XPATH, self.TOLERANCE, clickable=True)
                 await asyncio.sleep(2)  # Small delay to ensure UI is stable
-                await asyncio.to_thread(unmute_button.click)
-                self.browser_logger.info(f"Button clicked: {unmute_button}")
+                # Looked up again in the same call as the click, so it can't be stale
+                button_state = await self.webdriver.wait_for(UNMUTE_XPATH, 10, click=True)
+                self.browser_logger.info(f"Button clicked: {button_state}")
                 self.browser_logger.info("Unmuted successfully")
+                ROAMING_JOINS.inc()
+                self._record_first_join()
                 self.is_muted = False
                 # Start a task to sync the mute state with the current UI state - cancel pre-existing task if it exists
                 if self.sync_mute_task:
                     self.sync_mute_task.cancel()
+                self.mute_button_missing_since = None
                 self.sync_mute_task = asyncio.create_task(self.sync_mute_state())
                 return True
 
             except Exception as e:
                 self.browser_logger.warning(f"Failed to unmute: {e}", exc_info=True)
+                ROAMING_FAILURES.labels("unmute").inc()
                 return False
 
         except Exception as e:
             self.browser_logger.error(
                 f"Failed to join space {space_id}: {e}", exc_info=True
             )
+            ROAMING_FAILURES.labels("join").inc()
             return False
 
     async def leave_space(self):
         """Leave the current space if joined."""
         if self.current_space_id:
             try:
-                leave_button = await asyncio.to_thread(
-                    WebDriverWait(self.driver, 10).until,
-                    EC.presence_of_element_located(
-                        (By.XPATH, "//span[text()='Leave']/ancestor::button")
-                    ),
+                await self.webdriver.wait_for(
+                    "//span[text()='Leave']/ancestor::button", 10, click=True
                 )
-                await asyncio.to_thread(leave_button.click)
                 self.current_space_id = None
+                set_cache_space(None)
                 self.browser_logger.info("Left space successfully")
                 # Cancel the mute state sync task
                 if self.sync_mute_task:
@@ -236,17 +367,21 @@ class ConvoRoamer:
     async def _run_roaming(self):
         """Run the roaming process."""
         if not self.logged_in:
-            await self.login_to_x()
+            if await self.is_logged_in():
+                self.logged_in = True
+            else:
+                await self.login_to_x()
         self.is_roaming = True
         while self.is_roaming:
             try:
                 if self.desired_spaces:  # if desired spaces are set, join them
                     for space in self.desired_spaces:
                         if await self.join_space(space):
-                            self.joined_spaces.append(space)
+                            self.catalog.mark_joined(space)
                             await asyncio.sleep(self.roaming_interval)
                             await self.leave_space()
                         else:
+                            self.catalog.mark_failed(space)
                             self.browser_logger.info(
                                 "Failed to unmute, moving to next space"
                             )
@@ -254,31 +389,31 @@ class ConvoRoamer:
                             continue
                     self.browser_logger.info("All desired spaces have been visited")
                     await self.stop_roaming()
-                else:  # if desired spaces are not set, roam through random topics
-                    topic = random.choice(self.topics)
-                    api_response = await get_x_spaces(topic)
-                    parsed_spaces = parse_x_spaces(api_response)
+                else:  # if desired spaces are not set, roam through spaces found for all topics
+                    self.catalog.clear_history(Config.SPACE_JOIN_HISTORY_TTL)
+                    parsed_spaces = await self.discovery.discover()
                     if not parsed_spaces:
                         self.browser_logger.warning(
-                            f"No spaces found for topic: {topic}"
+                            f"No new spaces found, searching again in {self.discovery_backoff:.0f}s"
+                        )
+                        await asyncio.sleep(self.discovery_backoff)
+                        self.discovery_backoff = min(
+                            self.discovery_backoff * 2, Config.SPACE_DISCOVERY_BACKOFF_MAX
                         )
                         continue
-                    parsed_spaces = [
-                        space
-                        for space in parsed_spaces
-                        if space["space_id"] not in self.joined_spaces
-                    ]
-                    space_id = await self.chat_service.choose_x_space(parsed_spaces)
+                    self.discovery_backoff = Config.SPACE_DISCOVERY_BACKOFF
+                    space_id = await self.ranker.choose(parsed_spaces)
 
                     # If join_space fails to unmute, move to next space immediately
                     if not await self.join_space(space_id):
+                        self.catalog.mark_failed(space_id)
                         self.browser_logger.info(
                             "Failed to unmute, moving to next space"
                         )
                         await self.leave_space()
                         continue
 
-                    self.joined_spaces.append(space_id)
+                    self.catalog.mark_joined(space_id)
                     await asyncio.sleep(self.roaming_interval)
                     await self.leave_space()
             except Exception as e:
@@ -311,6 +446,16 @@ class ConvoRoamer:
 
     async def sync_mute_state(self):
         """Sync the mute state with the current UI state in the space."""
+        if self.mute_observer:
+            # Changes are pushed over BiDi, so only check in occasionally; otherwise poll
+            # the observer's change log, which is a single execute_script per check
+            interval = (
+                Config.MUTE_OBSERVER_HEARTBEAT
+                if self.bidi_mute_events
+                else Config.MUTE_OBSERVER_POLL_INTERVAL
+            )
+        else:
+            interval = 1
         while True:
             try:
                 await self.mute_status_update()
@@ -318,36 +463,19 @@ class ConvoRoamer:
                 # TimeoutException or other errors
                 self.browser_logger.warning(f"Error in sync_mute_state: {e}", exc_info=True)
 
-            self.browser_logger.debug(f"Mute state: {self.is_muted}")
-            await asyncio.sleep(1)
+            self.browser_logger.debug("Mute state: %s", self.is_muted)
+            await asyncio.sleep(interval)
 
     async def mute_status_update(self):
         """Update the current mute status by checking the UI state."""
+        if self.mute_observer:
+            await self._read_mute_observer()
+            return
         try:
-            # Main Option
-            try:
-                button = await asyncio.to_thread(
-                    WebDriverWait(self.driver, 2).until,
-                    EC.presence_of_element_located(
-                        (By.XPATH, "//button[@aria-label='Mute' or @aria-label='Unmute']")
-                    )
-                )
-            # Fallback Option
-            except:
-                # Fallback to data-testid if aria-label approach fails
-                button = await asyncio.to_thread(
-                    WebDriverWait(self.driver, 2).until,
-                    EC.presence_of_element_located(
-                        (By.CSS_SELECTOR, '[data-testid="audioSpaceToolbarMicrophoneButton"]')
-                    )
-                )
-            
-            button_state = {
-                'aria-label': button.get_attribute("aria-label"),
-                'aria-disabled': button.get_attribute("aria-disabled"),
-                'class': button.get_attribute("class")
-            }
-            self.is_muted = button_state['aria-label'] == "Unmute"
+            # Mute/Unmute button, or the toolbar microphone button by data-testid,
+            # looked up and read in one call
+            button_state = await self.webdriver.wait_for(MIC_BUTTON_XPATH, 4)
+            self.is_muted = button_state["label"] == "Unmute"
             
             # Log detailed state information
             self.browser_logger.debug("=== Mute Status Debug Info ===")
@@ -356,20 +484,81 @@ class ConvoRoamer:
             self.browser_logger.debug("===========================")
 
         except TimeoutException:
-            #NOTE: This may not be the best solution
-            #Mute button most likely no longer exists
-            if not self.desired_spaces:
-                #If we are randomly roaming, convo was probably taken off the panel, or the space ended
-                # Therefore, we leave, stop the roaming, and proceed with roaming again
-                await self.leave_space()
-                await self.stop_roaming()
-                await self.run_roaming()
-            else:
-                pass
+            await self._handle_mute_button_missing()
         except Exception as e:
             self.browser_logger.error(f"Error updating current mute state: {e}", exc_info=True)
             self.is_muted = True  # Default to muted on error
 
+    async def _handle_mute_button_missing(self):
+        #NOTE: This may not be the best solution
+        #Mute button most likely no longer exists
+        if not self.desired_spaces:
+            #If we are randomly roaming, convo was probably taken off the panel, or the space ended
+            # Therefore, we leave, stop the roaming, and proceed with roaming again
+            await self.leave_space()
+            await self.stop_roaming()
+            await self.run_roaming()
+
+    async def _subscribe_mute_events(self):
+        """Receive the page observer's console messages over BiDi, if the driver supports it."""
+        try:
+            await self.webdriver.run(
+                "bidi_subscribe",
+                lambda: self.driver.script.add_console_message_handler(self._on_console_message),
+            )
+            self.bidi_mute_events = True
+            self.browser_logger.info("Mute changes are pushed over WebDriver BiDi")
+        except Exception as e:
+            self.browser_logger.info(f"WebDriver BiDi unavailable, polling the mute observer: {e}")
+
+    def _on_console_message(self, entry):
+        # Called on the BiDi websocket thread
+        text = getattr(entry, "text", "") or ""
+        if not text.startswith(MUTE_CONSOLE_PREFIX) or self.loop is None:
+            return
+        try:
+            state = json.loads(text[len(MUTE_CONSOLE_PREFIX):])
+        except ValueError:
+            state = None
+        if not isinstance(state, dict) or not {"present", "t"} <= state.keys():
+            # Never raise into the driver's listener, the next poll catches up anyway
+            self.browser_logger.debug("Ignoring malformed mute observer message: %r", text)
+            return
+        self.loop.call_soon_threadsafe(self._apply_mute_state, state, "bidi")
+
+    async def _read_mute_observer(self):
+        """Install the page observer if needed and apply the changes it recorded, in one call."""
+        try:
+            result = await self.webdriver.script("mute_observer", MUTE_OBSERVER_JS)
+        except Exception as e:
+            self.browser_logger.error(f"Error updating current mute state: {e}", exc_info=True)
+            self.is_muted = True  # Default to muted on error
+            return
+        # Changes pushed over BiDi were already applied as they happened
+        if not self.bidi_mute_events:
+            for state in result["events"]:
+                self._apply_mute_state(state, "poll")
+        self._apply_mute_state(result["state"])
+
+        if (
+            self.mute_button_missing_since is not None
+            and time.monotonic() - self.mute_button_missing_since
+            >= Config.MUTE_BUTTON_MISSING_GRACE
+        ):
+            self.mute_button_missing_since = None
+            await self._handle_mute_button_missing()
+
+    def _apply_mute_state(self, state: dict, source: Optional[str] = None):
+        """Apply a mute button state recorded by the page observer."""
+        if source:
+            MUTE_STATE_LAG.labels(source).observe(max(0.0, time.time() - state["t"] / 1000))
+        if state["present"]:
+            self.mute_button_missing_since = None
+            self.is_muted = state["label"] == "Unmute"
+            self.browser_logger.debug("Button state: %s", state)
+        elif self.mute_button_missing_since is None:
+            self.mute_button_missing_since = time.monotonic()
+
 
     async def toggle_mute(self, mute: bool):
         """Toggle mute on the current space."""
@@ -389,26 +578,17 @@ class ConvoRoamer:
                     return
                 # Find expectted label
                 expected_label = "Unmute" if self.is_muted else "Mute"
-                button = await asyncio.to_thread(
-                    WebDriverWait(self.driver, 10).until,
-                    EC.element_to_be_clickable((By.XPATH, f"//button[@aria-label='{expected_label}']"))
-                )
-                button_state = {
-                    'aria-label': button.get_attribute("aria-label"),
-                    'aria-disabled': button.get_attribute("aria-disabled"),
-                    'class': button.get_attribute("class")
-                }
+                button_xpath = f"//button[@aria-label='{expected_label}']"
+                button_state = await self.webdriver.wait_for(button_xpath, 10)
                 self.browser_logger.debug(f"Button state before click: {button_state}")
             
                 # Check to see if button enabled or disabled
-                if button.get_attribute("aria-disabled") in ("true", "1"):
+                if button_state["disabled"]:
                     self.browser_logger.info("Microphone button is disabled. May be forcibly muted by host.")
                     return
                 
                 # Button Click
-                await asyncio.to_thread(
-                    button.click
-                )
+                await self.webdriver.wait_for(button_xpath, 10, click=True)
                 # Wait for state change with timeout
                 async def wait_for_state_change():
                     start_time = asyncio.get_event_loop().time()
@@ -444,8 +624,18 @@ class ConvoRoamer:
             except asyncio.CancelledError:
                 self.browser_logger.info("sync_mute_state task canceled during stop.")
             self.sync_mute_task = None
-        if self.driver:
-            await asyncio.to_thread(self.driver.quit)
+        self.is_roaming = False
+        if self.roaming_task:
+            self.roaming_task.cancel()
+        try:
+            await self.discovery.close()
+            if self.driver:
+                await self.webdriver.run("quit", self.driver.quit)
+        finally:
+            self.webdriver.shutdown()
+            if self.profile:
+                # Chrome has quit, so the profile can be encrypted and the plaintext removed
+                await asyncio.to_thread(self.profile.close)
         self.browser_logger.info("Browser session closed")
 
     
\ No newline at end of file
@@ -1,15 +1,16 @@
 import logging
 from datetime import datetime
+from convo_backend.models.message import Message
 
 
-async def transcribe_audio(audio_queue):
+async def transcribe_audio(audio_queue, on_segment=None):
     logger = logging.getLogger("convo.transcription")
     logger.info("Starting fake transcription")
-    transcription = {
-        "message": "This is a really fucking long transcription test that should be a lot longer than the other one. In fact, it is so long, that I can't even be bothered to write it out. I'm just going to leave it here and hope that it works. This is for testing interruptions.",
-        "timeStamp": datetime.now(),
-        "sender": "user",
-    }
+    transcription = Message(
+        "This is a really fucking long transcription test that should be a lot longer than the other one. In fact, it is so long, that I can't even be bothered to write it out. I'm just going to leave it here and hope that it works. This is for testing interruptions.",
+        "user",
+        datetime.now(),
+    )
     while True:
         chunk = await audio_queue.get()
         if chunk is None:
@@ -1,6 +1,5 @@
 import wave
 import numpy as np
-from pydub import AudioSegment
 import numpy as np
 import io
 import os
@@ -85,6 +84,8 @@ def mp3_to_float32_chunks(mp3_bytes, chunk_size) -> list[np.ndarray]:
     """
     try:
         # Load audio with explicit parameters
+        from pydub import AudioSegment  # Only needed for mp3 input
+
         audio = AudioSegment.from_mp3(io.BytesIO(mp3_bytes))
 
         # Debug info
@@ -1,5 +1,6 @@
 from time import time
 import logging
+from convo_backend.utils.metrics import STAGE_LATENCY
 
 logger = logging.getLogger("convo.latency")
 
@@ -20,6 +21,7 @@ class LatencyLog:
         if not hasattr(self, "latency_logs"):
             self.latency_logs = {}
             self.start_times = {}  # Add storage for start times
+            self.end_to_end_logs = {}
 
     def track_latency(
         self,
@@ -59,6 +61,7 @@ class LatencyLog:
                             logger.info(
                                 f"Latency for {name}: {self.latency_logs[name]}s"
                             )
+                            STAGE_LATENCY.labels(name).observe(self.latency_logs[name])
                             first_item = False
                         else:
                             yield item
@@ -79,6 +82,7 @@ class LatencyLog:
                             add_latency_from_name
                         ]
                     logger.info(f"Latency for {name}: {self.latency_logs[name]}s")
+                    STAGE_LATENCY.labels(name).observe(self.latency_logs[name])
                     return result
 
             return wrapper
@@ -103,8 +107,19 @@ class LatencyLog:
             del self.start_times[name]
 
             logger.info(f"Latency for {name}: {self.latency_logs[name]}s")
+            STAGE_LATENCY.labels(name).observe(self.latency_logs[name])
+
+    def log_end_to_end_latency(self, name: str, latency: float):
+        """Log an end-to-end latency measured outside of the tracked stages.
+
+        Kept apart from latency_logs so it isn't double counted in the total.
+        """
+        self.end_to_end_logs[name] = latency
+        logger.info(f"Latency for {name}: {latency}s")
+        STAGE_LATENCY.labels(name).observe(latency)
 
     def log_total_latency(self):
         """Log the total latency for all tracked operations"""
         total_latency = sum(self.latency_logs.values())
         logger.info(f"Total latency: {total_latency}s")
+        STAGE_LATENCY.labels("Total").observe(total_latency)
@@ -1,8 +1,16 @@
 import logging
+import logging.handlers
 from typing import Dict, Optional
 import argparse
+import atexit
+import queue
 import sys
 import os
+import threading
+from time import monotonic
+
+# Background listener doing formatting and I/O when async logging is enabled
+_queue_listener: Optional[logging.handlers.QueueListener] = None
 
 
 def add_logging_args(parser: argparse.ArgumentParser):
@@ -17,6 +25,17 @@ def add_logging_args(parser: argparse.ArgumentParser):
         default="INFO",
         help="Set the base logging level for all components",
     )
+    log_group.add_argument(
+        "--async-logging",
+        action="store_true",
+        help="Format and write log records on a background thread instead of the caller's",
+    )
+    log_group.add_argument(
+        "--log-rate-limit",
+        type=int,
+        default=0,
+        help="Max records per second for each repeated message (0 disables rate limiting)",
+    )
     log_group.add_argument(
         "--audio-log-level",
         choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
@@ -62,6 +81,113 @@ def add_logging_args(parser: argparse.ArgumentParser):
         choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
         help="Set logging level for roaming components",
     )
+    log_group.add_argument(
+        "--memory-log-level",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
+        help="Set logging level for memory components",
+    )
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Drops repeats of the same message beyond `rate` records per `period` seconds.
+
+    Records are grouped by logger name and call site, so per-chunk messages such as
+    "Sent text chunk: %s", or f-strings rendering differently every time, are limited as
+    one stream. The first record let through after a suppressed burst carries the number
+    dropped in its `suppressed` attribute, which SuppressedCountFormatter appends. Old
+    windows are swept every period, so the map only holds recently active call sites.
+    """
+
+    def __init__(self, rate: int, period: float = 1.0):
+        super().__init__()
+        self.rate = rate
+        self.period = period
+        # (logger name, path, line) -> [window start, records in window, suppressed]
+        self.windows: dict[tuple[str, str, int], list] = {}
+        self.last_sweep = monotonic()
+        self.lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING and record.exc_info:
+            return True  # Never drop tracebacks
+        key = (record.name, record.pathname, record.lineno)
+        now = monotonic()
+        with self.lock:
+            if now - self.last_sweep >= self.period:
+                self._sweep(now)
+            window = self.windows.get(key)
+            if window is None or now - window[0] >= self.period:
+                suppressed = window[2] if window else 0
+                self.windows[key] = [now, 1, 0]
+                if suppressed:
+                    record.suppressed = suppressed
+                return True
+            if window[1] < self.rate:
+                window[1] += 1
+                return True
+            window[2] += 1
+            return False
+
+    def _sweep(self, now: float):
+        """
+        Forget windows that ended over a period ago. Ones that ended more recently are kept
+        so the next record from an active call site still reports what was suppressed.
+        """
+        self.windows = {
+            key: window
+            for key, window in self.windows.items()
+            if now - window[0] < 2 * self.period
+        }
+        self.last_sweep = now
+
+
+class SuppressedCountFormatter(logging.Formatter):
+    """Formatter noting how many similar records RateLimitFilter dropped before this one."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        message = super().format(record)
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            message = f"{message} (suppressed {suppressed} similar messages)"
+        return message
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that enqueues the record untouched.
+
+    The stock QueueHandler formats the message on the calling thread so the record can
+    be pickled. Our queue never leaves the process, so formatting is left to the listener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class _FanOutHandler(logging.Handler):
+    """
+    Handler that passes each record on to several handlers.
+
+    Filters added to it run once per record, before the record reaches any of them.
+    """
+
+    def __init__(self, *handlers: logging.Handler):
+        super().__init__()
+        self.handlers = handlers
+
+    def emit(self, record: logging.LogRecord):
+        for handler in self.handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+
+def stop_logging():
+    """Flush and stop the background logging listener if one is running"""
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
 
 
 def setup_logging(args: argparse.Namespace) -> Dict[str, logging.Logger]:
@@ -83,7 +209,7 @@ def setup_logging(args: argparse.Namespace) -> Dict[str, logging.Logger]:
     log_file = getattr(args, 'log_file', default_log_file)
 
     # Create formatters and handlers
-    formatter = logging.Formatter(
+    formatter = SuppressedCountFormatter(
         "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     )
     
@@ -97,8 +223,32 @@ def setup_logging(args: argparse.Namespace) -> Dict[str, logging.Logger]:
     # Setup root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(base_level)
-    root_logger.addHandler(console_handler)
-    root_logger.addHandler(file_handler)
+
+    rate_limit = getattr(args, "log_rate_limit", 0)
+
+    if getattr(args, "async_logging", False):
+        global _queue_listener
+        stop_logging()
+        # Callers only enqueue; formatting and file/console I/O happen on the listener thread
+        log_queue = queue.SimpleQueue()
+        queue_handler = _DeferredQueueHandler(log_queue)
+        if rate_limit:
+            queue_handler.addFilter(RateLimitFilter(rate_limit))
+        root_logger.addHandler(queue_handler)
+        _queue_listener = logging.handlers.QueueListener(
+            log_queue, console_handler, file_handler, respect_handler_level=True
+        )
+        _queue_listener.start()
+        atexit.register(stop_logging)
+    else:
+        if rate_limit:
+            # Rate-limit once, then write to both, as the queue listener does
+            fan_out_handler = _FanOutHandler(console_handler, file_handler)
+            fan_out_handler.addFilter(RateLimitFilter(rate_limit))
+            root_logger.addHandler(fan_out_handler)
+        else:
+            root_logger.addHandler(console_handler)
+            root_logger.addHandler(file_handler)
 
     # Define component loggers with their corresponding argument names
     components = {
@@ -111,6 +261,7 @@ def setup_logging(args: argparse.Namespace) -> Dict[str, logging.Logger]:
         "chat": "chat_log_level",
         "cache": "cache_log_level",
         "roaming": "roaming_log_level",
+        "memory": "memory_log_level",
     }
 
     # Create and configure loggers
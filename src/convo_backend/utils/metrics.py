@@ -0,0 +1,436 @@
+"""
+In-process metrics in OpenMetrics / Prometheus text format.
+
+Every update takes a per-metric lock, so increments from several threads are never
+lost. Counter and gauge locks are only held for one addition, which keeps them safe to
+touch from the PortAudio callbacks. Histograms hold theirs while finding the bucket and
+are not observed from the audio callbacks. Rendering only copies values, so a slow
+scraper can never hold up the audio path.
+"""
+
+import argparse
+import json
+import logging
+import math
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional
+
+logger = logging.getLogger("convo.metrics")
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+def _escape_label_value(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple, values: tuple, extra: tuple = ()) -> str:
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape_label_value(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value))
+
+
+class _CounterChild:
+    __slots__ = ("value", "lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self.lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        """Increment the counter. The lock is held only for the addition, safe to call from audio callbacks."""
+        with self.lock:
+            self.value += amount
+
+
+class _GaugeChild:
+    __slots__ = ("value", "function", "lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self.function: Optional[Callable[[], float]] = None
+        self.lock = threading.Lock()
+
+    def set(self, value: float):
+        self.value = value
+
+    def inc(self, amount: float = 1.0):
+        with self.lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        with self.lock:
+            self.value -= amount
+
+    def set_function(self, function: Optional[Callable[[], float]]):
+        """Evaluate `function` at scrape time instead of using the stored value."""
+        self.function = function
+
+    def get(self) -> float:
+        if self.function is not None:
+            try:
+                return float(self.function())
+            except Exception:
+                return math.nan
+        return self.value
+
+
+class _HistogramChild:
+    __slots__ = ("buckets", "counts", "sum", "count", "lock")
+
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def observe(self, value: float):
+        with self.lock:
+            self.sum += value
+            self.count += 1
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self.counts[i] += 1
+                    break
+
+    def snapshot(self) -> tuple[list[int], float, int]:
+        with self.lock:
+            return list(self.counts), self.sum, self.count
+
+
+class _Metric:
+    """A metric family with optional labels."""
+
+    TYPE = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple, object] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._children[()] = self._new_child()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values):
+        """Return the child metric for the given label values, creating it if needed."""
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(
+                    f"{self.name} expects labels {self.labelnames}, got {values}"
+                )
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _unlabelled(self):
+        return self._children[()]
+
+    def _items(self) -> list[tuple[tuple, object]]:
+        # Copy under the lock so new label sets can't mutate the dict mid-render
+        with self._lock:
+            return list(self._children.items())
+
+    def render(self, openmetrics: bool) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    TYPE = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        self._unlabelled().inc(amount)
+
+    def render(self, openmetrics: bool) -> list[str]:
+        family = self.name if openmetrics else f"{self.name}_total"
+        lines = [
+            f"# HELP {family} {self.documentation}",
+            f"# TYPE {family} counter",
+        ]
+        for values, child in self._items():
+            labels = _format_labels(self.labelnames, values)
+            lines.append(f"{self.name}_total{labels} {_format_value(child.value)}")
+        return lines
+
+
+class Gauge(_Metric):
+    TYPE = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value: float):
+        self._unlabelled().set(value)
+
+    def inc(self, amount: float = 1.0):
+        self._unlabelled().inc(amount)
+
+    def dec(self, amount: float = 1.0):
+        self._unlabelled().dec(amount)
+
+    def set_function(self, function: Optional[Callable[[], float]]):
+        self._unlabelled().set_function(function)
+
+    def get(self) -> float:
+        return self._unlabelled().get()
+
+    def render(self, openmetrics: bool) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} gauge",
+        ]
+        for values, child in self._items():
+            labels = _format_labels(self.labelnames, values)
+            lines.append(f"{self.name}{labels} {_format_value(child.get())}")
+        return lines
+
+
+class Histogram(_Metric):
+    TYPE = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple = (),
+        buckets: tuple = DEFAULT_LATENCY_BUCKETS,
+    ):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        self._unlabelled().observe(value)
+
+    def render(self, openmetrics: bool) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        for values, child in self._items():
+            counts, total, count = child.snapshot()
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                labels = _format_labels(
+                    self.labelnames, values, (("le", _format_value(bound)),)
+                )
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, values, (("le", "+Inf"),))
+            lines.append(f"{self.name}_bucket{labels} {count}")
+            labels = _format_labels(self.labelnames, values)
+            lines.append(f"{self.name}_count{labels} {count}")
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Provides an in memory singleton registry of metric families.
+    """
+
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if not hasattr(self, "metrics"):
+            self.metrics: dict[str, _Metric] = {}
+            self._lock = threading.Lock()
+
+    def _register(self, metric_cls, name: str, *args, **kwargs):
+        with self._lock:
+            existing = self.metrics.get(name)
+            if existing is not None:
+                if not isinstance(existing, metric_cls):
+                    raise ValueError(f"Metric {name} already registered as {existing.TYPE}")
+                return existing
+            metric = metric_cls(name, *args, **kwargs)
+            self.metrics[name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: tuple = ()) -> Counter:
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple = ()) -> Gauge:
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple = (),
+        buckets: tuple = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram, name, documentation, labelnames, buckets)
+
+    def render(self, openmetrics: bool = True) -> str:
+        """Render every registered metric in OpenMetrics (or Prometheus 0.0.4) text format."""
+        with self._lock:
+            metrics = list(self.metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render(openmetrics))
+        if openmetrics:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+# Shared pipeline metrics
+STAGE_LATENCY = REGISTRY.histogram(
+    "convo_stage_latency_seconds",
+    "Latency of each conversation pipeline stage",
+    ("stage",),
+)
+EVENT_LOOP_LAG = REGISTRY.histogram(
+    "convo_event_loop_lag_seconds",
+    "Delay between when an event loop callback was due and when it ran",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+EVENT_LOOP_LAG_CURRENT = REGISTRY.gauge(
+    "convo_event_loop_lag_current_seconds",
+    "Most recently measured event loop lag",
+)
+
+
+# Extra JSON endpoints served next to /metrics, e.g. the watchdog's recent stalls
+DEBUG_ENDPOINTS: dict[str, Callable[[], object]] = {}
+
+
+def add_debug_endpoint(path: str, function: Callable[[], object]):
+    """Serve the JSON-serializable result of `function` at `path` on the metrics server"""
+    DEBUG_ENDPOINTS[path] = function
+
+
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        if path in DEBUG_ENDPOINTS:
+            body = json.dumps(DEBUG_ENDPOINTS[path](), default=str).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if path not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        openmetrics = "application/openmetrics-text" in self.headers.get("Accept", "")
+        body = REGISTRY.render(openmetrics=openmetrics).encode("utf-8")
+        self.send_response(200)
+        self.send_header(
+            "Content-Type",
+            OPENMETRICS_CONTENT_TYPE if openmetrics else PROMETHEUS_CONTENT_TYPE,
+        )
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug("Metrics request: " + format, *args)
+
+
+class MetricsServer:
+    """
+    Serves the metrics registry over HTTP from a daemon thread bound to localhost.
+    """
+
+    def __init__(self, port: int, host: str = "127.0.0.1"):
+        self.host = host
+        self.port = port
+        self.httpd: Optional[ThreadingHTTPServer] = None
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self.httpd = ThreadingHTTPServer((self.host, self.port), _MetricsRequestHandler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(
+            target=self.httpd.serve_forever, name="convo-metrics", daemon=True
+        )
+        self.thread.start()
+        logger.info(f"Metrics server listening on http://{self.host}:{self.port}/metrics")
+
+    def stop(self):
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
+        self.thread = None
+
+
+def add_metrics_args(parser: argparse.ArgumentParser):
+    """Add metrics-related arguments to the argument parser"""
+    metrics_group = parser.add_argument_group("Metrics")
+    metrics_group.add_argument(
+        "--metrics-port",
+        type=int,
+        default=None,
+        help="Serve OpenMetrics/Prometheus metrics on http://127.0.0.1:<port>/metrics",
+    )
+    metrics_group.add_argument(
+        "--loop-watchdog",
+        action="store_true",
+        help="Report event loop stalls even when the metrics server is disabled",
+    )
+    metrics_group.add_argument(
+        "--loop-stall-threshold-ms",
+        type=float,
+        default=100.0,
+        help="Event loop lag in milliseconds that counts as a stall",
+    )
+
+
+def start_metrics_server(args: argparse.Namespace) -> Optional[MetricsServer]:
+    """Start the metrics server if it was enabled on the command line"""
+    port = getattr(args, "metrics_port", None)
+    if port is None:
+        return None
+    server = MetricsServer(port)
+    try:
+        server.start()
+    except OSError as e:
+        logger.error(f"Failed to start metrics server on port {port}: {e}")
+        return None
+    return server
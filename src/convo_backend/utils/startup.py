@@ -0,0 +1,191 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Callable, Generic, Optional, TypeVar
+from convo_backend.utils.metrics import REGISTRY
+
+logger = logging.getLogger("convo.startup")
+
+STARTUP_COMPONENT_SECONDS = REGISTRY.gauge(
+    "convo_startup_component_seconds",
+    "Time taken to start each component",
+    ("component",),
+)
+
+T = TypeVar("T")
+
+# Measured from when this module is first imported, which is early in app startup
+_PROCESS_START = perf_counter()
+# Background component loads share a few threads so they overlap with each other and with the event loop
+_loader = ThreadPoolExecutor(max_workers=4, thread_name_prefix="convo-startup")
+
+
+@dataclass
+class StartupSpan:
+    name: str
+    start: float
+    end: Optional[float] = None
+    thread: str = ""
+    error: Optional[str] = None
+
+    @property
+    def duration(self) -> float:
+        return (self.end if self.end is not None else perf_counter()) - self.start
+
+
+class StartupTimeline:
+    """
+    Records when each startup component began and finished loading, relative to process start.
+    """
+
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if not hasattr(self, "spans"):
+            self.spans: list[StartupSpan] = []
+            self.lock = threading.Lock()
+
+    def begin(self, name: str) -> StartupSpan:
+        """Start timing a component. Pass the returned span to end()."""
+        span = StartupSpan(name, perf_counter(), thread=threading.current_thread().name)
+        with self.lock:
+            self.spans.append(span)
+        return span
+
+    def end(self, span: StartupSpan, error: Optional[BaseException] = None):
+        span.end = perf_counter()
+        if error is not None:
+            span.error = type(error).__name__
+        STARTUP_COMPONENT_SECONDS.labels(span.name).set(span.duration)
+        logger.debug(f"{span.name} started in {span.duration * 1000:.0f} ms")
+
+    @contextmanager
+    def track(self, name: str):
+        """Record the time spent in the block as the named component's startup. Works on any thread."""
+        span = self.begin(name)
+        try:
+            yield span
+        except BaseException as e:
+            self.end(span, e)
+            raise
+        self.end(span)
+
+    def report(self) -> str:
+        """Render the timeline as a table with a bar per component."""
+        with self.lock:
+            spans = sorted(self.spans, key=lambda span: span.start)
+        if not spans:
+            return "No startup components recorded"
+        end = max(span.start + span.duration for span in spans) - _PROCESS_START
+        scale = 40 / end if end > 0 else 0
+        width = max(len(span.name) for span in spans)
+        lines = [
+            f"{'component':<{width}} {'start ms':>9} {'took ms':>9}  {'thread':<16} timeline"
+        ]
+        for span in spans:
+            offset = span.start - _PROCESS_START
+            bar = " " * int(offset * scale) + "#" * max(1, int(span.duration * scale))
+            status = f" ({span.error})" if span.error else ("" if span.end else " (running)")
+            lines.append(
+                f"{span.name:<{width}} {offset * 1000:9.0f} {span.duration * 1000:9.0f}  "
+                f"{span.thread[:16]:<16} {bar}{status}"
+            )
+        lines.append(f"Startup took {end * 1000:.0f} ms")
+        return "\n".join(lines)
+
+
+startup_timeline = StartupTimeline()
+
+
+class LazyComponent(Generic[T]):
+    """
+    A component that is built on first use, or ahead of time in the background with warm().
+
+    A failed build is retried the next time the component is used.
+
+    Attribute access is forwarded to the built component, so a LazyComponent can be passed
+    where the component itself is expected; the first access blocks until it is built. On
+    the event loop, use `await aget()` instead.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], T]):
+        self.name = name
+        self.factory = factory
+        self._future: Optional[Future] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        future = self._future
+        return (
+            future is not None
+            and future.done()
+            and not future.cancelled()
+            and future.exception() is None
+        )
+
+    def warm(self) -> Future:
+        """Start building the component on a background thread if it isn't already."""
+        with self._lock:
+            if self._future is not None:
+                return self._future
+            future = self._future = _loader.submit(self._build)
+        future.add_done_callback(self._forget_failure)
+        return future
+
+    def get(self) -> T:
+        """Return the component, building it on this thread if nobody has started it."""
+        with self._lock:
+            future = self._future
+            if future is None:
+                future = self._future = Future()
+                build_here = True
+            else:
+                build_here = False
+        if build_here:
+            try:
+                future.set_result(self._build())
+            except BaseException as e:
+                future.set_exception(e)
+                self._forget_failure(future)
+        return future.result()
+
+    async def aget(self) -> T:
+        """Return the component without blocking the event loop."""
+        return await asyncio.wrap_future(self.warm())
+
+    def _forget_failure(self, future: Future):
+        """Drop a failed build, so the next use retries instead of re-raising its error."""
+        if future.cancelled() or future.exception() is not None:
+            with self._lock:
+                if self._future is future:
+                    self._future = None
+
+    def _build(self) -> T:
+        with startup_timeline.track(self.name):
+            return self.factory()
+
+    def __getattr__(self, attribute: str):
+        # Only called for attributes LazyComponent doesn't define itself
+        if attribute.startswith("__"):
+            raise AttributeError(attribute)
+        if not self.loaded and _on_event_loop():
+            logger.warning(f"{self.name} used on the event loop before it loaded, blocking until it has")
+        return getattr(self.get(), attribute)
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
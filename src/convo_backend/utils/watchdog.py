@@ -0,0 +1,226 @@
+import asyncio
+import logging
+import sys
+import threading
+import traceback
+from collections import deque
+from datetime import datetime
+from time import monotonic
+from typing import Optional
+from convo_backend.utils.metrics import (
+    REGISTRY,
+    EVENT_LOOP_LAG,
+    EVENT_LOOP_LAG_CURRENT,
+    add_debug_endpoint,
+)
+
+logger = logging.getLogger("convo.watchdog")
+
+EVENT_LOOP_STALLS = REGISTRY.counter(
+    "convo_event_loop_stalls",
+    "Event loop stalls longer than the watchdog threshold, by subsystem",
+    ("subsystem",),
+)
+
+# Our own modules mapped to the logger of the subsystem they belong to
+MODULE_SUBSYSTEMS = {
+    "convo_backend.services.x_roaming": "convo.roaming",
+    "convo_backend.services.x_api": "convo.roaming",
+    "convo_backend.services.space_discovery": "convo.roaming",
+    "convo_backend.utils.webdriver_executor": "convo.roaming",
+    "convo_backend.core.memory": "convo.memory",
+    "convo_backend.models.memory": "convo.memory",
+    "convo_backend.services.tts": "convo.tts",
+    "convo_backend.services.transcription": "convo.transcription",
+    "convo_backend.services.chat": "convo.chat",
+    "convo_backend.services.classifier": "convo.chat",
+    "convo_backend.services.messages_cache": "convo.cache",
+    "convo_backend.gui.gui": "convo.gui",
+}
+
+# Functions in core.core that belong to a more specific subsystem than the pipeline
+CORE_FUNCTION_SUBSYSTEMS = {
+    "vad_detection": "convo.vad",
+    "input_callback": "convo.audio",
+    "output_callback": "convo.audio",
+    "monitor_callback": "convo.audio",
+    "_process_audio": "convo.audio",
+}
+
+# Third party libraries that identify a subsystem when none of our frames are on the stack
+LIBRARY_SUBSYSTEMS = {
+    "selenium": "convo.roaming",
+    "onnxruntime": "convo.vad",
+    "silero_vad": "convo.vad",
+    "torch": "convo.vad",
+    "mongoengine": "convo.memory",
+    "pymongo": "convo.memory",
+    "sentence_transformers": "convo.memory",
+    "langchain_openai": "convo.chat",
+    "redis": "convo.cache",
+    "websockets": "convo.tts",
+    "tkinter": "convo.gui",
+}
+
+
+def attribute_stack(frames: list) -> tuple[str, str]:
+    """
+    Attribute a stack to a subsystem logger.
+
+    Args:
+        frames (list): (module name, function name) pairs, innermost first
+
+    Returns:
+        tuple[str, str]: Subsystem logger name and the "module.function" that was blamed
+    """
+    library_hit = None
+    for module, function in frames:
+        if module == "convo_backend.core.core":
+            subsystem = CORE_FUNCTION_SUBSYSTEMS.get(function, "convo.pipeline")
+            return subsystem, f"{module}.{function}"
+        if module in MODULE_SUBSYSTEMS:
+            return MODULE_SUBSYSTEMS[module], f"{module}.{function}"
+        if library_hit is None:
+            root = module.split(".", 1)[0]
+            if root in LIBRARY_SUBSYSTEMS:
+                library_hit = (LIBRARY_SUBSYSTEMS[root], f"{module}.{function}")
+    if library_hit:
+        return library_hit
+    if frames:
+        module, function = frames[0]
+        return "convo.watchdog", f"{module}.{function}"
+    return "convo.watchdog", "unknown"
+
+
+class LoopWatchdog:
+    """
+    Measures event loop scheduling lag and captures the stack of whatever is blocking it.
+
+    A heartbeat task on the event loop records when it last ran. A sampling thread
+    checks the heartbeat and, once it is older than the threshold, grabs the loop
+    thread's current stack with sys._current_frames(). When the loop recovers the stall
+    is attributed to a subsystem logger, counted and kept in a ring buffer.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.1,
+        interval: float = 0.05,
+        max_offenders: int = 50,
+    ):
+        """
+        Args:
+            threshold (float): Lag in seconds above which a stall is reported
+            interval (float): Heartbeat period in seconds
+            max_offenders (int): Number of recent stalls kept in the ring buffer
+        """
+        self.threshold = threshold
+        self.interval = interval
+        self.offenders: deque[dict] = deque(maxlen=max_offenders)
+        self.stall_counts: dict[str, int] = {}
+
+        self._loop_thread_id: Optional[int] = None
+        self._last_beat = monotonic()
+        self._sampled_beat: Optional[float] = None
+        self._sample: Optional[list] = None
+        self._sample_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start the heartbeat task on the running loop and the sampling thread."""
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = monotonic()
+        self._stop_event.clear()
+        self._sampler = threading.Thread(
+            target=self._sample_loop, name="convo-loop-watchdog", daemon=True
+        )
+        self._sampler.start()
+        self._task = asyncio.create_task(self._heartbeat())
+        add_debug_endpoint("/debug/stalls", self.recent_offenders)
+        logger.info(
+            f"Event loop watchdog started (threshold {self.threshold * 1000:.0f} ms)"
+        )
+
+    async def stop(self):
+        self._stop_event.set()
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._sampler:
+            await asyncio.to_thread(self._sampler.join)
+            self._sampler = None
+
+    def recent_offenders(self) -> list[dict]:
+        """Return the most recent stalls, oldest first."""
+        return list(self.offenders)
+
+    async def _heartbeat(self):
+        while True:
+            expected = monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = monotonic()
+            lag = max(0.0, now - expected)
+            stalled_beat = self._last_beat
+            self._last_beat = now
+            EVENT_LOOP_LAG.observe(lag)
+            EVENT_LOOP_LAG_CURRENT.set(lag)
+            if lag >= self.threshold:
+                self._report_stall(lag, stalled_beat)
+
+    def _sample_loop(self):
+        """Runs on the sampling thread, capturing the loop's stack during a stall."""
+        period = max(self.threshold / 2, 0.005)
+        while not self._stop_event.wait(period):
+            beat = self._last_beat
+            if monotonic() - beat < self.interval + self.threshold:
+                continue
+            if self._sampled_beat == beat:
+                continue  # Already captured this stall
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            stack = traceback.extract_stack(frame)
+            frames = []
+            while frame is not None:
+                frames.append(
+                    (frame.f_globals.get("__name__", "?"), frame.f_code.co_name)
+                )
+                frame = frame.f_back
+            with self._sample_lock:
+                self._sampled_beat = beat
+                self._sample = (frames, stack)
+
+    def _report_stall(self, lag: float, stalled_beat: float):
+        with self._sample_lock:
+            sample = self._sample if self._sampled_beat == stalled_beat else None
+            self._sample = None
+        if sample:
+            frames, stack = sample
+            subsystem, culprit = attribute_stack(frames)
+            formatted_stack = "".join(traceback.format_list(stack[-8:]))
+        else:
+            # The stall ended before the sampler could see it
+            subsystem, culprit, formatted_stack = "convo.watchdog", "unknown", ""
+
+        EVENT_LOOP_STALLS.labels(subsystem).inc()
+        self.stall_counts[subsystem] = self.stall_counts.get(subsystem, 0) + 1
+        self.offenders.append(
+            {
+                "time": datetime.now().isoformat(),
+                "lag_ms": round(lag * 1000, 1),
+                "subsystem": subsystem,
+                "culprit": culprit,
+                "stack": formatted_stack,
+            }
+        )
+        stall_logger = logging.getLogger(subsystem)
+        if stall_logger.isEnabledFor(logging.WARNING):
+            stall_logger.warning(
+                f"Event loop blocked for {lag * 1000:.0f} ms in {culprit}\n{formatted_stack}"
+            )
@@ -0,0 +1,144 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from typing import Any, Callable, Optional
+from convo_backend.utils.metrics import REGISTRY
+
+logger = logging.getLogger("convo.roaming")
+
+WEBDRIVER_COMMAND_LATENCY = REGISTRY.histogram(
+    "convo_webdriver_command_seconds",
+    "Time a WebDriver command ran on the driver thread, by command",
+    ("command",),
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0),
+)
+WEBDRIVER_QUEUE_WAIT = REGISTRY.histogram(
+    "convo_webdriver_queue_wait_seconds",
+    "Time a WebDriver command waited for the driver thread",
+    buckets=(0.0001, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0),
+)
+WEBDRIVER_QUEUE_DEPTH = REGISTRY.gauge(
+    "convo_webdriver_queue_depth",
+    "WebDriver commands queued or running on the driver thread",
+)
+
+# Looks up the first element matching an XPath and reports its state, optionally clicking
+# it when it can be clicked, so a lookup, attribute reads and a click are one round trip
+ELEMENT_STATE_JS = """
+const [xpath, click] = arguments;
+const element = document.evaluate(
+    xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+).singleNodeValue;
+if (!element) return null;
+const rect = element.getBoundingClientRect();
+const state = {
+    label: element.getAttribute("aria-label"),
+    disabled: element.disabled === true || ["true", "1"].includes(element.getAttribute("aria-disabled")),
+    visible: rect.width > 0 && rect.height > 0,
+    clicked: false,
+};
+if (click && state.visible && !state.disabled) {
+    element.click();
+    state.clicked = true;
+}
+return state;
+"""
+
+
+class WebDriverExecutor:
+    """
+    Runs every call into a Selenium driver on one dedicated thread.
+
+    A WebDriver session handles one command at a time anyway, so serializing the calls
+    here keeps them off the default executor, where they would compete with memory saves
+    and other work, and makes queueing visible: per-command latency, time spent queued and
+    queue depth are exported as metrics.
+
+    Waiting is done on the event loop between short commands rather than with
+    WebDriverWait on the driver thread, so a long wait never holds up other commands.
+    """
+
+    def __init__(self, driver=None, poll_interval: float = 0.25):
+        """
+        Args:
+            driver: Selenium driver, can be set later once it has been created on the thread
+            poll_interval (float): Seconds between checks in wait_for()
+        """
+        self.driver = driver
+        self.poll_interval = poll_interval
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="convo-webdriver")
+        self.queued = 0
+
+    async def run(self, command: str, function: Callable, *args, **kwargs) -> Any:
+        """
+        Run `function(*args, **kwargs)` on the driver thread.
+
+        Args:
+            command (str): Metric label, e.g. "get" or "execute_script"
+        """
+        queued_at = perf_counter()
+
+        def call():
+            started_at = perf_counter()
+            WEBDRIVER_QUEUE_WAIT.observe(started_at - queued_at)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                WEBDRIVER_COMMAND_LATENCY.labels(command).observe(perf_counter() - started_at)
+
+        self.queued += 1
+        WEBDRIVER_QUEUE_DEPTH.set(self.queued)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, call)
+        finally:
+            self.queued -= 1
+            WEBDRIVER_QUEUE_DEPTH.set(self.queued)
+
+    async def script(self, command: str, script: str, *args) -> Any:
+        """Run JavaScript in the page as one command, labelled `command` in the metrics."""
+        return await self.run(command, self.driver.execute_script, script, *args)
+
+    async def element_state(self, xpath: str, click: bool = False) -> Optional[dict]:
+        """
+        Read an element's label, disabled and visible state, clicking it if asked and possible.
+
+        Returns:
+            dict | None: {"label", "disabled", "visible", "clicked"}, None if no element matches
+        """
+        return await self.script("click" if click else "element_state", ELEMENT_STATE_JS, xpath, click)
+
+    async def wait_for(
+        self,
+        xpath: str,
+        timeout: float,
+        click: bool = False,
+        clickable: bool = False,
+    ) -> dict:
+        """
+        Wait until an element matches `xpath` (and can be clicked, if asked), then return its state.
+
+        Args:
+            xpath (str): Element to wait for
+            timeout (float): Seconds to wait
+            click (bool): Click the element as soon as it can be clicked
+            clickable (bool): Wait until the element is visible and enabled
+
+        Raises:
+            TimeoutException: If the element doesn't appear in time, as WebDriverWait would
+        """
+        from selenium.common.exceptions import TimeoutException
+
+        deadline = asyncio.get_running_loop().time() + timeout
+        while True:
+            state = await self.element_state(xpath, click)
+            if state is not None:
+                ready = state["visible"] and not state["disabled"]
+                if (not click and not clickable) or (state["clicked"] if click else ready):
+                    return state
+            if asyncio.get_running_loop().time() >= deadline:
+                raise TimeoutException(f"Timed out after {timeout}s waiting for {xpath}")
+            await asyncio.sleep(self.poll_interval)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
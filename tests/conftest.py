@@ -0,0 +1,81 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from convo_backend.services import messages_cache
+from convo_backend.services.messages_cache import InMemoryMessageCache, RedisMessageCache
+
+TEST_TTL = 60
+
+
+class FakeClock:
+    """Monotonic clock that only moves when a test advances it."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture
+async def redis_cache():
+    """RedisMessageCache under a prefix of its own, skipped when no Redis is reachable."""
+    cache = RedisMessageCache(prefix=f"convo:test:{uuid4().hex[:8]}", ttl=TEST_TTL, timeout=0.5)
+    if not await cache.ping():
+        await cache.close()
+        pytest.skip("Redis not available")
+    await cache.connect()
+    yield cache
+    await cache.clear_all()
+    await cache.close()
+
+
+@pytest.fixture
+def memory_cache(clock: FakeClock) -> InMemoryMessageCache:
+    return InMemoryMessageCache(ttl=TEST_TTL, clock=clock)
+
+
+@pytest.fixture(params=["memory", "redis"])
+def cache(request):
+    """Each message cache backend in turn."""
+    return request.getfixturevalue(f"{request.param}_cache")
+
+
+@pytest.fixture
+def advance(cache, clock: FakeClock):
+    """Let `seconds` pass for `cache`: really for Redis, on the fake clock for the memory backend."""
+
+    async def advance(seconds: float):
+        if isinstance(cache, RedisMessageCache):
+            await asyncio.sleep(seconds)
+        else:
+            clock.advance(seconds)
+
+    return advance
+
+
+@pytest.fixture
+def module_cache(cache, monkeypatch):
+    """
+    Point the module-level cache functions at `cache`. For the memory backend the shared
+    Redis cache is left unhealthy, so every call takes the in-memory fallback.
+    """
+    if isinstance(cache, RedisMessageCache):
+        monkeypatch.setattr(messages_cache, "_redis_cache", cache)
+        monkeypatch.setattr(messages_cache, "_memory_cache", InMemoryMessageCache())
+    else:
+        # Never connected, so it stays unhealthy without reconnecting in the background
+        monkeypatch.setattr(messages_cache, "_redis_cache", RedisMessageCache("redis://localhost:1"))
+        monkeypatch.setattr(messages_cache, "_memory_cache", cache)
+    monkeypatch.setattr(messages_cache, "_space_id", None)
+    return cache
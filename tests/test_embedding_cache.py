@@ -0,0 +1,36 @@
+import numpy as np
+
+from convo_backend.config import Config
+from convo_backend.core.embedding_cache import CachedEmbedder, EmbeddingCache, cache_key
+from convo_backend.models.message import Message
+
+
+class CountingEncoder:
+    def __init__(self):
+        self.calls: list[list[str]] = []
+
+    def __call__(self, texts: list[str]) -> np.ndarray:
+        self.calls.append(texts)
+        return np.ones((len(texts), 4), dtype=np.float32)
+
+
+def test_embedding_a_message_keeps_its_cache_key():
+    encoder = CountingEncoder()
+    embedder = CachedEmbedder(Config.LOW_DIM_EMBEDDING_MODEL, encoder, EmbeddingCache())
+    message = Message("gm  everyone", "user")
+
+    embedder.embed_message(message)
+
+    assert message._embedding_key == cache_key(Config.LOW_DIM_EMBEDDING_MODEL, "gm everyone")
+    embedder.embed_one("gm everyone")
+    assert encoder.calls == [["gm  everyone"]]  # The text and the message share an entry
+
+
+def test_other_models_leave_the_message_key_alone():
+    embedder = CachedEmbedder("text-embedding-ada-002", CountingEncoder(), EmbeddingCache())
+    message = Message("gm", "user")
+
+    embedder.embed_message(message)
+
+    assert message._embedding_key is None
+
@@ -0,0 +1,38 @@
+import logging
+
+from convo_backend.utils import logging as convo_logging
+from convo_backend.utils.logging import RateLimitFilter, SuppressedCountFormatter
+
+
+def record(message: str, lineno: int = 10) -> logging.LogRecord:
+    return logging.LogRecord("convo.test", logging.INFO, "/app/module.py", lineno, message, None, None)
+
+
+def test_f_strings_from_one_call_site_are_limited_together(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(convo_logging, "monotonic", lambda: now[0])
+    rate_limit = RateLimitFilter(rate=2, period=1.0)
+
+    passed = [rate_limit.filter(record(f"Button state: {i}")) for i in range(5)]
+
+    assert passed == [True, True, False, False, False]
+    now[0] += 1.0
+    next_record = record("Button state: 5")
+    assert rate_limit.filter(next_record)
+    assert SuppressedCountFormatter("%(message)s").format(next_record) == (
+        "Button state: 5 (suppressed 3 similar messages)"
+    )
+    assert next_record.getMessage() == "Button state: 5"  # The record itself is left alone
+
+
+def test_ended_windows_are_swept(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(convo_logging, "monotonic", lambda: now[0])
+    rate_limit = RateLimitFilter(rate=2, period=1.0)
+
+    for lineno in range(100):
+        rate_limit.filter(record("message", lineno))
+    now[0] += 2.0
+    rate_limit.filter(record("message", 1000))
+
+    assert list(rate_limit.windows) == [("convo.test", "/app/module.py", 1000)]
@@ -0,0 +1,58 @@
+import threading
+
+from convo_backend.core.memory_writer import MemoryWriter
+
+
+class RecordingMemory:
+    def __init__(self, block: threading.Event = None):
+        self.saved: list[str] = []
+        self.block = block
+        self.writing = threading.Event()
+
+    def save_many_to_long_term_memory(self, texts, created_ats):
+        self.writing.set()
+        if self.block is not None:
+            self.block.wait()
+        self.saved.extend(texts)
+
+
+def test_close_flushes_queued_memories():
+    memory = RecordingMemory()
+    writer = MemoryWriter(memory, max_batch_wait=60)
+    writer.start()
+    for i in range(5):
+        writer.submit(f"memory {i}")
+
+    assert writer.close(timeout=5) == 0
+
+    assert memory.saved == [f"memory {i}" for i in range(5)]
+
+
+def test_close_gives_up_after_timeout_and_reports_dropped_memories(caplog):
+    unblock = threading.Event()
+    writer = MemoryWriter(RecordingMemory(block=unblock), max_batch_size=2, max_batch_wait=0)
+    writer.start()
+    for i in range(5):
+        writer.submit(f"memory {i}")
+
+    try:
+        assert writer.close(timeout=0.2) == 5
+    finally:
+        unblock.set()
+    assert "dropping 5 unsaved memories" in caplog.text
+
+
+def test_close_is_bounded_when_the_queue_is_full():
+    unblock = threading.Event()
+    memory = RecordingMemory(block=unblock)
+    writer = MemoryWriter(memory, max_queue_size=2, max_batch_size=1, max_batch_wait=0)
+    writer.start()
+    writer.submit("memory")
+    memory.writing.wait(1)
+    while writer.submit("memory"):
+        pass
+
+    try:
+        assert writer.close(timeout=0.2) == 3  # One being written, two queued
+    finally:
+        unblock.set()
@@ -0,0 +1,13 @@
+from convo_backend.models import message as message_module
+from convo_backend.models.message import Message
+
+
+def test_token_count_is_counted_once_unless_given(monkeypatch):
+    counted = []
+    monkeypatch.setattr(message_module, "count_tokens", lambda text: counted.append(text) or 6)
+    message = Message("what did we say about validators?", "user")
+
+    assert message.token_count == message.token_count == 6
+    assert len(counted) == 1
+
+    assert Message("streamed reply", "bot", _token_count=7).token_count == 7
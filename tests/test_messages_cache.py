@@ -0,0 +1,177 @@
+import time
+from datetime import datetime
+
+from convo_backend.models.message import Message
+from convo_backend.services import messages_cache
+from convo_backend.services.messages_cache import (
+    RedisMessageCache,
+    cache_message,
+    clear_cache,
+    get_cached_messages,
+    set_cache_space,
+)
+
+
+def texts(messages: list[Message]) -> list[str]:
+    return [message.text for message in messages]
+
+
+async def test_namespaces_are_isolated(cache):
+    await cache.append("session-a:local", Message("from a", "user"))
+    await cache.append("session-b:local", Message("from b", "user"))
+
+    assert texts(await cache.get_all("session-a:local")) == ["from a"]
+    assert texts(await cache.get_all("session-b:local")) == ["from b"]
+    assert await cache.get_all("session-c:local") == []
+
+
+async def test_clearing_a_namespace_leaves_other_sessions(cache):
+    await cache.append("session-a:local", Message("from a", "user"))
+    await cache.append("session-b:local", Message("from b", "user"))
+
+    await cache.clear("session-a:local")
+
+    assert await cache.get_all("session-a:local") == []
+    assert texts(await cache.get_all("session-b:local")) == ["from b"]
+
+
+async def test_sessions_do_not_share_history(module_cache, monkeypatch):
+    monkeypatch.setattr(messages_cache, "_session_id", "session-a")
+    await cache_message(Message("from a", "user"))
+
+    monkeypatch.setattr(messages_cache, "_session_id", "session-b")
+    assert await get_cached_messages() == []
+    await cache_message(Message("from b", "user"))
+    assert texts(await get_cached_messages()) == ["from b"]
+
+    monkeypatch.setattr(messages_cache, "_session_id", "session-a")
+    assert texts(await get_cached_messages()) == ["from a"]
+
+
+async def test_spaces_do_not_share_history(module_cache, monkeypatch):
+    monkeypatch.setattr(messages_cache, "_session_id", "session-a")
+    set_cache_space("space-1")
+    await cache_message(Message("in space 1", "user"))
+
+    set_cache_space("space-2")
+    assert await get_cached_messages() == []
+    await cache_message(Message("in space 2", "user"))
+
+    set_cache_space("space-1")
+    assert texts(await get_cached_messages()) == ["in space 1"]
+    await clear_cache()
+    assert await get_cached_messages() == []
+    assert texts(await get_cached_messages("session-a:space-2")) == ["in space 2"]
+
+
+async def test_instances_sharing_redis_only_see_their_own_sessions(redis_cache):
+    other = RedisMessageCache(prefix=redis_cache.prefix, ttl=redis_cache.ttl)
+    await other.connect()
+    try:
+        await redis_cache.append("session-a:space-1", Message("from a", "user"))
+        await other.append("session-b:space-1", Message("from b", "user"))
+
+        assert texts(await redis_cache.get_all("session-a:space-1")) == ["from a"]
+        assert texts(await other.get_all("session-b:space-1")) == ["from b"]
+    finally:
+        await other.close()
+
+
+async def test_cleanup_keeps_conversations_that_are_still_live(redis_cache):
+    await redis_cache.append("session-a:local", Message("still live", "user"))
+    # Index entry looks expired, as if it was read just before a write refreshed the list
+    await redis_cache.client.zadd(redis_cache.namespaces_key, {"session-a:local": time.time() - 1})
+
+    assert await redis_cache.cleanup_expired() == 1
+
+    assert texts(await redis_cache.get_all("session-a:local")) == ["still live"]
+    assert await redis_cache.client.ttl(redis_cache.key("session-a:local")) > 0
+
+
+async def test_clear_all_removes_every_session(redis_cache):
+    await redis_cache.append("session-a:local", Message("from a", "user"))
+    await redis_cache.append("session-b:space-1", Message("from b", "user"))
+
+    assert await redis_cache.clear_all() == 3  # Two conversations and the namespace index
+
+    assert await redis_cache.client.keys(f"{redis_cache.prefix}:*") == []
+
+
+async def test_messages_round_trip_in_order(cache):
+    sent = [
+        Message("first", "user", timestamp=datetime(2025, 1, 1, 12, 0, 0)),
+        Message("second", "bot", timestamp=datetime(2025, 1, 1, 12, 0, 1, 500000)),
+        Message("ünïcode 🎙", "user", timestamp=datetime(2025, 1, 1, 12, 0, 2)),
+    ]
+    for message in sent:
+        await cache.append("session-a:local", message)
+
+    received = await cache.get_all("session-a:local")
+
+    assert [(m.text, m.sender, m.timestamp) for m in received] == [
+        (m.text, m.sender, m.timestamp) for m in sent
+    ]
+
+
+async def test_keeps_only_the_newest_messages(cache):
+    cache.max_length = 3
+    for i in range(5):
+        await cache.append("session-a:local", Message(f"message {i}", "user"))
+
+    assert texts(await cache.get_all("session-a:local")) == ["message 2", "message 3", "message 4"]
+
+
+async def test_namespace_expires_after_ttl(cache, advance):
+    cache.ttl = 1
+    await cache.append("session-a:local", Message("hello", "user"))
+
+    await advance(1.2)
+
+    assert await cache.get_all("session-a:local") == []
+
+
+async def test_writes_keep_the_whole_namespace_alive(cache, advance):
+    # A namespace expires as a whole, so older messages live as long as the newest one
+    cache.ttl = 1
+    await cache.append("session-a:local", Message("first", "user"))
+    await advance(0.7)
+    await cache.append("session-a:local", Message("second", "user"))
+    await advance(0.7)
+
+    assert texts(await cache.get_all("session-a:local")) == ["first", "second"]
+
+
+async def test_reads_slide_the_expiry(cache, advance):
+    cache.ttl = 1
+    await cache.append("session-a:local", Message("hello", "user"))
+    await advance(0.7)
+    assert texts(await cache.get_all("session-a:local")) == ["hello"]
+    await advance(0.7)
+
+    assert texts(await cache.get_all("session-a:local")) == ["hello"]
+
+
+async def test_cleanup_removes_only_expired_namespaces(cache, advance):
+    cache.ttl = 1
+    await cache.append("session-a:local", Message("abandoned", "user"))
+    await cache.append("session-b:local", Message("first", "user"))
+    await advance(0.7)
+    await cache.append("session-b:local", Message("second", "user"))
+    await advance(0.7)
+
+    assert await cache.cleanup_expired() == 1
+
+    assert await cache.get_all("session-a:local") == []
+    assert texts(await cache.get_all("session-b:local")) == ["first", "second"]
+
+
+async def test_fallback_is_logged_when_redis_is_unreachable_from_the_start(caplog):
+    cache = RedisMessageCache("redis://localhost:1", timeout=0.1)
+    try:
+        assert not await cache.connect()
+        cache.mark_unhealthy()
+    finally:
+        await cache.close()
+
+    warnings = [record for record in caplog.records if "in-memory fallback" in record.message]
+    assert len(warnings) == 1
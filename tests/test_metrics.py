@@ -0,0 +1,31 @@
+import sys
+import threading
+
+from convo_backend.utils.metrics import MetricsRegistry
+
+
+def test_concurrent_increments_are_not_lost():
+    registry = MetricsRegistry()
+    counter = registry.counter("test_increments", "Increments from several threads")
+    gauge = registry.gauge("test_in_flight", "Incremented and decremented from several threads")
+
+    def work():
+        for _ in range(20_000):
+            counter.inc()
+            gauge.inc(2)
+            gauge.dec()
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    # Switch threads as often as possible to provoke lost updates
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+    assert counter.labels().value == 8 * 20_000
+    assert gauge.labels().get() == 8 * 20_000
@@ -0,0 +1,118 @@
+import threading
+from types import SimpleNamespace
+
+from convo_backend.core import retrieval
+from convo_backend.core.retrieval import MemoryRetriever
+from convo_backend.models.message import Message
+
+
+class FakeMemory:
+    """Returns fixed short-term and long-term hits, best first."""
+
+    def __init__(self, short_term: list[tuple[str, float]], long_term: list[tuple[str, float]]):
+        self.short_term = short_term
+        self.long_term = long_term
+        self.low_dim_embedder = SimpleNamespace(embed_one=lambda text: [0.0])
+
+    def retrieve_from_short_term_memory(self, query, k, embedding=None):
+        return self.short_term[:k]
+
+    def search_long_term_memory(self, query, k, embedding=None):
+        return self.long_term[:k]
+
+
+def lookup(memory: FakeMemory, **kwargs) -> list[str]:
+    retriever = MemoryRetriever(memory, **kwargs)
+    try:
+        return retriever.lookup("what did we say about validators?")
+    finally:
+        retriever.close()
+
+
+def test_short_and_long_term_hits_are_interleaved():
+    memory = FakeMemory(
+        short_term=[("recent 1", 0.9), ("recent 2", 0.8), ("recent 3", 0.7)],
+        long_term=[("old 1", 0.03), ("old 2", 0.02), ("old 3", 0.01)],
+    )
+
+    assert lookup(memory, top_k=4, long_term_slots=0) == ["recent 1", "old 1", "recent 2", "old 2"]
+
+
+def test_long_term_slots_are_kept_when_short_term_ranks_higher():
+    # Found by both, so it outranks every long-term-only hit
+    memory = FakeMemory(
+        short_term=[("recent 1", 0.9), ("both", 0.8), ("recent 2", 0.7)],
+        long_term=[("both", 0.03), ("old 1", 0.02)],
+    )
+
+    assert lookup(memory, top_k=2, long_term_slots=0) == ["both", "recent 1"]
+    assert lookup(memory, top_k=2, long_term_slots=2) == ["both", "old 1"]
+
+
+def test_weak_short_term_hits_are_dropped():
+    memory = FakeMemory(
+        short_term=[("relevant", 0.6), ("unrelated", 0.1)],
+        long_term=[],
+    )
+
+    assert lookup(memory, top_k=3, min_short_term_score=0.3) == ["relevant"]
+
+
+def test_memories_found_by_both_appear_once():
+    memory = FakeMemory(
+        short_term=[("both", 0.9)],
+        long_term=[("both", 0.03), ("old 1", 0.02)],
+    )
+
+    assert lookup(memory, top_k=3) == ["both", "old 1"]
+
+
+async def test_turn_counts_prompt_tokens_off_the_event_loop(monkeypatch):
+    counted_on = []
+
+    def count_tokens(text):
+        counted_on.append(threading.current_thread().name)
+        return len(text.split())
+
+    monkeypatch.setattr(retrieval, "count_tokens", count_tokens)
+    retriever = MemoryRetriever(FakeMemory([("recent", 0.9)], [("old", 0.03)]), deadline=1.0)
+    try:
+        context = await retriever.start_turn().results("what did we say?")
+    finally:
+        retriever.close()
+
+    assert context == "- recent\n- old"
+    assert counted_on and all(name.startswith("convo-retrieval") for name in counted_on)
+
+
+def test_message_queries_keep_their_embedding_key():
+    memory = FakeMemory([("recent", 0.9)], [])
+    embedded = []
+    memory.low_dim_embedder = SimpleNamespace(embed_message=lambda message: embedded.append(message) or [0.0])
+    message = Message("what did we say about validators?", "user")
+    retriever = MemoryRetriever(memory)
+    try:
+        assert retriever.lookup(message) == ["recent"]
+    finally:
+        retriever.close()
+
+    assert embedded == [message]
+
+
+async def test_cancelled_prefetch_is_ignored(monkeypatch):
+    monkeypatch.setattr(retrieval, "count_tokens", lambda text: len(text.split()))
+    release = threading.Event()
+    memory = FakeMemory([("recent", 0.9)], [])
+    slow = memory.retrieve_from_short_term_memory
+    memory.retrieve_from_short_term_memory = lambda *args, **kwargs: release.wait(1.0) and slow(*args, **kwargs)
+    retriever = MemoryRetriever(memory, deadline=0.05)
+    try:
+        turn = retriever.start_turn()
+        turn.prefetch("what did we")
+        turn.prefetch_future.cancel()
+
+        # The final lookup misses the deadline, and the cancelled prefetch must not raise
+        assert await turn.results("what did we say?") is None
+    finally:
+        release.set()
+        retriever.close()
@@ -0,0 +1,36 @@
+from convo_backend.services.space_catalog import SpaceCatalog
+
+
+def space(space_id: str, host_id: str = "host-1") -> dict:
+    return {
+        "space_id": space_id,
+        "hosts": [{"id": host_id}],
+        "speakers": [],
+        "topics": [],
+    }
+
+
+def test_old_join_history_is_forgotten(clock):
+    catalog = SpaceCatalog(max_failures=1, clock=clock)
+    catalog.merge([space("old-join"), space("old-failure"), space("new-join")])
+    catalog.mark_joined("old-join")
+    catalog.mark_failed("old-failure")
+    clock.advance(100)
+    catalog.mark_joined("new-join")
+
+    catalog.clear_history(max_age=50)
+
+    assert [s["space_id"] for s in catalog.candidates()] == ["old-join", "old-failure"]
+    assert catalog.host_joins["host-1"] == 2  # Host statistics are kept
+
+
+def test_clearing_without_an_age_forgets_everything(clock):
+    catalog = SpaceCatalog(max_failures=1, clock=clock)
+    catalog.merge([space("joined"), space("failed")])
+    catalog.mark_joined("joined")
+    catalog.mark_failed("failed")
+
+    catalog.clear_history()
+
+    assert len(catalog.candidates()) == 2
+    assert not catalog.host_joins and not catalog.host_failures
@@ -0,0 +1,237 @@
+import asyncio
+import time
+from email.utils import formatdate
+
+import httpx
+import pytest
+
+from convo_backend.services.space_discovery import SpaceDiscovery, TokenBucket
+
+
+def space(space_id: str, host_id: str = "host-1") -> dict:
+    return {
+        "id": space_id,
+        "state": "live",
+        "lang": "en",
+        "title": f"Space {space_id}",
+        "participant_count": 10,
+        "host_ids": [host_id],
+    }
+
+
+def search_response(*spaces: dict, status_code: int = 200, headers: dict = None) -> httpx.Response:
+    host_ids = {host_id for space in spaces for host_id in space["host_ids"]}
+    body = {
+        "data": list(spaces),
+        "includes": {"users": [{"id": host_id, "username": host_id} for host_id in host_ids]},
+    }
+    return httpx.Response(status_code, json=body if status_code == 200 else {}, headers=headers)
+
+
+class XApi:
+    """MockTransport handler answering Spaces searches from a query -> response factory."""
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.queries: list[str] = []
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        query = request.url.params["query"]
+        self.queries.append(query)
+        response = self.respond(query)
+        return await response if asyncio.iscoroutine(response) else response
+
+
+@pytest.fixture(autouse=True)
+def bearer_token(monkeypatch):
+    monkeypatch.setenv("X_API_BEARER_TOKEN", "test-token")
+
+
+def make_discovery(api: XApi, clock, keywords=("crypto",), **kwargs) -> SpaceDiscovery:
+    options = {"ttl": 60, "rate_limit": 300, "rate_limit_period": 900, "timeout": 0.0}
+    options.update(kwargs)
+    return SpaceDiscovery(
+        keywords, clock=clock, transport=httpx.MockTransport(api), **options
+    )
+
+
+async def test_keywords_are_searched_concurrently(clock):
+    keywords = ["crypto", "ai", "music"]
+    arrived = 0
+    everyone_arrived = asyncio.Event()
+
+    async def respond(query):
+        nonlocal arrived
+        arrived += 1
+        if arrived == len(keywords):
+            everyone_arrived.set()
+        # Only returns if every search is in flight at once
+        await asyncio.wait_for(everyone_arrived.wait(), 1.0)
+        return search_response(space(f"space-{query}"))
+
+    api = XApi(respond)
+    discovery = make_discovery(api, clock, keywords, timeout=5.0)
+
+    spaces = await discovery.discover()
+
+    assert sorted(api.queries) == sorted(keywords)
+    assert sorted(s["space_id"] for s in spaces) == ["space-ai", "space-crypto", "space-music"]
+    await discovery.close()
+
+
+async def test_results_are_cached_for_ttl(clock):
+    api = XApi(lambda query: search_response(space("space-1")))
+    discovery = make_discovery(api, clock, ttl=60)
+
+    first = await discovery.search("crypto")
+    clock.advance(59)
+    second = await discovery.search("crypto")
+
+    assert api.queries == ["crypto"]
+    assert second == first
+
+    clock.advance(2)
+    await discovery.search("crypto")
+    assert api.queries == ["crypto", "crypto"]
+    await discovery.close()
+
+
+async def test_retry_after_pauses_searches_and_keeps_stale_results(clock):
+    responses = iter(
+        [
+            search_response(space("space-1")),
+            search_response(status_code=429, headers={"retry-after": "30"}),
+            search_response(space("space-2")),
+        ]
+    )
+    api = XApi(lambda query: next(responses))
+    discovery = make_discovery(api, clock, ttl=10)
+
+    assert [s["space_id"] for s in await discovery.search("crypto")] == ["space-1"]
+    clock.advance(11)
+    # Rate limited: the previous results are reused
+    assert [s["space_id"] for s in await discovery.search("crypto")] == ["space-1"]
+    assert discovery.bucket.wait_time() == pytest.approx(30)
+
+    clock.advance(29)
+    assert [s["space_id"] for s in await discovery.search("crypto")] == ["space-1"]
+    assert len(api.queries) == 2  # Nothing sent while paused
+
+    clock.advance(1)
+    assert [s["space_id"] for s in await discovery.search("crypto")] == ["space-2"]
+    assert len(api.queries) == 3
+    await discovery.close()
+
+
+async def test_retry_after_accepts_an_http_date(clock):
+    bucket = TokenBucket(300, 900, clock)
+
+    bucket.update(httpx.Headers({"retry-after": formatdate(time.time() + 120, usegmt=True)}))
+
+    assert bucket.wait_time() == pytest.approx(120, abs=2)
+
+
+async def test_429_without_headers_waits_for_the_next_token(clock):
+    api = XApi(lambda query: search_response(status_code=429))
+    discovery = make_discovery(api, clock, rate_limit=300, rate_limit_period=900)
+
+    assert await discovery.search("crypto") == []
+
+    assert discovery.bucket.wait_time() == pytest.approx(3)  # 900s / 300 requests
+    assert await discovery.search("crypto") == []
+    assert len(api.queries) == 1
+    await discovery.close()
+
+
+async def test_rate_limit_headers_update_the_bucket(clock):
+    reset = time.time() + 60
+    api = XApi(
+        lambda query: search_response(
+            space("space-1"),
+            headers={
+                "x-rate-limit-limit": "50",
+                "x-rate-limit-remaining": "2",
+                "x-rate-limit-reset": str(reset),
+            },
+        )
+    )
+    discovery = make_discovery(api, clock, ttl=0)
+
+    await discovery.search("crypto")
+
+    assert discovery.bucket.capacity == 50
+    assert discovery.bucket.tokens <= 2
+    await discovery.close()
+
+
+async def test_exhausted_rate_limit_blocks_until_reset(clock):
+    reset = time.time() + 60
+    api = XApi(
+        lambda query: search_response(
+            space("space-1"),
+            headers={
+                "x-rate-limit-limit": "300",
+                "x-rate-limit-remaining": "0",
+                "x-rate-limit-reset": str(reset),
+            },
+        )
+    )
+    discovery = make_discovery(api, clock, ttl=0)
+
+    await discovery.search("crypto")
+    assert discovery.bucket.wait_time() == pytest.approx(60, abs=2)
+
+    clock.advance(1)
+    assert [s["space_id"] for s in await discovery.search("crypto")] == ["space-1"]
+    assert len(api.queries) == 1
+    await discovery.close()
+
+
+async def test_spaces_found_by_several_keywords_are_listed_once(clock):
+    shared = space("space-shared", host_id="host-shared")
+    api = XApi(lambda query: search_response(shared, space(f"space-{query}")))
+    discovery = make_discovery(api, clock, ["crypto", "ai", "crypto"])
+
+    spaces = await discovery.discover()
+
+    assert sorted(api.queries) == ["ai", "crypto"]  # Repeated keywords are searched once
+    assert sorted(s["space_id"] for s in spaces) == ["space-ai", "space-crypto", "space-shared"]
+    assert [s["space_id"] for s in discovery.catalog.spaces_for_user("host-shared")] == ["space-shared"]
+    await discovery.close()
+
+
+async def test_waiting_for_a_token_does_not_hold_up_other_callers():
+    bucket = TokenBucket(1, 0.5)
+    assert await bucket.acquire()
+
+    waiting = asyncio.create_task(bucket.acquire(max_wait=1.0))
+    await asyncio.sleep(0)
+    started = time.monotonic()
+    # Would queue behind the waiting caller's sleep if acquire() held a lock across it
+    assert not await bucket.acquire(max_wait=0.0)
+    assert time.monotonic() - started < 0.1
+
+    assert await waiting
+
+
+async def test_concurrent_callers_reserve_tokens_in_turn():
+    bucket = TokenBucket(2, 0.4)
+    started = time.monotonic()
+
+    results = await asyncio.gather(*(bucket.acquire(max_wait=1.0) for _ in range(4)))
+
+    assert results == [True] * 4
+    # Two tokens at once, then one every 0.2s: the last waits ~0.4s, not the sum of the waits
+    assert time.monotonic() - started == pytest.approx(0.4, abs=0.1)
+
+
+async def test_unreadable_body_keeps_the_stale_results(clock):
+    responses = iter([search_response(space("space-1")), httpx.Response(200, text="<html>oops</html>")])
+    api = XApi(lambda query: next(responses))
+    discovery = make_discovery(api, clock, ttl=10)
+
+    await discovery.search("crypto")
+    clock.advance(11)
+
+    assert [s["space_id"] for s in await discovery.search("crypto")] == ["space-1"]
+    await discovery.close()
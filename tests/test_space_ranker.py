@@ -0,0 +1,41 @@
+from convo_backend.services.space_catalog import SpaceCatalog
+from convo_backend.services.space_ranker import SpaceRanker
+
+
+def space(space_id: str, participants: int) -> dict:
+    return {
+        "space_id": space_id,
+        "title": "",
+        "participant_count": participants,
+        "lang": "en",
+        "hosts": [],
+        "speakers": [],
+        "topics": [],
+    }
+
+
+async def test_close_scores_go_to_the_llm():
+    async def tie_break(spaces):
+        return "space-b"
+
+    ranker = SpaceRanker([], SpaceCatalog(), tie_break=tie_break, tie_margin=0.05)
+
+    assert await ranker.choose([space("space-a", 100), space("space-b", 99)]) == "space-b"
+
+
+async def test_failed_tie_break_falls_back_to_the_best_score():
+    async def tie_break(spaces):
+        raise TimeoutError("LLM timed out")
+
+    ranker = SpaceRanker([], SpaceCatalog(), tie_break=tie_break, tie_margin=0.05)
+
+    assert await ranker.choose([space("space-a", 100), space("space-b", 99)]) == "space-a"
+
+
+async def test_clear_winner_skips_the_llm():
+    async def tie_break(spaces):
+        raise AssertionError("LLM should not be asked")
+
+    ranker = SpaceRanker([], SpaceCatalog(), tie_break=tie_break, tie_margin=0.01)
+
+    assert await ranker.choose([space("space-a", 1000), space("space-b", 3)]) == "space-a"
@@ -0,0 +1,75 @@
+import logging
+import threading
+
+import pytest
+
+from convo_backend.utils.startup import LazyComponent
+
+
+async def test_aget_builds_off_the_event_loop():
+    built_on = []
+
+    def factory():
+        built_on.append(threading.current_thread())
+        return "component"
+
+    component = LazyComponent("test", factory)
+
+    assert await component.aget() == "component"
+    assert component.loaded
+    assert len(built_on) == 1 and built_on[0] is not threading.current_thread()
+
+
+async def test_aget_raises_load_failures():
+    def factory():
+        raise RuntimeError("model missing")
+
+    component = LazyComponent("test", factory)
+
+    with pytest.raises(RuntimeError, match="model missing"):
+        await component.aget()
+    assert not component.loaded
+
+
+async def test_unloaded_access_on_the_event_loop_is_logged(caplog):
+    component = LazyComponent("test", lambda: "component")
+
+    with caplog.at_level(logging.WARNING, logger="convo.startup"):
+        assert component.upper() == "COMPONENT"
+        assert component.upper() == "COMPONENT"
+
+    assert len(caplog.records) == 1
+    assert "before it loaded" in caplog.records[0].message
+
+
+async def test_failed_build_is_retried():
+    attempts = []
+
+    def factory():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ConnectionError("model download failed")
+        return "component"
+
+    component = LazyComponent("test", factory)
+
+    with pytest.raises(ConnectionError):
+        await component.aget()
+    assert await component.aget() == "component"
+    assert component.loaded
+
+
+def test_failed_get_is_retried():
+    attempts = []
+
+    def factory():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ConnectionError("model download failed")
+        return "component"
+
+    component = LazyComponent("test", factory)
+
+    with pytest.raises(ConnectionError):
+        component.get()
+    assert component.get() == "component"